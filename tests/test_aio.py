@@ -0,0 +1,87 @@
+import asyncio
+import gc
+import threading
+
+import pytest
+
+from tsetmc_scraper import aio
+from tsetmc_scraper.aio import AsyncClient, close_async_client, get_async_client, set_async_client
+
+web = pytest.importorskip("aiohttp.web")
+
+
+@pytest.fixture
+def server_url():
+    """
+    An aiohttp server on its own thread and loop, answering every path with "ok".
+    """
+
+    from aiohttp.test_utils import TestServer
+
+    async def handle(request):
+        return web.Response(text="ok")
+
+    app = web.Application()
+    app.router.add_get("/{path:.*}", handle)
+
+    loop = asyncio.new_event_loop()
+    server = TestServer(app, loop=loop)
+    started = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start_server())
+        started.set()
+        loop.run_forever()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    started.wait()
+
+    yield str(server.make_url("/"))
+
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def unclosed_warnings(loop_errors: list, recwarn) -> list:
+    gc.collect()
+    messages = [str(context.get("message")) for context in loop_errors] + [str(warning.message) for warning in recwarn]
+    return [message for message in messages if "Unclosed" in message]
+
+
+def test_client_used_from_a_new_loop_closes_its_old_session(server_url, recwarn):
+    client = AsyncClient(memo=False, retry=False, circuit_breaker=False)
+    loop_errors = []
+
+    async def fetch():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: loop_errors.append(context))
+        return await client.get(server_url)
+
+    asyncio.run(fetch())
+    old_session = client._session
+
+    assert asyncio.run(fetch()).text == "ok"
+    assert old_session.closed
+
+    asyncio.run(client.close())
+    assert unclosed_warnings(loop_errors, recwarn) == []
+
+
+def test_close_async_client_closes_the_shared_session(server_url, recwarn, monkeypatch):
+    monkeypatch.setattr(aio, "_client", None)
+    set_async_client(AsyncClient(memo=False, retry=False, circuit_breaker=False))
+    loop_errors = []
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: loop_errors.append(context))
+        try:
+            return await get_async_client().get(server_url)
+        finally:
+            await close_async_client()
+
+    assert asyncio.run(main()).text == "ok"
+    assert get_async_client()._session is None
+    assert unclosed_warnings(loop_errors, recwarn) == []
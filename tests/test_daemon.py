@@ -0,0 +1,166 @@
+import queue
+from datetime import datetime, timedelta, timezone
+
+from jdatetime import date as jdate
+from jdatetime import time as jtime
+
+from tsetmc_scraper.daemon import PollingDaemon, PollJob, PollResult, QueueSink, TradingHours
+from tsetmc_scraper.daemon import daemon as daemon_module
+from tsetmc_scraper.daemon.hours import TEHRAN_TIMEZONE
+
+# 1402-03-01, a Monday
+MONDAY = datetime(2023, 5, 22, tzinfo=TEHRAN_TIMEZONE)
+
+
+def at(day: datetime, hour: int, minute: int = 0) -> datetime:
+    return day.replace(hour=hour, minute=minute)
+
+
+def result(index: int) -> PollResult:
+    return PollResult(job="job", data=index, started_at=MONDAY, seconds=0.0)
+
+
+def test_trading_hours_are_open_from_start_until_end():
+    hours = TradingHours()
+
+    assert not hours.is_open(at(MONDAY, 8, 59))
+    assert hours.is_open(at(MONDAY, 9, 0))
+    assert hours.is_open(at(MONDAY, 12, 29))
+    assert not hours.is_open(at(MONDAY, 12, 30))
+
+
+def test_trading_hours_skip_thursday_friday_and_holidays():
+    hours = TradingHours(holidays=[jdate(1402, 3, 1)])
+
+    assert not hours.is_open(at(MONDAY, 10))
+    assert hours.is_open(at(MONDAY + timedelta(days=1), 10))
+    assert not hours.is_open(at(MONDAY + timedelta(days=3), 10))
+    assert not hours.is_open(at(MONDAY + timedelta(days=4), 10))
+    assert hours.is_open(at(MONDAY + timedelta(days=5), 10))
+
+
+def test_trading_hours_convert_other_timezones_to_tehran():
+    hours = TradingHours.from_dict({"start": "08:45", "end": "12:30"})
+
+    assert hours.start == jtime(8, 45)
+    # 05:30 UTC is 09:00 in Tehran
+    assert hours.is_open(datetime(2023, 5, 22, 5, 30, tzinfo=timezone.utc))
+    assert not hours.is_open(datetime(2023, 5, 22, 9, 0, tzinfo=timezone.utc))
+
+
+def test_queue_sink_drop_oldest_keeps_the_newest_results():
+    sink = QueueSink(maxsize=2, overflow="drop_oldest")
+    for index in range(5):
+        sink.put(result(index))
+
+    assert [sink.queue.get_nowait().data for _ in range(2)] == [3, 4]
+    assert sink.dropped == 3
+
+
+def test_queue_sink_drop_newest_keeps_the_oldest_results():
+    sink = QueueSink(maxsize=2, overflow="drop_newest")
+    for index in range(5):
+        sink.put(result(index))
+
+    assert [sink.queue.get_nowait().data for _ in range(2)] == [0, 1]
+    assert sink.dropped == 3
+
+
+def test_queue_sink_block_waits_for_room():
+    sink = QueueSink(results=queue.Queue(maxsize=1), overflow="block")
+    sink.put(result(0))
+
+    assert sink.queue.full()
+    assert sink.dropped == 0
+
+
+class FakeHours:
+    def __init__(self):
+        self.open = True
+
+    def is_open(self, now=None) -> bool:
+        return self.open
+
+
+class InlineExecutor:
+    def submit(self, fn, *args):
+        fn(*args)
+
+    def shutdown(self, wait: bool = True):
+        pass
+
+
+def offline_daemon(job: PollJob) -> tuple[PollingDaemon, list]:
+    """
+    A daemon that records the fetcher of every run instead of running it.
+    """
+
+    daemon = PollingDaemon(jobs=[job])
+    daemon._executor = InlineExecutor()
+    runs = []
+
+    def run(job: PollJob):
+        runs.append(job._steps)
+        daemon._running.discard(job.name)
+
+    daemon._run = run
+
+    return daemon, runs
+
+
+def test_named_targets_are_reset_when_their_hours_reopen():
+    hours = FakeHours()
+    job = PollJob(name="map", target="market_map", interval=1, hours=hours)
+    daemon, runs = offline_daemon(job)
+
+    daemon._submit(job)
+    daemon._submit(job)
+    hours.open = False
+    daemon._submit(job)
+    hours.open = True
+    daemon._submit(job)
+    daemon._submit(job)
+
+    assert len(runs) == 4
+    assert runs[0] is runs[1]
+    assert runs[2] is not runs[1]
+    assert runs[3] is runs[2]
+    assert daemon.stats["map"]["resets"] == 1
+    assert daemon.stats["map"]["skipped_closed"] == 1
+
+
+def test_jobs_without_hours_are_reset_when_the_date_changes(monkeypatch):
+    class FakeDatetime(datetime):
+        now_value = at(MONDAY, 23, 59)
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.now_value
+
+    monkeypatch.setattr(daemon_module, "datetime", FakeDatetime)
+
+    job = PollJob(name="watch", target="market_watch.events", interval=1, hours=None)
+    daemon, runs = offline_daemon(job)
+
+    daemon._submit(job)
+    FakeDatetime.now_value = at(MONDAY + timedelta(days=1), 0, 1)
+    daemon._submit(job)
+    daemon._submit(job)
+
+    assert runs[1] is not runs[0]
+    assert runs[2] is runs[1]
+    assert daemon.stats["watch"]["resets"] == 1
+
+
+def test_a_job_first_run_after_opening_is_not_counted_as_a_reset():
+    hours = FakeHours()
+    hours.open = False
+    job = PollJob(name="map", target="market_map", interval=1, hours=hours)
+    daemon, runs = offline_daemon(job)
+
+    daemon._submit(job)
+    hours.open = True
+    daemon._submit(job)
+
+    assert len(runs) == 1
+    assert daemon.stats["map"]["resets"] == 0
@@ -0,0 +1,36 @@
+import os
+
+import pytest
+from jdatetime import date as jdate
+
+from tsetmc_scraper.day_details.dataset import OVERWRITE_FILE_NAME, DayDetailsDataset
+
+pytest.importorskip("pyarrow")
+
+
+def test_overwrite_replaces_appended_files(tmp_path):
+    dataset = DayDetailsDataset(str(tmp_path))
+    date = jdate(1402, 2, 31)
+
+    dataset.write("trades", "1", date, {"price": [1, 2]}, mode="append")
+    dataset.write("trades", "1", date, {"price": [3]}, mode="append")
+    assert dataset.read("trades").column("price").to_pylist() == [1, 2, 3]
+
+    dataset.write("trades", "1", date, {"price": [4, 5]})
+    dataset.write("trades", "1", date, {"price": [6]})
+
+    assert dataset.read("trades").column("price").to_pylist() == [6]
+    assert os.listdir(dataset._get_partition_path("trades", "1", date)) == [OVERWRITE_FILE_NAME]
+
+
+def test_append_after_overwrite_is_read_in_order(tmp_path):
+    dataset = DayDetailsDataset(str(tmp_path))
+    date = jdate(1402, 2, 31)
+
+    dataset.write("trades", "1", date, {"price": [1]})
+    dataset.write("trades", "1", date, {"price": [2]}, mode="append")
+    dataset.write("trades", "2", date, {"price": [3]})
+
+    table = dataset.read("trades", symbol_ids=["1"])
+    assert table.column("price").to_pylist() == [1, 2]
+    assert table.column("date").to_pylist() == [20230521, 20230521]
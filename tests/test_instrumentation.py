@@ -0,0 +1,27 @@
+from tsetmc_scraper import instrumentation
+from tsetmc_scraper.instrumentation import PrometheusExporter
+
+
+def test_render_with_mixed_label_types():
+    exporter = PrometheusExporter()
+    instrumentation.add_hook(exporter)
+    try:
+        # retries are recorded with an int status after an error response and a None status after a connection error
+        instrumentation.record(instrumentation.RETRIES, 1, host="cdn.tsetmc.com", status=None)
+        instrumentation.record(instrumentation.RETRIES, 1, host="cdn.tsetmc.com", status=503)
+        instrumentation.record(instrumentation.RETRIES, 1, host="cdn.tsetmc.com", status="503")
+        instrumentation.record(instrumentation.REQUEST_SECONDS, 0.5, "get_info", host="cdn.tsetmc.com")
+        instrumentation.record(instrumentation.REQUEST_SECONDS, 0.25, None, host="cdn.tsetmc.com")
+    finally:
+        instrumentation.remove_hook(exporter)
+
+    assert exporter.render().splitlines() == [
+        "# TYPE tsetmc_scraper_request_seconds summary",
+        'tsetmc_scraper_request_seconds_sum{endpoint="",host="cdn.tsetmc.com"} 0.25',
+        'tsetmc_scraper_request_seconds_count{endpoint="",host="cdn.tsetmc.com"} 1',
+        'tsetmc_scraper_request_seconds_sum{endpoint="get_info",host="cdn.tsetmc.com"} 0.5',
+        'tsetmc_scraper_request_seconds_count{endpoint="get_info",host="cdn.tsetmc.com"} 1',
+        "# TYPE tsetmc_scraper_retries_total counter",
+        'tsetmc_scraper_retries_total{endpoint="",host="cdn.tsetmc.com"} 1',
+        'tsetmc_scraper_retries_total{endpoint="",host="cdn.tsetmc.com",status="503"} 2',
+    ]
@@ -0,0 +1,145 @@
+import json
+
+from jdatetime import date as jdate
+
+from tsetmc_scraper.market_map import MapType, MarketMap, _core
+from tsetmc_scraper.market_map.map import MarketMapState
+from tsetmc_scraper.transport import TextResponse, drive
+
+
+def map_row(symbol_id: str, heven: int = 90000, last: int = 1000) -> dict:
+    return {
+        "insCode": symbol_id,
+        "hEven": heven,
+        "color": "#00ff00",
+        "lVal18AFC": symbol_id,
+        "lVal30": f"Symbol {symbol_id}",
+        "lSecVal": "Group",
+        "pClosing": 990,
+        "pDrCotVal": last,
+        "percent": 0.5,
+        "priceChangePercent": 1.0,
+        "qTotTran5J": 100,
+        "qTotCap": 100 * last,
+        "zTotTran": 10,
+    }
+
+
+class FakeServer:
+    """
+    Answers the market map requests with the queued responses, recording the hEven of every request.
+    """
+
+    def __init__(self, *responses: list[dict]):
+        self.responses = list(responses)
+        self.hevens = []
+
+    def send(self, request):
+        self.hevens.append(request.params["hEven"])
+        return TextResponse(url=request.url, status_code=200, headers={}, text=json.dumps(self.responses.pop(0)))
+
+
+def test_repeated_polls_rebuild_only_changed_symbols():
+    market_map = MarketMap()
+    server = FakeServer(
+        [map_row("A"), map_row("B")],
+        [map_row("A", heven=90100, last=1005), map_row("B")],
+    )
+
+    rows = drive(market_map.get_market_map_data.steps(), server.send)
+    assert set(rows) == {"A", "B"}
+    assert market_map.changed_symbol_ids == {"A", "B"}
+    row_b = rows["B"]
+
+    rows = drive(market_map.get_market_map_data.steps(), server.send)
+    assert rows["A"].last == 1005
+    # B was sent again unchanged, so it is neither reported nor rebuilt
+    assert market_map.changed_symbol_ids == {"A"}
+    assert rows["B"] is row_b
+
+
+def test_polls_ask_for_changes_since_the_latest_update():
+    market_map = MarketMap()
+    server = FakeServer(
+        [map_row("A", heven=90000), map_row("B", heven=91500)],
+        [],
+        [map_row("A", heven=92000)],
+        [],
+    )
+
+    for _ in range(4):
+        drive(market_map.get_market_map_data.steps(), server.send)
+
+    # an empty delta keeps the time of the latest update
+    assert server.hevens == [0, 91500, 91500, 92000]
+    assert market_map.changed_symbol_ids == set()
+
+
+def test_map_types_keep_separate_states():
+    market_map = MarketMap()
+    server = FakeServer([map_row("A", heven=90000)], [map_row("B", heven=95000)], [])
+
+    drive(market_map.get_market_map_data.steps(map_type=MapType.MARKET_VALUE), server.send)
+    rows = drive(market_map.get_market_map_data.steps(map_type=MapType.MARKET_VOLUME), server.send)
+    assert set(rows) == {"B"}
+
+    drive(market_map.get_market_map_data.steps(map_type=MapType.MARKET_VALUE), server.send)
+    assert server.hevens == [0, 0, 90000]
+
+
+def test_state_apply_reports_new_and_changed_symbols_only():
+    server = FakeServer([map_row("A"), map_row("B")], [map_row("A", last=1005), map_row("B")])
+    state = MarketMapState()
+
+    raw_data, heven = drive(_core.get_market_map_data.steps(map_type=1), server.send)
+    assert state.apply(raw_data, heven) == {"A", "B"}
+
+    raw_data, heven = drive(_core.get_market_map_data.steps(map_type=1, heven=state.heven), server.send)
+    assert state.apply(raw_data, heven) == {"A"}
+    assert state.rows["A"].last == 1005
+    assert state.heven == 90000
+
+
+def test_a_new_day_fetches_the_whole_map_again(monkeypatch):
+    market_map = MarketMap()
+    server = FakeServer(
+        [map_row("A", heven=122000), map_row("B", heven=122500)],
+        [map_row("C", heven=90000)],
+        [],
+    )
+
+    monkeypatch.setattr("tsetmc_scraper.market_map.map._get_tehran_date", lambda: jdate(1402, 2, 31))
+    drive(market_map.get_market_map_data.steps(), server.send)
+
+    monkeypatch.setattr("tsetmc_scraper.market_map.map._get_tehran_date", lambda: jdate(1402, 3, 1))
+    rows = drive(market_map.get_market_map_data.steps(), server.send)
+    # the rows of the previous day are dropped with its hEven
+    assert set(rows) == {"C"}
+    assert market_map.changed_symbol_ids == {"C"}
+
+    drive(market_map.get_market_map_data.steps(), server.send)
+    assert server.hevens == [0, 0, 90000]
+
+
+def test_state_resets_when_the_server_heven_goes_backwards():
+    server = FakeServer(
+        [map_row("A", heven=122000), map_row("B", heven=121000)],
+        [map_row("A", heven=84500, last=1005)],
+        [map_row("A", heven=84500, last=1005), map_row("B", heven=84600)],
+    )
+    state = MarketMapState()
+
+    raw_data, heven = drive(_core.get_market_map_data.steps(map_type=1), server.send)
+    state.apply(raw_data, heven)
+
+    raw_data, heven = drive(_core.get_market_map_data.steps(map_type=1, heven=state.heven), server.send)
+    assert state.apply(raw_data, heven) == {"A"}
+    assert set(state.rows) == {"A"}
+    # the delta may miss symbols, so the next poll asks for the whole map
+    assert state.heven == 0
+
+    raw_data, heven = drive(_core.get_market_map_data.steps(map_type=1, heven=state.heven), server.send)
+    assert state.apply(raw_data, heven) == {"B"}
+    assert set(state.rows) == {"A", "B"}
+    assert state.heven == 84600
+    assert server.hevens == [0, 122000, 0]
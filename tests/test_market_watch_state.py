@@ -0,0 +1,98 @@
+from tsetmc_scraper.market_watch._core import get_watch_price_data
+from tsetmc_scraper.market_watch.event import WatchOrderBookLevelEvent, WatchPriceUpdateEvent, WatchTradeEvent
+from tsetmc_scraper.market_watch.state import WatchPriceState
+from tsetmc_scraper.transport import TextResponse, drive
+
+
+def price_row(symbol_id: str, heven: int = 90000, last: int = 1000, count: int = 10) -> str:
+    cols = [symbol_id, f"IRO1{symbol_id}", symbol_id, f"Symbol {symbol_id}", heven, 990, last, last, count, count * 100, count * 100 * last]
+    cols += [980, 1010, 990, 5, 100000, 3, 1, 27, "1040.00", "940.00", 10**6, 300]
+    return ",".join(map(str, cols))
+
+
+def orderbook_row(symbol_id: str, level: int, buy_price: int, sell_price: int, volume: int = 100) -> str:
+    return f"{symbol_id},{level},1,2,{buy_price},{sell_price},{volume},{volume}"
+
+
+def parse(prices: list[str], orderbook: list[str], refid: int = 1) -> dict:
+    text = f"header@@{';'.join(prices)}@{';'.join(orderbook)}@{refid}"
+    raw_data, _, _ = drive(get_watch_price_data.steps(), lambda request: TextResponse(url=request.url, status_code=200, headers={}, text=text))
+    return raw_data
+
+
+def initial_state() -> WatchPriceState:
+    state = WatchPriceState()
+    state.apply(
+        parse(
+            [price_row("A"), price_row("B")],
+            [orderbook_row("A", 1, 999, 1001), orderbook_row("A", 2, 998, 1002), orderbook_row("B", 1, 500, 510)],
+        )
+    )
+    return state
+
+
+def test_initial_apply_builds_every_row():
+    state = initial_state()
+
+    assert state.changed_symbol_ids == {"A", "B"}
+    assert state.rows["A"].last == 1000
+    assert [row.price for row in state.rows["A"].orderbook.buy_rows] == [999, 998]
+
+
+def test_delta_is_merged_in_place_and_only_changed_rows_are_rebuilt():
+    state = initial_state()
+    row_b = state.rows["B"]
+
+    changed = state.apply(parse([price_row("A", heven=90100, last=1005, count=12)], [orderbook_row("A", 1, 1000, 1003)]))
+
+    assert changed == {"A"}
+    assert state.rows["A"].last == 1005
+    assert state.rows["A"].count == 12
+    # level 1 is replaced, level 2 is kept from the earlier snapshot
+    assert [row.price for row in state.rows["A"].orderbook.buy_rows] == [1000, 998]
+    assert [row.price for row in state.rows["A"].orderbook.sell_rows] == [1003, 1002]
+    assert state.rows["B"] is row_b
+
+
+def test_orderbook_only_delta_of_a_known_symbol_keeps_its_prices():
+    state = initial_state()
+
+    changed = state.apply(parse([], [orderbook_row("B", 2, 499, 511)]))
+
+    assert changed == {"B"}
+    assert state.rows["B"].last == 1000
+    assert [row.price for row in state.rows["B"].orderbook.buy_rows] == [500, 499]
+
+
+def test_orderbook_only_entry_of_an_unseen_symbol_is_built_once_its_prices_arrive():
+    state = initial_state()
+
+    state.apply(parse([], [orderbook_row("C", 1, 200, 210)]))
+    assert "C" not in state.rows
+
+    state.apply(parse([price_row("C", last=205)], []))
+    assert state.rows["C"].last == 205
+    assert [row.price for row in state.rows["C"].orderbook.buy_rows] == [200]
+
+
+def test_diff_reports_price_trade_and_orderbook_changes():
+    state = initial_state()
+
+    delta = parse([price_row("A", heven=90100, last=1005, count=12)], [orderbook_row("A", 1, 1000, 1001)])
+    events = state.diff(delta)
+
+    price_events = [event for event in events if isinstance(event, WatchPriceUpdateEvent)]
+    assert [(event.last_before, event.last) for event in price_events] == [(1000, 1005)]
+
+    trade_events = [event for event in events if isinstance(event, WatchTradeEvent)]
+    assert [event.new_trades_count for event in trade_events] == [2]
+
+    # only the buy side of level 1 changed
+    level_events = [event for event in events if isinstance(event, WatchOrderBookLevelEvent)]
+    assert [(event.side, event.level, event.before.price, event.after.price) for event in level_events] == [("buy", 1, 999, 1000)]
+
+
+def test_diff_of_an_unchanged_delta_is_empty():
+    state = initial_state()
+
+    assert state.diff(parse([price_row("A")], [orderbook_row("A", 1, 999, 1001)])) == []
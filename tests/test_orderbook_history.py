@@ -0,0 +1,79 @@
+import random
+
+from jdatetime import time as jtime
+
+from tsetmc_scraper.day_details.orderbook import DayDetailsOrderBookEvent, DayDetailsOrderBookHistory
+
+
+def random_events(count: int, seed: int = 0) -> list[DayDetailsOrderBookEvent]:
+    # like BestLimits, every update sets both sides of a level, and levels are filled from the top
+    rng = random.Random(seed)
+    events = []
+    heven = 84500
+    depth = 0
+    for _ in range(count):
+        # several updates often share a time
+        if rng.random() < 0.6:
+            heven += 1
+            if heven % 100 == 60:
+                heven += 40
+
+        level = rng.randint(1, min(depth + 1, 5))
+        depth = max(depth, level)
+        for side in (0, 1):
+            events.append(DayDetailsOrderBookEvent(heven, level, side, rng.randint(1, 9), rng.randint(900, 1100), rng.randint(1, 10**5)))
+
+    return events
+
+
+def book_key(book) -> tuple:
+    def rows(rows):
+        return [None if row is None else (row.count, row.price, row.volume) for row in rows]
+
+    return book.time, rows(book.buy_rows), rows(book.sell_rows)
+
+
+def test_no_book_before_the_first_update():
+    history = DayDetailsOrderBookHistory(random_events(10))
+
+    assert history.get_book(84459) is None
+    assert history.get_book(jtime(8, 44, 59)) is None
+    assert history.get_book(history.events[0].heven) is not None
+
+
+def test_get_book_matches_a_full_replay_across_checkpoints():
+    history = DayDetailsOrderBookHistory(random_events(500))
+    # small checkpoints, so most lookups replay from one
+    history.checkpoint_interval = 16
+
+    books = list(history.iter_books())
+    assert len(books) == len(history.times)
+
+    # looked up out of order, so later checkpoints are built before earlier books are asked for
+    order = list(range(len(books)))
+    random.Random(1).shuffle(order)
+    for index in order:
+        assert book_key(history.get_book(history.times[index])) == book_key(books[index])
+
+
+def test_get_book_between_updates_returns_the_earlier_book():
+    events = [
+        DayDetailsOrderBookEvent(90000, 1, 0, 1, 1000, 10),
+        DayDetailsOrderBookEvent(90000, 1, 1, 2, 1010, 20),
+        DayDetailsOrderBookEvent(90500, 1, 0, 3, 1001, 30),
+        DayDetailsOrderBookEvent(91000, 2, 0, 4, 999, 40),
+    ]
+    history = DayDetailsOrderBookHistory(events)
+
+    book = history.get_book(jtime(9, 3, 0))
+    assert book.time == jtime(9, 0, 0)
+    assert [row.price for row in book.buy_rows] == [1000]
+    assert [row.price for row in book.sell_rows] == [1010]
+
+    # every event of the same time is applied
+    book = history.get_book(90500)
+    assert [row.price for row in book.buy_rows] == [1001]
+
+    book = history.get_book(120000)
+    assert [row.price for row in book.buy_rows] == [1001, 999]
+    assert history.times == [90000, 90500, 91000]
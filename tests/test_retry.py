@@ -0,0 +1,156 @@
+import asyncio
+
+import pytest
+import requests
+
+from tsetmc_scraper import retry
+from tsetmc_scraper.retry import CircuitBreaker, CircuitOpenError
+from tsetmc_scraper.transport import Transport
+
+HOST = "cdn.tsetmc.com"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(retry.time, "monotonic", clock)
+    return clock
+
+
+def open_circuit(breaker: CircuitBreaker, host: str = HOST):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure(host)
+
+
+def test_circuit_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    assert not breaker.record_failure(HOST)
+    assert not breaker.record_failure(HOST)
+    assert breaker.before_request(HOST) is False
+    assert breaker.record_failure(HOST)
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(HOST)
+
+    # other hosts are not affected
+    assert breaker.before_request("www.tsetmc.com") is False
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+
+    breaker.record_failure(HOST)
+    breaker.record_success(HOST)
+    assert not breaker.record_failure(HOST)
+    assert breaker.before_request(HOST) is False
+
+
+def test_half_open_lets_a_single_trial_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    open_circuit(breaker)
+
+    clock.now += 30
+    assert breaker.before_request(HOST) is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(HOST)
+
+    breaker.record_success(HOST)
+    assert breaker.before_request(HOST) is False
+
+
+def test_failed_trial_opens_the_circuit_again(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    open_circuit(breaker)
+
+    clock.now += 30
+    assert breaker.before_request(HOST) is True
+    assert breaker.record_failure(HOST)
+
+    clock.now += 29
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(HOST)
+
+    clock.now += 1
+    assert breaker.before_request(HOST) is True
+
+
+def test_released_trial_lets_the_next_trial_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    open_circuit(breaker)
+
+    clock.now += 30
+    assert breaker.before_request(HOST) is True
+    breaker.release_trial(HOST)
+
+    # the circuit stays half open, the next request is the new trial
+    assert breaker.before_request(HOST) is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(HOST)
+
+
+def test_transport_releases_a_trial_ended_by_an_unexpected_error(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    transport = Transport(memo=False, retry=False, circuit_breaker=breaker, rate_limiter=False)
+    open_circuit(breaker)
+
+    def get(**kwargs):
+        raise requests.exceptions.ChunkedEncodingError("connection broken")
+
+    monkeypatch.setattr(transport.session, "get", get)
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        transport.get(f"http://{HOST}/api/x")
+
+    assert breaker.before_request(HOST) is True
+
+
+def test_async_client_recovers_from_a_cancelled_trial():
+    web = pytest.importorskip("aiohttp.web")
+    from aiohttp.test_utils import TestServer
+
+    from tsetmc_scraper.aio import AsyncClient
+
+    async def main():
+        entered = asyncio.Event()
+
+        async def slow(request):
+            entered.set()
+            await asyncio.sleep(10)
+            return web.Response(text="slow")
+
+        async def fast(request):
+            return web.Response(text="fast")
+
+        app = web.Application()
+        app.router.add_get("/slow", slow)
+        app.router.add_get("/fast", fast)
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        client = AsyncClient(memo=False, retry=False, circuit_breaker=breaker, rate_limiter=False)
+
+        async with TestServer(app) as server:
+            open_circuit(breaker, server.host)
+
+            trial = asyncio.ensure_future(client.get(str(server.make_url("/slow"))))
+            await entered.wait()
+            trial.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await trial
+
+            response = await client.get(str(server.make_url("/fast")))
+
+        await client.close()
+
+        return response
+
+    response = asyncio.run(main())
+
+    assert response.text == "fast"
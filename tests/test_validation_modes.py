@@ -0,0 +1,71 @@
+import pytest
+from pydantic import BaseModel
+
+from tsetmc_scraper.day_details import DayDetails
+from tsetmc_scraper.market_map import MarketMap
+from tsetmc_scraper.market_watch import MarketWatch
+from tsetmc_scraper.mock import SYNTHETIC_DATE, SYNTHETIC_SYMBOL_ID, FixtureStore, generate_fixtures
+from tsetmc_scraper.models import validation
+from tsetmc_scraper.symbol import Symbol
+from tsetmc_scraper.transport import TextResponse, drive
+
+ENDPOINTS = [
+    (lambda: Symbol(SYNTHETIC_SYMBOL_ID), "get_trades_data", {}),
+    (lambda: Symbol(SYNTHETIC_SYMBOL_ID), "get_traders_type_history", {}),
+    (lambda: DayDetails(SYNTHETIC_SYMBOL_ID, SYNTHETIC_DATE), "get_price_overview", {}),
+    (lambda: DayDetails(SYNTHETIC_SYMBOL_ID, SYNTHETIC_DATE), "get_price_data", {}),
+    (lambda: DayDetails(SYNTHETIC_SYMBOL_ID, SYNTHETIC_DATE), "get_orderbook_data", {}),
+    (lambda: DayDetails(SYNTHETIC_SYMBOL_ID, SYNTHETIC_DATE), "get_trades_data", {"summarize": False}),
+    (lambda: DayDetails(SYNTHETIC_SYMBOL_ID, SYNTHETIC_DATE), "get_trades_data", {"summarize": True}),
+    (lambda: DayDetails(SYNTHETIC_SYMBOL_ID, SYNTHETIC_DATE), "get_traders_type_data", {}),
+    (lambda: DayDetails(SYNTHETIC_SYMBOL_ID, SYNTHETIC_DATE), "get_thresholds_data", {}),
+    (lambda: MarketWatch(), "get_price_data", {}),
+    (lambda: MarketWatch(), "get_traders_type_data", {}),
+    (lambda: MarketWatch(), "get_daily_history_data", {}),
+    (lambda: MarketWatch(), "get_stats_data", {}),
+    (lambda: MarketMap(), "get_market_map_data", {}),
+]
+
+
+@pytest.fixture(scope="module")
+def send(tmp_path_factory):
+    path = tmp_path_factory.mktemp("fixtures")
+    generate_fixtures(str(path), symbol_count=20, history_days=5, orderbook_updates=100, trades_count=50)
+    store = FixtureStore(str(path))
+    # the synthetic fixtures have no clienttype.aspx page, its rows are a deven and 12 integers
+    store.put(
+        "http://tsetmc.ir/tsev2/data/clienttype.aspx",
+        {"i": SYNTHETIC_SYMBOL_ID},
+        "20230521,10,2,12,1,500,90,450,140,5000,900,4500,1400;20230520,8,1,9,0,300,20,320,0,3000,200,3200,0",
+    )
+
+    def send(request):
+        fixture = store.get(request.url, request.params)
+        return TextResponse(url=fixture["url"], status_code=fixture["status"], headers=fixture["headers"], text=fixture["text"])
+
+    return send
+
+
+def leaf_types(value, path: str = "") -> dict[str, str]:
+    # the types of the leaves of a parsed value, keyed by their path in it
+    if isinstance(value, BaseModel):
+        return {key: type_name for field in value.__fields__ for key, type_name in leaf_types(getattr(value, field), f"{path}.{field}").items()}
+
+    if isinstance(value, dict):
+        return {key: type_name for item in value.values() for key, type_name in leaf_types(item, f"{path}[]").items()}
+
+    if isinstance(value, (list, tuple)):
+        return {key: type_name for item in value for key, type_name in leaf_types(item, f"{path}[]").items()}
+
+    return {path: type(value).__name__}
+
+
+@pytest.mark.parametrize("make, name, kwargs", ENDPOINTS, ids=[f"{make().__class__.__name__}.{name}" for make, name, _ in ENDPOINTS])
+def test_both_validation_modes_return_the_same_types(send, make, name, kwargs):
+    with validation(True):
+        validated = drive(getattr(make(), name).steps(**kwargs), send)
+
+    with validation(False):
+        unvalidated = drive(getattr(make(), name).steps(**kwargs), send)
+
+    assert leaf_types(unvalidated) == leaf_types(validated)
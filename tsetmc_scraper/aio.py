@@ -0,0 +1,294 @@
+import asyncio
+import functools
+import time
+from typing import Generator
+from urllib.parse import urlsplit
+
+from . import instrumentation
+from .memo import ResponseMemo
+from .ratelimit import RateLimiter
+from .retry import CircuitBreaker, RetryHandler, RetryPolicy
+from .transport import Endpoint, Request, TextResponse, rewrite_url
+from .utils import get_request_headers
+
+
+class AsyncClient:
+    """
+    Async counterpart of Transport, running every request on one shared aiohttp session. At most `concurrency` requests are in flight at the same time, and at most `limit_per_host` per host (0 means no per host limit).
+
+    Throttled and failing requests are retried and guarded by a circuit breaker just like in Transport.
+
+    A client belongs to the event loop it is first used in; if it is used from a new loop, a new session is opened there.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 100,
+        limit_per_host: int = 0,
+        timeout: float = 20,
+        headers: dict[str, str] | None = None,
+        verify: bool = False,
+        cache=None,
+        memo: ResponseMemo | bool | None = None,
+        retry: RetryPolicy | bool | None = None,
+        circuit_breaker: CircuitBreaker | bool | None = None,
+        rate_limiter: RateLimiter | bool | None = None,
+        base_url: str | None = None,
+    ):
+        self.concurrency = concurrency
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.headers = get_request_headers() if headers is None else headers
+        self.verify = verify
+        self.cache = cache
+        # None uses the defaults, False disables the feature
+        self.memo = ResponseMemo() if memo is None else memo or None
+        self.retry_handler = RetryHandler(
+            retry=RetryPolicy() if retry is None else retry or None,
+            circuit_breaker=CircuitBreaker() if circuit_breaker is None else circuit_breaker or None,
+        )
+        # the rate limiter is opt in: True uses DEFAULT_RATE_LIMITS
+        self.rate_limiter = RateLimiter() if rate_limiter is True else rate_limiter or None
+        self.base_url = base_url
+
+        self._loop = None
+        self._session = None
+        self._semaphore = None
+        self._inflight = {}
+
+    async def _get_session(self):
+        try:
+            import aiohttp
+        except ImportError as e:
+            raise ImportError("the async client requires aiohttp, install it with `pip install tsetmc-scraper[async]`") from e
+
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # the session of another, usually finished, loop is swapped out first and closed after, so concurrent callers never see it
+            stale_session = self._session if self._session is not None and not self._session.closed else None
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._inflight = {}
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(
+                    limit=self.concurrency,
+                    limit_per_host=self.limit_per_host,
+                    ssl=None if self.verify else False,
+                ),
+            )
+
+            if stale_session is not None:
+                await _close_stale_session(stale_session)
+
+        return self._session
+
+    async def get(self, url: str, params: dict | None = None) -> TextResponse:
+        import aiohttp
+
+        session = await self._get_session()
+        url = url.strip()
+        params = {key: str(value) for key, value in (params or {}).items()}
+        host = urlsplit(url).hostname
+        if self.base_url is not None:
+            url = rewrite_url(url, self.base_url)
+
+        attempt = 0
+        while True:
+            is_trial = self.retry_handler.before_request(host)
+            try:
+                # every attempt, retries included, spends a token of the host
+                if self.rate_limiter is not None:
+                    delay = self.rate_limiter.reserve(host)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                try:
+                    async with self._semaphore:
+                        async with session.get(url=url, params=params) as response:
+                            response.raise_for_status()
+                            text = await response.text()
+                except (aiohttp.ClientResponseError, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    status = e.status if isinstance(e, aiohttp.ClientResponseError) else None
+                    headers = e.headers if isinstance(e, aiohttp.ClientResponseError) else None
+                    delay = self.retry_handler.on_failure(host, attempt, status, headers)
+                    if delay is None:
+                        raise
+                else:
+                    self.retry_handler.on_success(host)
+
+                    return TextResponse(
+                        url=str(response.url),
+                        status_code=response.status,
+                        headers=dict(response.headers),
+                        text=text,
+                    )
+            finally:
+                # a trial that is cancelled or interrupted by any other exception must not leave the circuit half open forever
+                if is_trial:
+                    self.retry_handler.release_trial(host)
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def run(self, steps: Generator):
+        """
+        Drives an endpoint generator to completion, awaiting every yielded Request on this client.
+        """
+
+        try:
+            request = next(steps)
+            while True:
+                request = steps.send(await self.send(request))
+        except StopIteration as stop:
+            return stop.value
+
+    async def send(self, request: Request) -> TextResponse:
+        """
+        Sends a Request yielded by an endpoint. It is answered from the in-process memo or the response cache when they have a fresh entry, and coalesced with an identical request already in flight.
+        """
+
+        if self.memo is None:
+            return await self._send(request)
+
+        response = self.memo.get(request)
+        if response is not None:
+            instrumentation.record(instrumentation.CACHE_HITS, 1, request.endpoint, source="memo")
+            return response
+
+        await self._get_session()
+        key = request.key
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = asyncio.ensure_future(self._send(request))
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            instrumentation.record(instrumentation.CACHE_HITS, 1, request.endpoint, source="coalesced")
+
+        # shield the shared request, so a cancelled caller does not cancel it for the others
+        return await asyncio.shield(task)
+
+    async def _send(self, request: Request) -> TextResponse:
+        if self.cache is not None:
+            response = self.cache.get(request)
+            if response is not None:
+                instrumentation.record(instrumentation.CACHE_HITS, 1, request.endpoint, source="cache")
+                return response
+
+        if instrumentation.is_enabled():
+            response = await self._measure_get(request)
+        else:
+            response = await self.get(url=request.url, params=request.params)
+
+        if self.cache is not None:
+            self.cache.put(request, response)
+
+        if self.memo is not None:
+            self.memo.put(request, response)
+
+        return response
+
+    async def _measure_get(self, request: Request) -> TextResponse:
+        host = urlsplit(request.url.strip()).hostname
+        started_at = time.perf_counter()
+        try:
+            with instrumentation.endpoint_scope(request.endpoint):
+                response = await self.get(url=request.url, params=request.params)
+        except Exception:
+            instrumentation.record(instrumentation.ERRORS, 1, request.endpoint, host=host)
+            raise
+
+        # aiohttp decodes the body while reading it, so decoding is part of the request time here
+        instrumentation.record(instrumentation.REQUEST_SECONDS, time.perf_counter() - started_at, request.endpoint, host=host)
+        instrumentation.record(instrumentation.RESPONSE_BYTES, len(response.text.encode("utf-8")), request.endpoint, host=host)
+
+        return response
+
+    async def close(self):
+        """
+        Closes the session, to be awaited on the loop that used the client last. The client opens a new session if it is used again.
+        """
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+_client: AsyncClient | None = None
+
+
+def get_async_client() -> AsyncClient:
+    """
+    Returns the async client shared by all async classes, creating one with the default settings on first use.
+    """
+
+    global _client
+
+    if _client is None:
+        _client = AsyncClient()
+
+    return _client
+
+
+async def close_async_client():
+    """
+    Closes the session of the shared async client; await it at the end of the coroutine run by asyncio.run, as the session belongs to that loop.
+    """
+
+    if _client is not None:
+        await _client.close()
+
+
+def set_async_client(client: AsyncClient):
+    global _client
+
+    _client = client
+
+
+def configure_async_client(**kwargs) -> AsyncClient:
+    """
+    Creates a new shared async client with the given settings (concurrency, limit_per_host, timeout, headers, verify, cache, memo, retry, circuit_breaker, rate_limiter, base_url) and returns it.
+    """
+
+    client = AsyncClient(**kwargs)
+    set_async_client(client)
+
+    return client
+
+
+class AsyncWrapper:
+    """
+    Base class of the async mirrors. Each async method drives the endpoint of the wrapped sync object on an AsyncClient, so parsing and model building are shared with the blocking API.
+    """
+
+    def __init__(self, wrapped, client: AsyncClient | None = None):
+        self._wrapped = wrapped
+        self._client = client
+
+    @property
+    def client(self) -> AsyncClient:
+        return self._client if self._client is not None else get_async_client()
+
+
+def async_method(method: Endpoint):
+    @functools.wraps(method)
+    async def wrapper(self: AsyncWrapper, *args, **kwargs):
+        return await self.client.run(method.steps(self._wrapped, *args, **kwargs))
+
+    return wrapper
+
+
+async def _close_stale_session(session):
+    # a finished loop's connections are already gone, aiohttp then only marks the session closed
+    try:
+        await session.close()
+    except RuntimeError:
+        # the loop is still open but not running, waiting for its connections to close is not possible from this loop
+        pass
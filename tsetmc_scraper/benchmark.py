@@ -0,0 +1,194 @@
+import argparse
+import gc
+import importlib.metadata
+import json
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Generator
+
+from .day_details import DayDetails
+from .day_details import _core as day_details_core
+from .market_watch import MarketWatch
+from .market_watch import _core as market_watch_core
+from .mock import SYNTHETIC_COMPANY_ISIN, SYNTHETIC_DATE, SYNTHETIC_SYMBOL_ID, FixtureStore, generate_fixtures
+from .symbol import Symbol
+from .symbol import _core as symbol_core
+from .transport import Request, TextResponse, drive
+
+# name: (parsing only, parsing and model construction), each returning a fresh endpoint generator
+BENCHMARK_CASES: dict[str, tuple[Callable[[], Generator], Callable[[], Generator]]] = {
+    "watch_price": (
+        lambda: market_watch_core.get_watch_price_data.steps(),
+        lambda: MarketWatch().get_price_data.steps(),
+    ),
+    "watch_daily_history": (
+        lambda: market_watch_core.get_watch_daily_history_data.steps(),
+        lambda: MarketWatch().get_daily_history_data.steps(),
+    ),
+    "watch_stats": (
+        lambda: market_watch_core.get_watch_stats_data.steps(),
+        lambda: MarketWatch().get_stats_data.steps(),
+    ),
+    "day_details_orderbook": (
+        lambda: day_details_core.get_day_details_orderbook_data.steps(symbol_id=SYNTHETIC_SYMBOL_ID, date=SYNTHETIC_DATE),
+        lambda: DayDetails(symbol_id=SYNTHETIC_SYMBOL_ID, date=SYNTHETIC_DATE).get_orderbook_data.steps(),
+    ),
+    "day_details_trades": (
+        lambda: day_details_core.get_day_details_trade_data.steps(symbol_id=SYNTHETIC_SYMBOL_ID, date=SYNTHETIC_DATE, summarize=False),
+        lambda: DayDetails(symbol_id=SYNTHETIC_SYMBOL_ID, date=SYNTHETIC_DATE).get_trades_data.steps(),
+    ),
+    "symbol_trades": (
+        lambda: symbol_core.get_symbol_trades_data.steps(symbol_id=SYNTHETIC_SYMBOL_ID),
+        lambda: Symbol(symbol_id=SYNTHETIC_SYMBOL_ID).get_trades_data.steps(),
+    ),
+    "symbol_id_details": (
+        lambda: symbol_core.get_symbol_id_details.steps(symbol_id=SYNTHETIC_SYMBOL_ID),
+        lambda: Symbol(symbol_id=SYNTHETIC_SYMBOL_ID).get_id_details.steps(),
+    ),
+    "symbol_shareholders": (
+        lambda: symbol_core.get_symbol_shareholders.steps(company_isin=SYNTHETIC_COMPANY_ISIN),
+        lambda: Symbol(symbol_id=SYNTHETIC_SYMBOL_ID).get_shareholders_data.steps(),
+    ),
+}
+
+
+def run_benchmarks(fixtures_path: str | None = None, cases: list[str] | None = None, repeat: int = 5) -> dict:
+    """
+    Runs the benchmark cases offline against the fixtures in `fixtures_path` (synthetic ones are generated if it is None) and returns the results. For every case the parsing alone and the parsing with model construction are timed `repeat` times, the model construction time being the difference of their medians, and the peak memory allocated by each is measured with tracemalloc.
+    """
+
+    if fixtures_path is None:
+        fixtures_path = tempfile.mkdtemp(prefix="tsetmc-fixtures-")
+        generate_fixtures(fixtures_path)
+
+    store = FixtureStore(fixtures_path)
+    responses = {}
+
+    # responses are read up front, so file access is not timed
+    def send(request: Request) -> TextResponse:
+        key = (request.url, tuple(sorted(request.params.items())))
+        if key not in responses:
+            fixture = store.get(request.url, request.params)
+            if fixture is None:
+                raise LookupError(f"no fixture for {request.url} {request.params}")
+
+            responses[key] = TextResponse(url=request.url, status_code=fixture["status"], headers=fixture["headers"], text=fixture["text"])
+
+        return responses[key]
+
+    results = {}
+    for name in cases or list(BENCHMARK_CASES):
+        parse_steps, model_steps = BENCHMARK_CASES[name]
+
+        # warm up, which also loads the responses
+        drive(model_steps(), send)
+
+        parse_times = _time(lambda: drive(parse_steps(), send), repeat)
+        total_times = _time(lambda: drive(model_steps(), send), repeat)
+
+        results[name] = {
+            "parse_seconds": statistics.median(parse_times),
+            "parse_seconds_min": min(parse_times),
+            "total_seconds": statistics.median(total_times),
+            "total_seconds_min": min(total_times),
+            "model_seconds": max(0.0, statistics.median(total_times) - statistics.median(parse_times)),
+            "parse_peak_bytes": _get_peak_memory(lambda: drive(parse_steps(), send)),
+            "total_peak_bytes": _get_peak_memory(lambda: drive(model_steps(), send)),
+        }
+
+    return {
+        "version": _get_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "repeat": repeat,
+        "cases": results,
+    }
+
+
+def compare_results(old: dict, new: dict) -> dict[str, dict[str, float]]:
+    """
+    Returns the ratio new / old of every timing and memory figure of the cases both results have, above 1 meaning slower or bigger.
+    """
+
+    ratios = {}
+    for name, new_case in new["cases"].items():
+        old_case = old["cases"].get(name)
+        if old_case is None:
+            continue
+
+        ratios[name] = {key: new_case[key] / old_case[key] for key in new_case if old_case.get(key)}
+
+    return ratios
+
+
+def _time(func: Callable, repeat: int) -> list[float]:
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        started_at = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - started_at)
+
+    return times
+
+
+def _get_peak_memory(func: Callable) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def _get_version() -> str:
+    try:
+        return importlib.metadata.version("tsetmc-scraper")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m tsetmc_scraper.benchmark",
+        description="Offline benchmarks of the parsers and model construction.",
+    )
+    parser.add_argument("--fixtures", default=None, help="directory of recorded fixtures, synthetic ones are generated if omitted")
+    parser.add_argument("--case", action="append", choices=list(BENCHMARK_CASES), help="case to run, all of them if omitted")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None, help="file to save the results to as JSON")
+    parser.add_argument("--compare", default=None, help="earlier results to compare against")
+    args = parser.parse_args()
+
+    results = run_benchmarks(fixtures_path=args.fixtures, cases=args.case, repeat=args.repeat)
+
+    for name, case in results["cases"].items():
+        print(
+            f"{name:24} parse {case['parse_seconds'] * 1000:9.2f} ms  model {case['model_seconds'] * 1000:9.2f} ms  "
+            f"peak {case['total_peak_bytes'] / 2**20:8.2f} MiB"
+        )
+
+    if args.output is not None:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare, encoding="utf-8") as f:
+            old = json.load(f)
+
+        for name, ratios in compare_results(old, results).items():
+            print(
+                f"{name:24} parse x{ratios.get('parse_seconds', float('nan')):.2f}  total x{ratios.get('total_seconds', float('nan')):.2f}  "
+                f"peak x{ratios.get('total_peak_bytes', float('nan')):.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .memo import is_refreshing, refresh
+from .transport import Request, TextResponse
+
+# seconds each endpoint's responses are kept for, endpoints that are not listed are not cached
+DEFAULT_CACHE_TTLS = {
+    "get_group_static_data": 24 * 60 * 60,
+    "get_symbol_id_details": 24 * 60 * 60,
+    "get_symbol_info": 6 * 60 * 60,
+    "get_symbol_option_data": 24 * 60 * 60,
+}
+
+
+class ResponseCache:
+    """
+    Persistent SQLite response cache keyed by endpoint and request parameters. Each endpoint is kept for its TTL in `ttls` (None keeps it forever), responses of historical requests (past days in day_details) never expire, and once the stored text exceeds `max_size` bytes the least recently used entries are evicted.
+
+    Pass it to Transport or AsyncClient as `cache`.
+    """
+
+    def __init__(
+        self,
+        path: str = os.path.join(os.path.expanduser("~"), ".cache", "tsetmc_scraper", "responses.sqlite3"),
+        ttls: dict[str, float | None] | None = None,
+        max_size: int = 512 * 1024 * 1024,
+    ):
+        self.path = path
+        self.ttls = DEFAULT_CACHE_TTLS if ttls is None else ttls
+        self.max_size = max_size
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT,
+                url TEXT,
+                text TEXT,
+                size INTEGER,
+                expires_at REAL,
+                accessed_at REAL
+            )
+            """
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+        # total size of the stored text, kept up to date by triggers so that eviction does not sum the whole table on every put
+        with self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS responses_size (total INTEGER)")
+            self._connection.execute(
+                "INSERT INTO responses_size SELECT COALESCE(SUM(size), 0) FROM responses WHERE NOT EXISTS (SELECT 1 FROM responses_size)"
+            )
+            self._connection.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS responses_size_insert AFTER INSERT ON responses
+                BEGIN UPDATE responses_size SET total = total + NEW.size; END
+                """
+            )
+            self._connection.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS responses_size_update AFTER UPDATE OF size ON responses
+                BEGIN UPDATE responses_size SET total = total + NEW.size - OLD.size; END
+                """
+            )
+            self._connection.execute(
+                """
+                CREATE TRIGGER IF NOT EXISTS responses_size_delete AFTER DELETE ON responses
+                BEGIN UPDATE responses_size SET total = total - OLD.size; END
+                """
+            )
+
+    def get_ttl(self, request: Request) -> float | None | bool:
+        """
+        Returns how long a response may be kept: seconds, None for forever, or False if it must not be cached.
+        """
+
+        if request.historical:
+            return None
+
+        return self.ttls.get(request.endpoint, False)
+
+    def get(self, request: Request) -> TextResponse | None:
+        if is_refreshing() or self.get_ttl(request) is False:
+            return None
+
+        key = self._get_key(request)
+        now = time.time()
+
+        with self._lock:
+            row = self._connection.execute("SELECT url, text, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+
+            url, text, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+
+        return TextResponse(url=url, status_code=200, headers={}, text=text)
+
+    def put(self, request: Request, response):
+        ttl = self.get_ttl(request)
+        if ttl is False:
+            return
+
+        text = response.text
+        size = len(text.encode("utf-8"))
+        if size > self.max_size:
+            return
+
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+
+        with self._lock:
+            self._connection.execute(
+                """
+                INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    endpoint = excluded.endpoint,
+                    url = excluded.url,
+                    text = excluded.text,
+                    size = excluded.size,
+                    expires_at = excluded.expires_at,
+                    accessed_at = excluded.accessed_at
+                """,
+                (self._get_key(request), request.endpoint, str(response.url), text, size, expires_at, now),
+            )
+            self._evict()
+
+    def invalidate(self, endpoint: str | None = None, url: str | None = None):
+        """
+        Removes cached entries of an endpoint, or of a single url, or everything when called without arguments.
+        """
+
+        query = "DELETE FROM responses WHERE 1 = 1"
+        args = []
+        if endpoint is not None:
+            query += " AND endpoint = ?"
+            args.append(endpoint)
+        if url is not None:
+            # urls have "_" and "%" in them, which LIKE would take for wildcards
+            query += " AND url LIKE ? ESCAPE '\\'"
+            args.append(url.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+
+        with self._lock:
+            self._connection.execute(query, args)
+
+    def refresh(self):
+        """
+        Within this context cached entries (and memoized ones) are ignored, every response is fetched again and stored.
+        """
+
+        return refresh()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _evict(self):
+        (total_size,) = self._connection.execute("SELECT total FROM responses_size").fetchone()
+        if total_size <= self.max_size:
+            return
+
+        # delete the least recently used entries until the cache fits again
+        freed = 0
+        keys = []
+        for key, size in self._connection.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            keys.append((key,))
+            freed += size
+            if total_size - freed <= self.max_size:
+                break
+
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", keys)
+
+    @staticmethod
+    def _get_key(request: Request) -> str:
+        return json.dumps(request.key)
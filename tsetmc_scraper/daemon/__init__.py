@@ -0,0 +1,3 @@
+from .daemon import FETCH_TARGETS, PollingDaemon, PollJob
+from .hours import TEHRAN_TIMEZONE, TRADING_HOURS, TradingHours
+from .sinks import CallbackSink, FileSink, PollResult, QueueSink, Sink
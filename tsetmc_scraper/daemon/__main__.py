@@ -0,0 +1,35 @@
+import argparse
+import json
+import sys
+
+from .daemon import PollingDaemon
+from .sinks import FileSink
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m tsetmc_scraper.daemon",
+        description="Polls live market data on a schedule and writes the results as JSON lines.",
+    )
+    parser.add_argument("config", help="JSON file of the jobs, see PollingDaemon.from_config")
+    parser.add_argument("--output", required=True, help="JSON lines file to append the results to")
+    args = parser.parse_args()
+
+    with open(args.config, encoding="utf-8") as f:
+        config = json.load(f)
+
+    daemon = PollingDaemon.from_config(
+        config,
+        sinks=[FileSink(args.output)],
+        on_error=lambda job, e: print(f"{job.name}: {e!r}", file=sys.stderr),
+    )
+    try:
+        daemon.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+
+
+if __name__ == "__main__":
+    main()
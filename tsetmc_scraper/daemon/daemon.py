@@ -0,0 +1,270 @@
+import contextvars
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Generator
+
+import schedule
+
+from ..market_map import MapType, MarketMap
+from ..market_watch import MarketWatch
+from ..symbol import Symbol
+from ..transport import Transport, drive, get_transport
+from .hours import TEHRAN_TIMEZONE, TRADING_HOURS, TradingHours
+from .sinks import PollResult, Sink
+
+
+def _method_target(create: Callable[[dict], object], method: str):
+    # the instance is created once per job, so stateful fetchers (such as market watch deltas) keep their state between runs until the job is reset
+    def factory(params: dict) -> Callable[[], Generator]:
+        params = dict(params)
+        endpoint = getattr(create(params), method)
+        return lambda: endpoint.steps(**params)
+
+    return factory
+
+
+def _market_map_target(params: dict) -> Callable[[], Generator]:
+    market_map = MarketMap()
+    map_type = MapType(params.get("map_type", MapType.MARKET_VALUE.value))
+    return lambda: market_map.get_market_map_data.steps(map_type=map_type)
+
+
+# target name: function of the job params returning the endpoint steps to run on every poll
+FETCH_TARGETS: dict[str, Callable[[dict], Callable[[], Generator]]] = {
+    "market_watch.prices": _method_target(lambda params: MarketWatch(), "get_price_data"),
+    "market_watch.events": _method_target(lambda params: MarketWatch(), "get_events"),
+    "market_watch.traders_type": _method_target(lambda params: MarketWatch(), "get_traders_type_data"),
+    "market_watch.stats": _method_target(lambda params: MarketWatch(), "get_stats_data"),
+    "market_map": _market_map_target,
+    "symbol.orderbook": _method_target(lambda params: Symbol(symbol_id=params.pop("symbol_id")), "get_orderbook"),
+    "symbol.price_overview": _method_target(lambda params: Symbol(symbol_id=params.pop("symbol_id")), "get_price_overview"),
+    "symbol.trades": _method_target(lambda params: Symbol(symbol_id=params.pop("symbol_id")), "get_trades_data"),
+}
+
+
+class PollJob:
+    """
+    A fetch to repeat every `interval` seconds while `hours` are open (always if None). `target` is the name of one of FETCH_TARGETS, given `params` (such as {"symbol_id": ...}), or a function returning the endpoint steps to run. Results go to the job's `sinks` as well as the daemon's.
+
+    Targets such as the market watch prices and events and the market map only fetch the changes since their latest update, a time of day that is stale once a new session starts. The daemon resets named targets on the first run after `hours` reopen and on the first run of a new Tehran date, which is the only reset of jobs with hours=None. Function targets keep whatever state they have.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        target: str | Callable[[], Generator],
+        interval: float,
+        params: dict | None = None,
+        hours: TradingHours | None = TRADING_HOURS,
+        sinks: list[Sink] | None = None,
+    ):
+        if isinstance(target, str) and target not in FETCH_TARGETS:
+            raise ValueError(f"unknown target {target!r}, expected one of {', '.join(FETCH_TARGETS)}")
+
+        self.name = name
+        self.target = target
+        self.interval = interval
+        self.params = params or {}
+        self.hours = hours
+        self.sinks = sinks or []
+
+        self._steps = FETCH_TARGETS[target](self.params) if isinstance(target, str) else target
+
+    @classmethod
+    def from_dict(cls, config: dict, sinks: list[Sink] | None = None) -> "PollJob":
+        """
+        Creates a job from a config such as {"name": "watch", "target": "market_watch.events", "interval": 2, "params": {}, "hours": {"start": "09:00", "end": "12:30"}}. Without "hours" the job runs in the default trading hours, with "hours": null it always runs.
+        """
+
+        hours = config.get("hours", {})
+
+        return cls(
+            name=config["name"],
+            target=config["target"],
+            interval=config["interval"],
+            params=config.get("params"),
+            hours=TradingHours.from_dict(hours) if hours else (TRADING_HOURS if "hours" not in config else None),
+            sinks=sinks,
+        )
+
+    def steps(self) -> Generator:
+        return self._steps()
+
+    def reset(self):
+        """
+        Recreates the fetcher of a named target, dropping its state, so that its next run fetches a full snapshot.
+        """
+
+        if isinstance(self.target, str):
+            self._steps = FETCH_TARGETS[self.target](self.params)
+
+
+class PollingDaemon:
+    """
+    Runs poll jobs on a schedule, on a shared pool of `max_workers` threads and a shared transport, and passes their results to the sinks. Runs outside a job's hours are skipped, and so are runs of a job whose previous run (its sinks included) has not finished yet, so slow consumers slow the polling down instead of piling results up. Runs, skips, errors and resets at the start of a session (see PollJob) are counted per job in `stats`; errors are also passed to `on_error`.
+    """
+
+    def __init__(
+        self,
+        jobs: list[PollJob] | None = None,
+        sinks: list[Sink] | None = None,
+        max_workers: int = 4,
+        transport: Transport | None = None,
+        on_error: Callable[[PollJob, Exception], None] | None = None,
+    ):
+        self.jobs = {}
+        self.sinks = sinks or []
+        self.max_workers = max_workers
+        self.transport = transport
+        self.on_error = on_error
+        self.stats = defaultdict(Counter)
+
+        self.scheduler = schedule.Scheduler()
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tsetmc-poll")
+        self._running = set()
+        # Tehran date of the latest run of every job, and the jobs that have been closed since their latest run
+        self._run_dates = {}
+        self._closed = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        for job in jobs or []:
+            self.add_job(job)
+
+    @classmethod
+    def from_config(cls, config: dict, sinks: list[Sink] | None = None, **kwargs) -> "PollingDaemon":
+        """
+        Creates a daemon from a config such as {"max_workers": 4, "jobs": [...]}, each job as in PollJob.from_dict.
+        """
+
+        return cls(
+            jobs=[PollJob.from_dict(job) for job in config["jobs"]],
+            sinks=sinks,
+            max_workers=config.get("max_workers", 4),
+            **kwargs,
+        )
+
+    def add_job(self, job: PollJob):
+        if job.name in self.jobs:
+            raise ValueError(f"a job named {job.name!r} already exists")
+
+        self.jobs[job.name] = job
+        self.scheduler.every(job.interval).seconds.do(self._submit, job).tag(job.name)
+
+    def remove_job(self, name: str):
+        self.scheduler.clear(name)
+        del self.jobs[name]
+        self._run_dates.pop(name, None)
+        self._closed.discard(name)
+
+    def run_pending(self):
+        """
+        Submits the jobs that are due, to drive the daemon from an existing loop instead of run_forever.
+        """
+
+        self.scheduler.run_pending()
+
+    def run_forever(self):
+        """
+        Runs the schedule on this thread until stop() is called.
+        """
+
+        while not self._stopped.is_set():
+            self.scheduler.run_pending()
+
+            idle_seconds = self.scheduler.idle_seconds
+            self._stopped.wait(min(max(idle_seconds, 0.01), 1.0) if idle_seconds is not None else 1.0)
+
+    def start(self) -> "PollingDaemon":
+        """
+        Runs the schedule on a background thread.
+        """
+
+        self._stopped.clear()
+        # the scheduler, and the jobs it submits, run in a copy of the caller's context, so validation() and raw_dates() apply to them
+        self._thread = threading.Thread(
+            target=contextvars.copy_context().run,
+            args=(self.run_forever,),
+            name="tsetmc-poll-scheduler",
+            daemon=True,
+        )
+        self._thread.start()
+
+        return self
+
+    def stop(self, wait: bool = True):
+        """
+        Stops scheduling, waits for the running jobs if `wait` and closes the sinks.
+        """
+
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        self._executor.shutdown(wait=wait)
+
+        sinks = [*self.sinks, *(sink for job in self.jobs.values() for sink in job.sinks)]
+        for sink in {id(sink): sink for sink in sinks}.values():
+            sink.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _submit(self, job: PollJob):
+        now = datetime.now(TEHRAN_TIMEZONE)
+        if job.hours is not None and not job.hours.is_open(now):
+            if job.name in self._run_dates:
+                self._closed.add(job.name)
+            self._count(job, "skipped_closed")
+            return
+
+        with self._lock:
+            is_busy = job.name in self._running
+            self._running.add(job.name)
+
+        if is_busy:
+            self._count(job, "skipped_busy")
+            return
+
+        # the job is not running, so its fetcher can be replaced safely
+        if job.name in self._closed or self._run_dates.get(job.name, now.date()) != now.date():
+            job.reset()
+            self._count(job, "resets")
+        self._closed.discard(job.name)
+        self._run_dates[job.name] = now.date()
+
+        self._executor.submit(contextvars.copy_context().run, self._run, job)
+
+    def _run(self, job: PollJob):
+        transport = self.transport if self.transport is not None else get_transport()
+
+        try:
+            started_at = datetime.now(TEHRAN_TIMEZONE)
+            started = time.perf_counter()
+            data = drive(job.steps(), transport.send)
+            result = PollResult(job=job.name, data=data, started_at=started_at, seconds=time.perf_counter() - started)
+
+            for sink in [*self.sinks, *job.sinks]:
+                sink.put(result)
+
+            self._count(job, "runs")
+        except Exception as e:
+            self._count(job, "errors")
+            if self.on_error is not None:
+                self.on_error(job, e)
+        finally:
+            with self._lock:
+                self._running.discard(job.name)
+
+    def _count(self, job: PollJob, key: str):
+        with self._lock:
+            self.stats[job.name][key] += 1
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+from jdatetime import date as jdate
+from jdatetime import time as jtime
+
+from ..utils import TEHRAN_TIMEZONE
+
+
+# datetime.weekday() of Saturday to Wednesday, the trading days of the Tehran exchange
+TRADING_WEEKDAYS = (5, 6, 0, 1, 2)
+
+
+class TradingHours:
+    """
+    Session of the Tehran exchange in Tehran time: from `start` to `end` on `weekdays` (datetime.weekday() numbers, Saturday to Wednesday by default), except on `holidays`.
+    """
+
+    def __init__(
+        self,
+        start: jtime = jtime(9, 0),
+        end: jtime = jtime(12, 30),
+        weekdays: tuple[int, ...] = TRADING_WEEKDAYS,
+        holidays: list[jdate] | None = None,
+    ):
+        self.start = start
+        self.end = end
+        self.weekdays = tuple(weekdays)
+        self.holidays = set(holidays or [])
+
+    @classmethod
+    def from_dict(cls, config: dict) -> "TradingHours":
+        """
+        Creates trading hours from a config such as {"start": "08:45", "end": "12:30", "weekdays": [5, 6, 0, 1, 2], "holidays": ["1402-01-01"]}, every key being optional.
+        """
+
+        kwargs = {}
+        if "start" in config:
+            kwargs["start"] = _parse_time(config["start"])
+        if "end" in config:
+            kwargs["end"] = _parse_time(config["end"])
+        if "weekdays" in config:
+            kwargs["weekdays"] = tuple(config["weekdays"])
+        if "holidays" in config:
+            kwargs["holidays"] = [jdate(*map(int, holiday.split("-"))) for holiday in config["holidays"]]
+
+        return cls(**kwargs)
+
+    def is_open(self, now: datetime | None = None) -> bool:
+        """
+        Whether the session is open at `now` (an aware datetime, the current time by default).
+        """
+
+        now = datetime.now(TEHRAN_TIMEZONE) if now is None else now.astimezone(TEHRAN_TIMEZONE)
+
+        if now.weekday() not in self.weekdays:
+            return False
+
+        if self.holidays and jdate.fromgregorian(date=now.date()) in self.holidays:
+            return False
+
+        return self.start <= now.time() < self.end
+
+
+# the continuous trading session
+TRADING_HOURS = TradingHours()
+
+
+def _parse_time(value: str) -> jtime:
+    return jtime(*map(int, value.split(":")))
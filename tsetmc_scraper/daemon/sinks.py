@@ -0,0 +1,127 @@
+import json
+import queue
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, NamedTuple
+
+from pydantic import BaseModel
+
+
+class PollResult(NamedTuple):
+    job: str
+    data: Any
+    # Tehran time the run started at
+    started_at: datetime
+    seconds: float
+
+
+class Sink(ABC):
+    """
+    Destination of poll results. `put` is called on the worker that ran the job, so a sink that blocks holds the job back: its next runs are skipped until the sink catches up.
+    """
+
+    @abstractmethod
+    def put(self, result: PollResult):
+        pass
+
+    def close(self):
+        pass
+
+
+class CallbackSink(Sink):
+    """
+    Calls `callback` with every result.
+    """
+
+    def __init__(self, callback: Callable[[PollResult], None]):
+        self.callback = callback
+
+    def put(self, result: PollResult):
+        self.callback(result)
+
+
+class FileSink(Sink):
+    """
+    Appends every result to a JSON lines file as {"job", "started_at", "seconds", "data"}, with models written as dicts and arrays as lists.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def put(self, result: PollResult):
+        line = json.dumps(
+            {"job": result.job, "started_at": result.started_at, "seconds": result.seconds, "data": result.data},
+            default=_to_json,
+            ensure_ascii=False,
+        )
+
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class QueueSink(Sink):
+    """
+    Puts every result on a queue (a bounded queue.Queue by default) for consumers on other threads. When the queue is full, `overflow` decides: "block" waits for room, so the job is held back and its runs are skipped meanwhile; "drop_oldest" discards the oldest queued result; "drop_newest" discards the new one. Discarded results are counted in `dropped`.
+    """
+
+    def __init__(self, results: queue.Queue | None = None, maxsize: int = 1000, overflow: str = "block"):
+        if overflow not in ("block", "drop_oldest", "drop_newest"):
+            raise ValueError(f"unknown overflow policy {overflow!r}")
+
+        self.queue = results if results is not None else queue.Queue(maxsize=maxsize)
+        self.overflow = overflow
+        self.dropped = 0
+
+        self._lock = threading.Lock()
+
+    def put(self, result: PollResult):
+        if self.overflow == "block":
+            self.queue.put(result)
+            return
+
+        while True:
+            try:
+                self.queue.put_nowait(result)
+                return
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+
+                if self.overflow == "drop_newest":
+                    return
+
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+
+
+def _to_json(value):
+    if isinstance(value, BaseModel):
+        return value.dict()
+
+    if isinstance(value, Enum):
+        return value.value
+
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+
+    # numpy arrays and scalars
+    if hasattr(value, "tolist"):
+        return value.tolist()
+
+    # datetime, jdatetime and their dates and times
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+
+    return str(value)
@@ -1 +1,4 @@
-from .day_details import DayDetails
+from .backfill import BackfillDay, BackfillReport, DayDetailsBackfill
+from .dataset import DayDetailsDataset
+from .day_details import AsyncDayDetails, DayDetails
+from .replay import DayDetailsReplay, ReplayStep
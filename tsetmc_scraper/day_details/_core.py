@@ -1,22 +1,23 @@
-from collections import defaultdict
-from copy import deepcopy
-
-import requests
 from jdatetime import date as jdate
 
-from ..utils import convert_deven_to_jdate, convert_heven_to_jtime, get_request_headers
+from ..instrumentation import count_column_rows
+from ..transport import Request, endpoint
+from ..utils import convert_deven_to_jdate, convert_heven_to_jtime, convert_heven_to_seconds, import_optional
+
 
+def _is_historical(date: jdate) -> bool:
+    # data of days before today does not change anymore
+    return date < jdate.today()
 
+
+@endpoint(rows=1)
 def get_day_details_price_overview(symbol_id: str, date: jdate) -> dict:
     t = date.togregorian().strftime("%Y%m%d")
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/ClosingPrice/GetClosingPriceDaily/{symbol_id}/{t}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
+        historical=_is_historical(date),
     )
-    response.raise_for_status()
     response = response.json()["closingPriceDaily"]
 
     return {
@@ -33,16 +34,14 @@ def get_day_details_price_overview(symbol_id: str, date: jdate) -> dict:
     }
 
 
+@endpoint
 def get_day_details_price_data(symbol_id: str, date: jdate) -> list[dict]:
     t = date.togregorian().strftime("%Y%m%d")
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/ClosingPrice/GetClosingPriceHistory/{symbol_id}/{t}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
+        historical=_is_historical(date),
     )
-    response.raise_for_status()
     response = response.json()["closingPriceHistory"]
 
     price_data = [
@@ -60,96 +59,172 @@ def get_day_details_price_data(symbol_id: str, date: jdate) -> list[dict]:
     return price_data
 
 
-def get_day_details_orderbook_data(symbol_id: str, date: jdate) -> list[dict]:
+@endpoint
+def get_day_details_orderbook_events(symbol_id: str, date: jdate) -> list[tuple]:
     t = date.togregorian().strftime("%Y%m%d")
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/BestLimits/{symbol_id}/{t}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
+        historical=_is_historical(date),
     )
-    response.raise_for_status()
     response = response.json()["bestLimitsHistory"]
     response = sorted(response, key=lambda x: (x["hEven"], x["number"]))
 
-    prev_data = {"buy_rows": [], "sell_rows": []}
-    heven_map = defaultdict(lambda: {"buy_rows": [], "sell_rows": []})
+    # every row updates one level of both sides, side 0 is buy and 1 is sell
+    events = []
     for row in response:
-        heven = row["hEven"]
-        t = convert_heven_to_jtime(heven=heven)
+        events.append((row["hEven"], row["number"], 0, row["zOrdMeDem"], row["pMeDem"], row["qTitMeDem"]))
+        events.append((row["hEven"], row["number"], 1, row["zOrdMeOf"], row["pMeOf"], row["qTitMeOf"]))
 
-        buy_row = {
-            "time": t,
-            "count": row["zOrdMeDem"],
-            "price": row["pMeDem"],
-            "volume": row["qTitMeDem"],
-        }
-        sell_row = {
-            "time": t,
-            "count": row["zOrdMeOf"],
-            "price": row["pMeOf"],
-            "volume": row["qTitMeOf"],
-        }
+    return events
 
-        index = row["number"] - 1
 
-        if heven not in heven_map:
-            heven_map[heven] = deepcopy(prev_data)
-
-        while len(heven_map[heven]["buy_rows"]) < index + 1:
-            heven_map[heven]["buy_rows"].append(None)
-
-        while len(heven_map[heven]["sell_rows"]) < index + 1:
-            heven_map[heven]["sell_rows"].append(None)
-
-        heven_map[heven]["buy_rows"][index] = buy_row
-        heven_map[heven]["sell_rows"][index] = sell_row
-
-        prev_data = heven_map[heven]
-
-    return [
-        {
-            "time": convert_heven_to_jtime(heven=key),
-            **value,
+@endpoint
+def get_day_details_orderbook_data(symbol_id: str, date: jdate) -> list[dict]:
+    events = yield from get_day_details_orderbook_events.steps(symbol_id=symbol_id, date=date)
+
+    # each snapshot starts as a shallow copy of the previous one, rows that did not change are shared
+    snapshots = []
+    buy_rows = []
+    sell_rows = []
+    last_heven = None
+    for heven, level, side, count, price, volume in events:
+        if heven != last_heven:
+            last_heven = heven
+            t = convert_heven_to_jtime(heven=heven)
+            buy_rows = list(buy_rows)
+            sell_rows = list(sell_rows)
+            snapshots.append({"time": t, "buy_rows": buy_rows, "sell_rows": sell_rows})
+
+        rows = sell_rows if side else buy_rows
+        while len(rows) < level:
+            rows.append(None)
+
+        rows[level - 1] = {
+            "time": t,
+            "count": count,
+            "price": price,
+            "volume": volume,
         }
-        for key, value in heven_map.items()
-    ]
+
+    return snapshots
 
 
+@endpoint
 def get_day_details_trade_data(symbol_id: str, date: jdate, summarize: bool) -> list[dict]:
     t = date.togregorian().strftime("%Y%m%d")
     summarize_url_ph = "true" if summarize else "false"
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/Trade/GetTradeHistory/{symbol_id}/{t}/{summarize_url_ph}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
+        historical=_is_historical(date),
     )
-    response.raise_for_status()
     response = response.json()["tradeHistory"]
 
     return [
         {
             "time": convert_heven_to_jtime(heven=row["hEven"]),
-            "price": row["pTran"],
+            "price": int(row["pTran"]),
             "volume": row["qTitTran"],
         }
         for row in response
     ]
 
 
+@endpoint(rows=count_column_rows)
+def get_day_details_price_columns(symbol_id: str, date: jdate) -> dict:
+    np = import_optional("numpy", "numpy")
+
+    t = date.togregorian().strftime("%Y%m%d")
+    response = yield Request(
+        url=f"http://cdn.tsetmc.com/api/ClosingPrice/GetClosingPriceHistory/{symbol_id}/{t}",
+        params={},
+        historical=_is_historical(date),
+    )
+    response = response.json()["closingPriceHistory"]
+
+    table = np.array(
+        [(row["hEven"], row["pClosing"], row["pDrCotVal"], row["qTotCap"], row["qTotTran5J"], row["zTotTran"]) for row in response],
+        dtype=np.int64,
+    ).reshape(len(response), 6)
+
+    return {
+        "heven": table[:, 0],
+        "seconds": convert_heven_to_seconds(table[:, 0]),
+        "close": table[:, 1],
+        "last": table[:, 2],
+        "value": table[:, 3],
+        "volume": table[:, 4],
+        "count": table[:, 5],
+    }
+
+
+@endpoint(rows=count_column_rows)
+def get_day_details_orderbook_columns(symbol_id: str, date: jdate) -> dict:
+    np = import_optional("numpy", "numpy")
+
+    t = date.togregorian().strftime("%Y%m%d")
+    response = yield Request(
+        url=f"http://cdn.tsetmc.com/api/BestLimits/{symbol_id}/{t}",
+        params={},
+        historical=_is_historical(date),
+    )
+    response = response.json()["bestLimitsHistory"]
+
+    table = np.array(
+        [
+            (row["hEven"], row["number"], row["zOrdMeDem"], row["pMeDem"], row["qTitMeDem"], row["zOrdMeOf"], row["pMeOf"], row["qTitMeOf"])
+            for row in response
+        ],
+        dtype=np.int64,
+    ).reshape(len(response), 8)
+    table = table[np.lexsort((table[:, 1], table[:, 0]))]
+
+    # long format, every update becomes a buy row followed by a sell row (side 0 is buy and 1 is sell)
+    heven = np.repeat(table[:, 0], 2)
+
+    return {
+        "heven": heven,
+        "seconds": convert_heven_to_seconds(heven),
+        "level": np.repeat(table[:, 1], 2),
+        "side": np.tile(np.array([0, 1], dtype=np.int64), len(table)),
+        "count": table[:, [2, 5]].reshape(-1),
+        "price": table[:, [3, 6]].reshape(-1),
+        "volume": table[:, [4, 7]].reshape(-1),
+    }
+
+
+@endpoint(rows=count_column_rows)
+def get_day_details_trade_columns(symbol_id: str, date: jdate, summarize: bool) -> dict:
+    np = import_optional("numpy", "numpy")
+
+    t = date.togregorian().strftime("%Y%m%d")
+    summarize_url_ph = "true" if summarize else "false"
+    response = yield Request(
+        url=f"http://cdn.tsetmc.com/api/Trade/GetTradeHistory/{symbol_id}/{t}/{summarize_url_ph}",
+        params={},
+        historical=_is_historical(date),
+    )
+    response = response.json()["tradeHistory"]
+
+    table = np.array([(row["hEven"], row["pTran"], row["qTitTran"]) for row in response], dtype=np.int64).reshape(len(response), 3)
+
+    return {
+        "heven": table[:, 0],
+        "seconds": convert_heven_to_seconds(table[:, 0]),
+        "price": table[:, 1],
+        "volume": table[:, 2],
+    }
+
+
+@endpoint(rows=1)
 def get_day_details_traders_type_data(symbol_id: str, date: jdate) -> dict:
     t = date.togregorian().strftime("%Y%m%d")
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/ClientType/GetClientTypeHistory/{symbol_id}/{t}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
+        historical=_is_historical(date),
     )
-    response.raise_for_status()
     response = response.json()["clientType"]
 
     return {
@@ -180,34 +255,30 @@ def get_day_details_traders_type_data(symbol_id: str, date: jdate) -> dict:
     }
 
 
+@endpoint(rows=1)
 def get_day_details_thresholds_data(symbol_id: str, date: jdate) -> dict:
     t = date.togregorian().strftime("%Y%m%d")
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/MarketData/GetStaticThreshold/{symbol_id}/{t}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
+        historical=_is_historical(date),
     )
-    response.raise_for_status()
     response = response.json()["staticThreshold"]
 
     return {
-        "max": response[1]["psGelStaMax"],
-        "min": response[1]["psGelStaMin"],
+        "max": int(response[1]["psGelStaMax"]),
+        "min": int(response[1]["psGelStaMin"]),
     }
 
 
+@endpoint(rows=lambda shareholders: len(shareholders[0]) + len(shareholders[1]))
 def get_day_details_shareholders_data(symbol_id: str, date: jdate) -> tuple[list[dict], list[dict]]:
     t = date.togregorian().strftime("%Y%m%d")
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/Shareholder/{symbol_id}/{t}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
+        historical=_is_historical(date),
     )
-    response.raise_for_status()
     response = response.json()["shareShareholder"]
 
     old_shareholders = []
@@ -229,15 +300,12 @@ def get_day_details_shareholders_data(symbol_id: str, date: jdate) -> tuple[list
     return old_shareholders, new_shareholders
 
 
+@endpoint
 def get_shareholder_chart_data(symbol_id: str, shareholder_id: str, days: int) -> list[dict]:
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/Shareholder/GetShareHolderHistory/{symbol_id}/{shareholder_id}/{days}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.json()["shareHolder"]
 
     return [
@@ -250,15 +318,12 @@ def get_shareholder_chart_data(symbol_id: str, shareholder_id: str, days: int) -
     ]
 
 
+@endpoint
 def get_shareholder_portfolio(shareholder_id: str) -> list[dict]:
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/Shareholder/GetShareHolderCompanyList/{shareholder_id}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.json()["shareHolderShare"]
 
     return [
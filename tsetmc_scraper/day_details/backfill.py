@@ -0,0 +1,174 @@
+import contextvars
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+from jdatetime import date as jdate
+from pydantic import BaseModel
+
+from ..symbol import BulkSymbol
+from ..transport import Endpoint, HostLimiter, Request, Transport, drive, get_transport
+from ..utils import to_jdate
+from .day_details import DayDetails
+
+
+class BackfillDay(BaseModel):
+    symbol_id: str
+    date: jdate
+    data: dict[str, Any]
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class BackfillReport(BaseModel):
+    done: int
+    skipped: int
+    failed: dict[tuple[str, jdate | None], Exception]
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class DayDetailsBackfill:
+    """
+    Fetches DayDetails endpoints for every trading day of a set of symbols in a jdate range. Trading days are read from each symbol's daily history, finished days are passed to `sink` as soon as they are fetched and, if `checkpoint_path` is given, recorded there so that an interrupted run resumes where it stopped.
+
+    Endpoints are DayDetails method names, e.g. "get_trades_data", "get_orderbook_data", "get_price_data" or "get_traders_type_data".
+    """
+
+    def __init__(
+        self,
+        symbol_ids: list[str],
+        start: jdate,
+        end: jdate,
+        sink: Callable[[BackfillDay], None],
+        endpoints: list[str] | None = None,
+        checkpoint_path: str | None = None,
+        max_workers: int = 8,
+        max_per_host: int = 8,
+        transport: Transport | None = None,
+    ):
+        self.symbol_ids = list(dict.fromkeys(symbol_ids))
+        self.start = start
+        self.end = end
+        self.sink = sink
+        self.checkpoint_path = checkpoint_path
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.transport = transport
+
+        if endpoints is None:
+            endpoints = ["get_trades_data", "get_orderbook_data", "get_price_data", "get_traders_type_data"]
+
+        self.endpoints = {}
+        for name in endpoints:
+            method = getattr(DayDetails, name, None)
+            if not isinstance(method, Endpoint):
+                raise ValueError(f"{name} is not a DayDetails endpoint")
+
+            self.endpoints[name] = method
+
+    def get_trading_days(self) -> tuple[dict[str, list[jdate]], dict[str, Exception]]:
+        """
+        Returns the trading days in range for each symbol, based on its daily history, along with the symbols whose history could not be fetched.
+        """
+
+        results = BulkSymbol(
+            symbol_ids=self.symbol_ids,
+            max_workers=self.max_workers,
+            max_per_host=self.max_per_host,
+            transport=self.transport,
+        ).get_data(["get_daily_history"])
+
+        trading_days = {}
+        errors = {}
+        for symbol_id, result in results.items():
+            if not result.ok:
+                errors[symbol_id] = result.errors["get_daily_history"]
+                continue
+
+            days = {to_jdate(row.date) for row in result.data["get_daily_history"]}
+            days = {date for date in days if self.start <= date <= self.end}
+            trading_days[symbol_id] = sorted(days)
+
+        return trading_days, errors
+
+    def run(self) -> BackfillReport:
+        """
+        Runs the backfill and returns how many days were fetched, skipped because they are already checkpointed, or failed. Failed days are not checkpointed, so they are retried on the next run. A symbol whose daily history fails is reported with a None date.
+        """
+
+        done_keys = self._load_checkpoint()
+        trading_days, history_errors = self.get_trading_days()
+
+        pending_days = []
+        skipped = 0
+        for symbol_id, days in trading_days.items():
+            for date in days:
+                if self._get_key(symbol_id, date) in done_keys:
+                    skipped += 1
+                else:
+                    pending_days.append((symbol_id, date))
+
+        transport = self.transport if self.transport is not None else get_transport()
+        limiter = HostLimiter(max_per_host=self.max_per_host)
+
+        def send(request: Request):
+            with limiter(request.url):
+                return transport.send(request)
+
+        def fetch(symbol_id: str, date: jdate) -> BackfillDay:
+            day_details = DayDetails(symbol_id=symbol_id, date=date)
+            data = {name: drive(method.steps(day_details), send) for name, method in self.endpoints.items()}
+            return BackfillDay(symbol_id=symbol_id, date=date, data=data)
+
+        done = 0
+        failed = {(symbol_id, None): e for symbol_id, e in history_errors.items()}
+        checkpoint = open(self.checkpoint_path, "a", encoding="utf-8") if self.checkpoint_path else None
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # only keep a bounded number of days in flight, so finished days do not pile up in memory
+                days_iter = iter(pending_days)
+                futures = {}
+                while True:
+                    while len(futures) < self.max_workers * 2:
+                        symbol_id, date = next(days_iter, (None, None))
+                        if symbol_id is None:
+                            break
+
+                        # in a copy of the caller's context, so validation() and raw_dates() apply in the workers too
+                        futures[executor.submit(contextvars.copy_context().run, fetch, symbol_id, date)] = (symbol_id, date)
+
+                    if not futures:
+                        break
+
+                    finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        symbol_id, date = futures.pop(future)
+                        try:
+                            self.sink(future.result())
+                        except Exception as e:
+                            failed[(symbol_id, date)] = e
+                            continue
+
+                        done += 1
+                        if checkpoint is not None:
+                            checkpoint.write(self._get_key(symbol_id, date) + "\n")
+                            checkpoint.flush()
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+
+        return BackfillReport(done=done, skipped=skipped, failed=failed)
+
+    def _load_checkpoint(self) -> set[str]:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return set()
+
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            return {line.strip() for line in f if line.strip()}
+
+    @staticmethod
+    def _get_key(symbol_id: str, date: jdate) -> str:
+        return f"{symbol_id}:{date.togregorian().strftime('%Y%m%d')}"
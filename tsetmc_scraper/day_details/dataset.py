@@ -0,0 +1,131 @@
+import os
+import shutil
+import time
+import uuid
+
+from jdatetime import date as jdate
+
+from ..utils import import_optional
+from .backfill import BackfillDay
+from .traders_type import DayDetailsTradersTypeData
+
+# data type stored for each DayDetails endpoint when used as a backfill sink
+ENDPOINT_DATA_TYPES = {
+    "get_trades_columns": "trades",
+    "get_orderbook_columns": "orderbook",
+    "get_price_columns": "price",
+    "get_traders_type_data": "traders_type",
+}
+
+# name of the file an overwrite leaves in a partition, sorted before the time ordered names of appended files
+OVERWRITE_FILE_NAME = "part-0.parquet"
+
+
+class DayDetailsDataset:
+    """
+    Hive partitioned Parquet dataset of DayDetails data, laid out as `root/type=<data type>/symbol_id=<symbol id>/date=<YYYYMMDD>/part-*.parquet` with gregorian dates. A partition holds the data of one symbol on one day, so it can be appended to or overwritten on its own, and reads only open the partitions matching their filters. Requires pyarrow.
+
+    Pass its `sink` to DayDetailsBackfill to store a backfill, with endpoints from ENDPOINT_DATA_TYPES.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def write(self, data_type: str, symbol_id: str, date: jdate, columns, mode: str = "overwrite"):
+        """
+        Writes a dict of columns or a PyArrow table to the partition of a symbol and day. "overwrite" replaces whatever the partition held with a single file, so writing a day again is idempotent, while "append" adds a new file next to the existing ones. An overwrite swaps its file in with os.replace, so the partition is never missing or half written, but the files appended to it before are removed only after that, and a reader listing the partition in between sees them next to the new file.
+        """
+
+        pa = import_optional("pyarrow", "arrow")
+        pq = import_optional("pyarrow.parquet", "arrow")
+
+        if mode not in ("overwrite", "append"):
+            raise ValueError(f"unknown mode {mode}, expected overwrite or append")
+
+        table = columns if isinstance(columns, pa.Table) else pa.table(columns)
+        path = self._get_partition_path(data_type, symbol_id, date)
+        # time ordered names, so appended files are read back in the order they were written
+        file_name = f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}.parquet"
+
+        if mode == "append":
+            os.makedirs(path, exist_ok=True)
+            pq.write_table(table, os.path.join(path, file_name))
+            return
+
+        # written under a hidden name inside the partition, readers ignore names starting with a dot, then swapped in with one os.replace
+        os.makedirs(path, exist_ok=True)
+        tmp_path = os.path.join(path, f".tmp-{file_name}")
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, os.path.join(path, OVERWRITE_FILE_NAME))
+
+        for name in os.listdir(path):
+            if name != OVERWRITE_FILE_NAME and not name.startswith("."):
+                os.remove(os.path.join(path, name))
+
+    def read(self, data_type: str, symbol_ids: list[str] | None = None, start: jdate | None = None, end: jdate | None = None):
+        """
+        Reads the rows of a data type as a PyArrow table with symbol_id and date (int YYYYMMDD) columns added, optionally limited to some symbols and an inclusive jdate range. The filters are applied to the partition paths, so other partitions are never opened.
+        """
+
+        pa = import_optional("pyarrow", "arrow")
+        ds = import_optional("pyarrow.dataset", "arrow")
+
+        path = os.path.join(self.root, f"type={data_type}")
+        if not os.path.exists(path):
+            return pa.table({})
+
+        dataset = ds.dataset(
+            path,
+            format="parquet",
+            partitioning=ds.partitioning(pa.schema([("symbol_id", pa.string()), ("date", pa.int32())]), flavor="hive"),
+        )
+
+        expression = None
+        if symbol_ids is not None:
+            expression = _and(expression, ds.field("symbol_id").isin([str(symbol_id) for symbol_id in symbol_ids]))
+        if start is not None:
+            expression = _and(expression, ds.field("date") >= _get_date_key(start))
+        if end is not None:
+            expression = _and(expression, ds.field("date") <= _get_date_key(end))
+
+        return dataset.to_table(filter=expression)
+
+    def delete(self, data_type: str, symbol_id: str, date: jdate):
+        shutil.rmtree(self._get_partition_path(data_type, symbol_id, date), ignore_errors=True)
+
+    def sink(self, day: BackfillDay):
+        """
+        Overwrites the partitions of a backfilled day, one per fetched endpoint.
+        """
+
+        for name, data in day.data.items():
+            data_type = ENDPOINT_DATA_TYPES.get(name)
+            if data_type is None:
+                raise ValueError(f"{name} can not be stored in a dataset, use one of {', '.join(ENDPOINT_DATA_TYPES)}")
+
+            if isinstance(data, DayDetailsTradersTypeData):
+                data = _get_traders_type_columns(data)
+
+            self.write(data_type, day.symbol_id, day.date, data)
+
+    def _get_partition_path(self, data_type: str, symbol_id: str, date: jdate) -> str:
+        return os.path.join(self.root, f"type={data_type}", f"symbol_id={symbol_id}", f"date={_get_date_key(date)}")
+
+
+def _get_date_key(date: jdate) -> int:
+    return int(date.togregorian().strftime("%Y%m%d"))
+
+
+def _and(expression, other):
+    return other if expression is None else expression & other
+
+
+def _get_traders_type_columns(data: DayDetailsTradersTypeData) -> dict[str, list[int]]:
+    columns = {}
+    for trader_type in ("legal", "real"):
+        for side in ("buy", "sell"):
+            sub_info = getattr(getattr(data, trader_type), side)
+            for field in ("count", "volume", "value"):
+                columns[f"{trader_type}_{side}_{field}"] = [getattr(sub_info, field)]
+
+    return columns
@@ -1,7 +1,9 @@
 from jdatetime import date as jdate
 
+from ..aio import AsyncClient, AsyncWrapper, async_method
+from ..transport import endpoint
 from . import _core
-from .orderbook import DayDetailsOrderBookDataRow, DayDetailsOrderBookRow
+from .orderbook import DayDetailsOrderBookDataRow, DayDetailsOrderBookEvent, DayDetailsOrderBookHistory, DayDetailsOrderBookRow
 from .price import DayDetailsPriceDataRow, DayDetailsPriceOverview
 from .shareholder import DayDetailsShareHolder, DayDetailsShareHolderDataRow
 from .threshold import DayDetailsThresholdsData
@@ -14,12 +16,13 @@ class DayDetails:
         self.symbol_id = symbol_id
         self.date = date
 
+    @endpoint
     def get_price_overview(self) -> DayDetailsPriceOverview:
         """
         Returns an overview of price information for a given day.
         """
 
-        raw_data = _core.get_day_details_price_overview(symbol_id=self.symbol_id, date=self.date)
+        raw_data = yield from _core.get_day_details_price_overview.steps(symbol_id=self.symbol_id, date=self.date)
 
         return DayDetailsPriceOverview(
             price_change=raw_data["price_change"],
@@ -34,12 +37,13 @@ class DayDetails:
             value=raw_data["value"],
         )
 
+    @endpoint
     def get_price_data(self) -> list[DayDetailsPriceDataRow]:
         """
         Returns the instant prices for each time on a given date.
         """
 
-        raw_data = _core.get_day_details_price_data(symbol_id=self.symbol_id, date=self.date)
+        raw_data = yield from _core.get_day_details_price_data.steps(symbol_id=self.symbol_id, date=self.date)
 
         return [
             DayDetailsPriceDataRow(
@@ -53,12 +57,13 @@ class DayDetails:
             for row in raw_data
         ]
 
+    @endpoint
     def get_orderbook_data(self) -> list[DayDetailsOrderBookDataRow]:
         """
         Returns the instant orderbooks for each time on a given date.
         """
 
-        raw_data = _core.get_day_details_orderbook_data(symbol_id=self.symbol_id, date=self.date)
+        raw_data = yield from _core.get_day_details_orderbook_data.steps(symbol_id=self.symbol_id, date=self.date)
 
         return [
             DayDetailsOrderBookDataRow(
@@ -85,12 +90,23 @@ class DayDetails:
             for data in raw_data
         ]
 
+    @endpoint
+    def get_orderbook_history(self) -> DayDetailsOrderBookHistory:
+        """
+        Returns the orderbook updates of a given date, from which the book at any time is rebuilt on demand. Much lighter than get_orderbook_data for liquid symbols.
+        """
+
+        raw_data = yield from _core.get_day_details_orderbook_events.steps(symbol_id=self.symbol_id, date=self.date)
+
+        return DayDetailsOrderBookHistory(events=[DayDetailsOrderBookEvent(*event) for event in raw_data])
+
+    @endpoint
     def get_traders_type_data(self) -> DayDetailsTradersTypeData:
         """
         Returns information about trader types for a given day.
         """
 
-        raw_data = _core.get_day_details_traders_type_data(symbol_id=self.symbol_id, date=self.date)
+        raw_data = yield from _core.get_day_details_traders_type_data.steps(symbol_id=self.symbol_id, date=self.date)
 
         return DayDetailsTradersTypeData(
             legal=DayDetailsTradersTypeInfo(
@@ -119,12 +135,13 @@ class DayDetails:
             ),
         )
 
+    @endpoint
     def get_trades_data(self, summarize: bool = False) -> list[DayDetailsTradeDataRow]:
         """
         Returns all available trade data.
         """
 
-        raw_data = _core.get_day_details_trade_data(symbol_id=self.symbol_id, date=self.date, summarize=summarize)
+        raw_data = yield from _core.get_day_details_trade_data.steps(symbol_id=self.symbol_id, date=self.date, summarize=summarize)
 
         return [
             DayDetailsTradeDataRow(
@@ -135,19 +152,51 @@ class DayDetails:
             for row in raw_data
         ]
 
+    @endpoint
+    def get_price_columns(self) -> dict:
+        """
+        Returns the instant prices as NumPy columns (heven, seconds since midnight, close, last, value, volume and count), all int64. Requires numpy.
+        """
+
+        columns = yield from _core.get_day_details_price_columns.steps(symbol_id=self.symbol_id, date=self.date)
+
+        return columns
+
+    @endpoint
+    def get_orderbook_columns(self) -> dict:
+        """
+        Returns the orderbook updates of the day as one long format table of NumPy columns (heven, seconds, level, side, count, price, volume), sorted by time and level. Side 0 is buy and 1 is sell, and the book at a given time consists of the latest row of every (level, side) up to it. Requires numpy.
+        """
+
+        columns = yield from _core.get_day_details_orderbook_columns.steps(symbol_id=self.symbol_id, date=self.date)
+
+        return columns
+
+    @endpoint
+    def get_trades_columns(self, summarize: bool = False) -> dict:
+        """
+        Returns all trades as NumPy columns (heven, seconds since midnight, price, volume), all int64. Requires numpy; pass the result to `utils.columns_to_arrow` for a PyArrow table.
+        """
+
+        columns = yield from _core.get_day_details_trade_columns.steps(symbol_id=self.symbol_id, date=self.date, summarize=summarize)
+
+        return columns
+
+    @endpoint
     def get_thresholds_data(self) -> DayDetailsThresholdsData:
-        raw_data = _core.get_day_details_thresholds_data(symbol_id=self.symbol_id, date=self.date)
+        raw_data = yield from _core.get_day_details_thresholds_data.steps(symbol_id=self.symbol_id, date=self.date)
         return DayDetailsThresholdsData(
             range_max=raw_data["max"],
             range_min=raw_data["min"],
         )
 
+    @endpoint
     def get_shareholders_data(self) -> tuple[list[DayDetailsShareHolderDataRow], list[DayDetailsShareHolderDataRow]]:
         """
         Returns a list of shareholders before and after a given day.
         """
 
-        raw_old_shareholders, raw_new_shareholders = _core.get_day_details_shareholders_data(
+        raw_old_shareholders, raw_new_shareholders = yield from _core.get_day_details_shareholders_data.steps(
             symbol_id=self.symbol_id,
             date=self.date,
         )
@@ -171,3 +220,26 @@ class DayDetails:
         ]
 
         return old_shareholders, new_shareholders
+
+
+class AsyncDayDetails(AsyncWrapper):
+    """
+    Async mirror of DayDetails, returning the same models.
+    """
+
+    def __init__(self, symbol_id: str, date: jdate, client: AsyncClient | None = None):
+        super().__init__(wrapped=DayDetails(symbol_id=symbol_id, date=date), client=client)
+        self.symbol_id = symbol_id
+        self.date = date
+
+    get_price_overview = async_method(DayDetails.get_price_overview)
+    get_price_data = async_method(DayDetails.get_price_data)
+    get_orderbook_data = async_method(DayDetails.get_orderbook_data)
+    get_orderbook_history = async_method(DayDetails.get_orderbook_history)
+    get_traders_type_data = async_method(DayDetails.get_traders_type_data)
+    get_trades_data = async_method(DayDetails.get_trades_data)
+    get_price_columns = async_method(DayDetails.get_price_columns)
+    get_orderbook_columns = async_method(DayDetails.get_orderbook_columns)
+    get_trades_columns = async_method(DayDetails.get_trades_columns)
+    get_thresholds_data = async_method(DayDetails.get_thresholds_data)
+    get_shareholders_data = async_method(DayDetails.get_shareholders_data)
@@ -1,8 +1,13 @@
+import bisect
+from typing import Iterator, NamedTuple
+
 from jdatetime import time as jtime
-from pydantic import BaseModel
+
+from ..models import Model
+from ..utils import convert_heven_to_jtime, convert_jtime_to_heven
 
 
-class DayDetailsOrderBookRow(BaseModel):
+class DayDetailsOrderBookRow(Model):
     time: jtime
     count: int
     price: int
@@ -12,10 +17,108 @@ class DayDetailsOrderBookRow(BaseModel):
         arbitrary_types_allowed = True
 
 
-class DayDetailsOrderBookDataRow(BaseModel):
+class DayDetailsOrderBookDataRow(Model):
     time: jtime
     buy_rows: list[DayDetailsOrderBookRow]
     sell_rows: list[DayDetailsOrderBookRow]
 
     class Config:
         arbitrary_types_allowed = True
+
+
+class DayDetailsOrderBookEvent(NamedTuple):
+    heven: int
+    level: int
+    side: int
+    count: int
+    price: int
+    volume: int
+
+    def apply(self, buy_rows: list, sell_rows: list):
+        """
+        Sets the level of the book held by `buy_rows` and `sell_rows` (the events that last set each level) to this event, in place.
+        """
+
+        rows = sell_rows if self.side else buy_rows
+        while len(rows) < self.level:
+            rows.append(None)
+
+        rows[self.level - 1] = self
+
+
+class DayDetailsOrderBookHistory:
+    """
+    Orderbook of a day as the stream of level updates it was made of, sorted by time. Side 0 is buy and 1 is sell. Books are only rebuilt when asked for, replaying the events from the closest checkpoint, and the book at any time is found by binary search over the event times.
+    """
+
+    # a copy of the book is kept every this many events, bounding the replay of get_book
+    checkpoint_interval = 512
+
+    def __init__(self, events: list[DayDetailsOrderBookEvent]):
+        self.events = events
+        self._hevens = [event.heven for event in events]
+        self._checkpoints = [((), ())]
+
+    @property
+    def times(self) -> list[int]:
+        """
+        The distinct hEven times the book changed at.
+        """
+
+        return list(dict.fromkeys(self._hevens))
+
+    def get_book(self, time: jtime | int) -> DayDetailsOrderBookDataRow | None:
+        """
+        Returns the book as it was at a jtime or hEven, or None before the first update of the day.
+        """
+
+        end = bisect.bisect_right(self._hevens, convert_jtime_to_heven(time))
+        if end == 0:
+            return None
+
+        # extend the checkpoints up to the closest one before the wanted event
+        while len(self._checkpoints) <= end // self.checkpoint_interval:
+            start = (len(self._checkpoints) - 1) * self.checkpoint_interval
+            self._checkpoints.append(self._replay(self._checkpoints[-1], start, start + self.checkpoint_interval))
+
+        index = end // self.checkpoint_interval
+        buy_rows, sell_rows = self._replay(self._checkpoints[index], index * self.checkpoint_interval, end)
+
+        return self._build_book(self._hevens[end - 1], buy_rows, sell_rows)
+
+    def iter_books(self) -> Iterator[DayDetailsOrderBookDataRow]:
+        """
+        Yields the book after every distinct time, replaying the events once.
+        """
+
+        buy_rows, sell_rows = [], []
+        for index, event in enumerate(self.events):
+            event.apply(buy_rows, sell_rows)
+            if index + 1 == len(self.events) or self._hevens[index + 1] != event.heven:
+                yield self._build_book(event.heven, buy_rows, sell_rows)
+
+    def _replay(self, checkpoint: tuple, start: int, end: int) -> tuple:
+        buy_rows, sell_rows = list(checkpoint[0]), list(checkpoint[1])
+        for event in self.events[start:end]:
+            event.apply(buy_rows, sell_rows)
+
+        return tuple(buy_rows), tuple(sell_rows)
+
+    @staticmethod
+    def _build_book(heven: int, buy_rows, sell_rows) -> DayDetailsOrderBookDataRow:
+        def build_row(event: DayDetailsOrderBookEvent | None) -> DayDetailsOrderBookRow | None:
+            if event is None:
+                return None
+
+            return DayDetailsOrderBookRow(
+                time=convert_heven_to_jtime(heven=event.heven),
+                count=event.count,
+                price=event.price,
+                volume=event.volume,
+            )
+
+        return DayDetailsOrderBookDataRow(
+            time=convert_heven_to_jtime(heven=heven),
+            buy_rows=[build_row(event) for event in buy_rows],
+            sell_rows=[build_row(event) for event in sell_rows],
+        )
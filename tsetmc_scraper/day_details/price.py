@@ -1,8 +1,9 @@
 from jdatetime import time as jtime
-from pydantic import BaseModel
 
+from ..models import Model
 
-class DayDetailsPriceDataRow(BaseModel):
+
+class DayDetailsPriceDataRow(Model):
     time: jtime
     close: int
     last: int
@@ -14,7 +15,7 @@ class DayDetailsPriceDataRow(BaseModel):
         arbitrary_types_allowed = True
 
 
-class DayDetailsPriceOverview(BaseModel):
+class DayDetailsPriceOverview(Model):
     price_change: int
     low: int
     high: int
@@ -0,0 +1,94 @@
+import heapq
+import time
+from typing import Callable, Iterator, NamedTuple
+
+from ..utils import convert_heven_to_seconds, convert_jtime_to_heven
+from .day_details import DayDetails
+from .orderbook import DayDetailsOrderBookEvent, DayDetailsOrderBookHistory
+from .trade import DayDetailsTradeDataRow
+
+
+class ReplayStep(NamedTuple):
+    heven: int
+    book_event: DayDetailsOrderBookEvent | None
+    trade: DayDetailsTradeDataRow | None
+
+
+class DayDetailsReplay:
+    """
+    Replays the orderbook updates and trades of a day as one stream sorted by time; at equal times book updates come before trades. While replaying, `buy_rows` and `sell_rows` hold the current book by level (as the events that last set each level) and are updated with every step.
+
+    Iterate over `replay()` to step through the day, or call `run()` with callbacks.
+    """
+
+    def __init__(self, history: DayDetailsOrderBookHistory, trades: list[DayDetailsTradeDataRow]):
+        self.history = history
+        self.trades = trades
+
+        self.buy_rows = []
+        self.sell_rows = []
+
+    @classmethod
+    def from_day_details(cls, day_details: DayDetails) -> "DayDetailsReplay":
+        """
+        Fetches the orderbook history and trades of a day to replay.
+        """
+
+        return cls(history=day_details.get_orderbook_history(), trades=day_details.get_trades_data())
+
+    @property
+    def best_buy(self) -> DayDetailsOrderBookEvent | None:
+        return self.buy_rows[0] if self.buy_rows else None
+
+    @property
+    def best_sell(self) -> DayDetailsOrderBookEvent | None:
+        return self.sell_rows[0] if self.sell_rows else None
+
+    def replay(self, speed: float | None = None) -> Iterator[ReplayStep]:
+        """
+        Yields every step of the day from an empty book. With `speed` the steps are paced in real time scaled by it (1 is real time, 60 is a minute per second), otherwise they come as fast as they are consumed.
+        """
+
+        self.buy_rows = []
+        self.sell_rows = []
+
+        book_steps = (ReplayStep(event.heven, event, None) for event in self.history.events)
+        trade_steps = sorted(
+            (ReplayStep(convert_jtime_to_heven(trade.time), None, trade) for trade in self.trades),
+            key=lambda step: step.heven,
+        )
+
+        started_at = None
+        first_seconds = None
+        for step in heapq.merge(book_steps, trade_steps, key=lambda step: (step.heven, step.trade is not None)):
+            if speed is not None:
+                seconds = convert_heven_to_seconds(step.heven)
+                if started_at is None:
+                    started_at = time.monotonic()
+                    first_seconds = seconds
+
+                delay = (seconds - first_seconds) / speed - (time.monotonic() - started_at)
+                if delay > 0:
+                    time.sleep(delay)
+
+            if step.book_event is not None:
+                step.book_event.apply(self.buy_rows, self.sell_rows)
+
+            yield step
+
+    def run(
+        self,
+        on_book: Callable[[DayDetailsOrderBookEvent, "DayDetailsReplay"], None] | None = None,
+        on_trade: Callable[[DayDetailsTradeDataRow, "DayDetailsReplay"], None] | None = None,
+        speed: float | None = None,
+    ):
+        """
+        Replays the day, calling `on_book` after every book update is applied and `on_trade` for every trade, both with this replay to read the current book from.
+        """
+
+        for step in self.replay(speed=speed):
+            if step.book_event is not None:
+                if on_book is not None:
+                    on_book(step.book_event, self)
+            elif on_trade is not None:
+                on_trade(step.trade, self)
@@ -1,16 +1,16 @@
 from jdatetime import date as jdate
-from pydantic import BaseModel
 
+from ..models import Model
 from . import _core
 
 
-class DayDetailsShareHolderPortfolioRow(BaseModel):
+class DayDetailsShareHolderPortfolioRow(Model):
     symbol_id: str
     short_name: str
     long_name: str
 
 
-class DayDetailsShareHolder(BaseModel):
+class DayDetailsShareHolder(Model):
     id: str
     name: str
 
@@ -31,7 +31,7 @@ class DayDetailsShareHolder(BaseModel):
         ]
 
 
-class DayDetailsShareHolderChartRow(BaseModel):
+class DayDetailsShareHolderChartRow(Model):
     date: jdate
     count: int
     percentage: float
@@ -40,7 +40,7 @@ class DayDetailsShareHolderChartRow(BaseModel):
         arbitrary_types_allowed = True
 
 
-class DayDetailsShareHolderDataRow(BaseModel):
+class DayDetailsShareHolderDataRow(Model):
     symbol_id: str
     date: jdate
     shareholder: DayDetailsShareHolder
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from ..models import Model
 
 
-class DayDetailsThresholdsData(BaseModel):
+class DayDetailsThresholdsData(Model):
     range_max: int
     range_min: int
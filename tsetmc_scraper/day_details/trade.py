@@ -1,8 +1,9 @@
 from jdatetime import time as jtime
-from pydantic import BaseModel
 
+from ..models import Model
 
-class DayDetailsTradeDataRow(BaseModel):
+
+class DayDetailsTradeDataRow(Model):
     time: jtime
     price: int
     volume: int
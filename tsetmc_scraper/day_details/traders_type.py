@@ -1,17 +1,17 @@
-from pydantic import BaseModel
+from ..models import Model
 
 
-class DayDetailsTradersTypeSubInfo(BaseModel):
+class DayDetailsTradersTypeSubInfo(Model):
     count: int
     volume: int
     value: int
 
 
-class DayDetailsTradersTypeInfo(BaseModel):
+class DayDetailsTradersTypeInfo(Model):
     buy: DayDetailsTradersTypeSubInfo
     sell: DayDetailsTradersTypeSubInfo
 
 
-class DayDetailsTradersTypeData(BaseModel):
+class DayDetailsTradersTypeData(Model):
     legal: DayDetailsTradersTypeInfo
     real: DayDetailsTradersTypeInfo
@@ -1,16 +1,11 @@
-import requests
-
-from ..utils import get_request_headers
+from ..transport import Request, endpoint
 
 
+@endpoint
 def get_group_static_data() -> list[dict]:
-    response = requests.get(
+    response = yield Request(
         url="http://cdn.tsetmc.com/api/StaticData/GetStaticData",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.json()["staticData"]
     return response
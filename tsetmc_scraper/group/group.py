@@ -2,8 +2,7 @@ from __future__ import annotations
 
 from enum import Enum
 
-from pydantic import BaseModel
-
+from ..models import Model
 from . import _core
 
 
@@ -12,7 +11,7 @@ class GroupType(Enum):
     INDUSTRIAL = "INDUSTRIAL"
 
 
-class Group(BaseModel):
+class Group(Model):
     id: int
     code: int
     name: str
@@ -0,0 +1,269 @@
+import contextlib
+import contextvars
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, NamedTuple
+
+from .utils import import_optional
+
+# names of the measurements, the *_seconds ones and response_bytes are distributions, the others are counts
+REQUEST_SECONDS = "request_seconds"
+RESPONSE_BYTES = "response_bytes"
+DECODE_SECONDS = "decode_seconds"
+PARSE_SECONDS = "parse_seconds"
+ROWS = "rows"
+RETRIES = "retries"
+CACHE_HITS = "cache_hits"
+ERRORS = "errors"
+
+_hooks: tuple = ()
+_hooks_lock = threading.Lock()
+_endpoint = contextvars.ContextVar("endpoint", default=None)
+
+
+class Measurement(NamedTuple):
+    name: str
+    endpoint: str | None
+    value: float
+    # extra dimensions, such as host, status or the cache a hit came from
+    labels: dict[str, str]
+
+
+def add_hook(hook: Callable[[Measurement], None]):
+    """
+    Registers a function to be called with every Measurement: the latency, size and decode time of every request, the parse time and row count of every endpoint, and every retry, cache hit and failed request. Hooks are called on the thread (or event loop) doing the work, so they should be quick and must not raise.
+    """
+
+    global _hooks
+
+    with _hooks_lock:
+        _hooks = (*_hooks, hook)
+
+
+def remove_hook(hook: Callable[[Measurement], None]):
+    global _hooks
+
+    with _hooks_lock:
+        _hooks = tuple(h for h in _hooks if h is not hook)
+
+
+def is_enabled() -> bool:
+    """
+    Whether any hook is registered. Nothing is measured otherwise, so the hot paths only pay for this check.
+    """
+
+    return bool(_hooks)
+
+
+def get_endpoint() -> str | None:
+    """
+    Returns the name of the endpoint currently parsing or sending a request, if it is being measured.
+    """
+
+    return _endpoint.get()
+
+
+@contextlib.contextmanager
+def endpoint_scope(name: str | None):
+    """
+    Within this context measurements without an explicit endpoint are attributed to `name`.
+    """
+
+    token = _endpoint.set(name)
+    try:
+        yield
+    finally:
+        _endpoint.reset(token)
+
+
+def record(name: str, value: float, endpoint: str | None = None, **labels):
+    """
+    Passes a measurement to every hook, attributed to `endpoint` or else to the endpoint of the current scope. Labels are converted to strings and the ones that are None are left out.
+    """
+
+    hooks = _hooks
+    if not hooks:
+        return
+
+    # label values are kept as strings, so aggregates with the same labels sort and compare alike however they were passed
+    labels = {key: str(value) for key, value in labels.items() if value is not None}
+    measurement = Measurement(name=name, endpoint=endpoint if endpoint is not None else _endpoint.get(), value=value, labels=labels)
+    for hook in hooks:
+        hook(measurement)
+
+
+def count_rows(result) -> int:
+    """
+    Default row count of an endpoint result: the length of a list, or of a dict keyed by symbol, counting the first item of a tuple such as (watch_data, refid, max_heven), and one for anything else.
+    """
+
+    if isinstance(result, tuple):
+        result = result[0] if result else None
+
+    if isinstance(result, (list, dict)):
+        return len(result)
+
+    return 1 if result is not None else 0
+
+
+def count_column_rows(result) -> int:
+    """
+    Row count of a result of columns (a dict of equally long arrays), counting the first item of a tuple.
+    """
+
+    if isinstance(result, tuple):
+        result = result[0] if result else None
+
+    if not result:
+        return 0
+
+    return len(next(iter(result.values())))
+
+
+class MetricsRecorder:
+    """
+    Hook that aggregates measurements in memory, keeping the count, sum, min and max per name, endpoint and labels. Register it with `add_hook(recorder)`.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, measurement: Measurement):
+        key = (measurement.name, measurement.endpoint, tuple(sorted(measurement.labels.items())))
+        value = measurement.value
+
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                self._metrics[key] = {"count": 1, "sum": value, "min": value, "max": value}
+            else:
+                metric["count"] += 1
+                metric["sum"] += value
+                metric["min"] = min(metric["min"], value)
+                metric["max"] = max(metric["max"], value)
+
+    def snapshot(self) -> dict[tuple, dict]:
+        """
+        Returns the aggregates keyed by (name, endpoint, labels), labels being a sorted tuple of (key, value).
+        """
+
+        with self._lock:
+            return {key: dict(metric) for key, metric in self._metrics.items()}
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+
+class PrometheusExporter(MetricsRecorder):
+    """
+    MetricsRecorder that renders its aggregates in the Prometheus text format: distributions as summaries with _sum and _count, counts as counters with _total, all prefixed with `namespace`. Serve `render()` from an existing web app, or start a standalone endpoint with `serve()`.
+    """
+
+    def __init__(self, namespace: str = "tsetmc_scraper"):
+        super().__init__()
+        self.namespace = namespace
+
+    def render(self) -> str:
+        metrics = sorted(self.snapshot().items(), key=lambda item: (item[0][0], item[0][1] or "", item[0][2]))
+        lines = []
+        for name in sorted({key[0] for key, _ in metrics}):
+            is_count = name not in (REQUEST_SECONDS, RESPONSE_BYTES, DECODE_SECONDS, PARSE_SECONDS)
+            full_name = f"{self.namespace}_{name}"
+            lines.append(f"# TYPE {full_name}{'_total' if is_count else ''} {'counter' if is_count else 'summary'}")
+
+            for (metric_name, endpoint, labels), metric in metrics:
+                if metric_name != name:
+                    continue
+
+                label_text = _format_labels({"endpoint": endpoint or "", **dict(labels)})
+                if is_count:
+                    lines.append(f"{full_name}_total{label_text} {_format_value(metric['sum'])}")
+                else:
+                    lines.append(f"{full_name}_sum{label_text} {_format_value(metric['sum'])}")
+                    lines.append(f"{full_name}_count{label_text} {metric['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+        """
+        Serves the metrics on a background thread at http://{host}:{port}/metrics and returns the server, to be stopped with `shutdown()`.
+        """
+
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        return server
+
+
+class OpenTelemetryExporter:
+    """
+    Hook that records measurements on OpenTelemetry instruments: histograms for the distributions and counters for the counts, named `{namespace}.{name}` with the endpoint and labels as attributes. Uses the global meter provider unless a `meter` is given.
+    """
+
+    def __init__(self, meter=None, namespace: str = "tsetmc_scraper"):
+        if meter is None:
+            metrics = import_optional("opentelemetry.metrics", "otel")
+            meter = metrics.get_meter("tsetmc_scraper")
+
+        self.meter = meter
+        self.namespace = namespace
+
+        self._instruments = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, measurement: Measurement):
+        instrument = self._instruments.get(measurement.name)
+        if instrument is None:
+            instrument = self._get_instrument(measurement.name)
+
+        attributes = {"endpoint": measurement.endpoint or "", **{key: str(value) for key, value in measurement.labels.items()}}
+        if hasattr(instrument, "record"):
+            instrument.record(measurement.value, attributes=attributes)
+        else:
+            instrument.add(measurement.value, attributes=attributes)
+
+    def _get_instrument(self, name: str):
+        with self._lock:
+            if name not in self._instruments:
+                full_name = f"{self.namespace}.{name}"
+                if name in (REQUEST_SECONDS, DECODE_SECONDS, PARSE_SECONDS):
+                    self._instruments[name] = self.meter.create_histogram(full_name, unit="s")
+                elif name == RESPONSE_BYTES:
+                    self._instruments[name] = self.meter.create_histogram(full_name, unit="By")
+                else:
+                    self._instruments[name] = self.meter.create_counter(full_name)
+
+            return self._instruments[name]
+
+
+def _format_labels(labels: dict) -> str:
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items() if value is not None) + "}"
+
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
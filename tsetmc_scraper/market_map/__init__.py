@@ -1 +1 @@
-from .map import MarketMap, MapType
+from .map import AsyncMarketMap, MarketMap, MapType
@@ -1,10 +1,9 @@
-import requests
-
-from ..utils import get_request_headers
+from ..transport import Request, endpoint
 
 
+@endpoint
 def get_market_map_data(map_type: int, heven: int = 0) -> tuple[dict[dict], int]:
-    response = requests.get(
+    response = yield Request(
         url="http://cdn.tsetmc.com/api/ClosingPrice/GetMarketMap",
         params={
             "market": 0,
@@ -13,18 +12,15 @@ def get_market_map_data(map_type: int, heven: int = 0) -> tuple[dict[dict], int]
             "typeSelected": map_type,
             "hEven": heven,
         },
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.json()
 
-    min_heven = 0
+    # the latest update time, to ask only for later changes next time
+    max_heven = 0
     watch_data = {}
     for row in response:
         symbol_id = row["insCode"]
-        min_heven = min(row["hEven"], min_heven)
+        max_heven = max(row["hEven"], max_heven)
         watch_data[symbol_id] = {
             "symbol_id": row["insCode"],
             "color": row["color"],
@@ -40,4 +36,4 @@ def get_market_map_data(map_type: int, heven: int = 0) -> tuple[dict[dict], int]
             "count": row["zTotTran"],
         }
 
-    return watch_data, min_heven
+    return watch_data, max_heven
@@ -1,12 +1,16 @@
+from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel
-from pydantic.utils import deep_update
+from jdatetime import date as jdate
 
+from ..aio import AsyncClient, AsyncWrapper, async_method
+from ..models import Model
+from ..transport import endpoint
+from ..utils import TEHRAN_TIMEZONE
 from . import _core
 
 
-class MapDataRow(BaseModel):
+class MapDataRow(Model):
     symbol_id: str
     symbol_short_name: str
     symbol_long_name: str
@@ -29,37 +33,119 @@ class MapType(Enum):
     MARKET_VOLUME = 2
 
 
+class MarketMapState:
+    """
+    Market map of one map type on one Tehran day, kept up to date from the hEven deltas. Deltas are merged into the raw state in place and models are rebuilt only for the symbols whose data changed.
+    """
+
+    def __init__(self, date: jdate | None = None):
+        self.reset(date)
+
+    def reset(self, date: jdate | None = None):
+        """
+        Drops the merged data, so the next poll fetches the whole map of `date`.
+        """
+
+        self.date = date
+        self.heven = 0
+        self.raw_data = {}
+        self.rows = {}
+        self.changed_symbol_ids = set()
+
+    def start_day(self, date: jdate):
+        """
+        Resets the state when `date` is not the day it holds. hEven is a time of day, so the deltas of a new day could not be asked for with the latest hEven of the previous one.
+        """
+
+        if self.date != date:
+            self.reset(date)
+
+    def apply(self, raw_data: dict, heven: int) -> set[str]:
+        """
+        Merges a delta returned by get_market_map_data and returns the ids of the symbols it changed. A delta older than the state, which the server only sends once it started over, replaces the state instead and the next poll fetches the whole map.
+        """
+
+        if raw_data and heven < self.heven:
+            # the server started over, its delta is kept but the next poll fetches the whole map again
+            self.reset(self.date)
+            heven = 0
+
+        changed_symbol_ids = set()
+        for symbol_id, data in raw_data.items():
+            if self.raw_data.get(symbol_id) == data:
+                continue
+
+            self.raw_data[symbol_id] = data
+            self.rows[symbol_id] = _build_map_row(data)
+            changed_symbol_ids.add(symbol_id)
+
+        # an empty delta has no hEven, the next poll starts from the same time
+        self.heven = max(self.heven, heven)
+        self.changed_symbol_ids = changed_symbol_ids
+
+        return changed_symbol_ids
+
+
 class MarketMap:
     def __init__(self):
-        self._heven = 0
+        self._states = {}
+        self._changed_symbol_ids = set()
+
+    @property
+    def changed_symbol_ids(self) -> set[str]:
+        """
+        Ids of the symbols changed by the last get_market_map_data call.
+        """
 
-        self._last_map_data = {}
+        return self._changed_symbol_ids
 
+    @endpoint
     def get_market_map_data(self, map_type: MapType = MapType.MARKET_VALUE) -> dict[str, MapDataRow]:
         """
-        Returns symbol data in the market map section ("naghshe bazar") page. Note that the webserver may occasionally throw a 403 error, in which case you should wait a few seconds and retry.
+        Returns symbol data in the market map section ("naghshe bazar") page. After the first call of a map type only changes since its latest update are fetched and merged, see changed_symbol_ids. Note that the webserver may occasionally throw a 403 error, which the transport retries with backoff.
         """
 
-        raw_data, new_heven = _core.get_market_map_data(map_type=map_type.value, heven=self._heven)
-
-        self._last_map_data = deep_update(self._last_map_data, raw_data)
-
-        map_data = {
-            key: MapDataRow(
-                symbol_id=data["symbol_id"],
-                symbol_short_name=data["symbol_short_name"],
-                symbol_long_name=data["symbol_long_name"],
-                close=data["close"],
-                last=data["last"],
-                volume=data["volume"],
-                value=data["value"],
-                count=data["count"],
-                group_name=data["group_name"],
-                color=data["color"],
-                price_change_percent=data["price_change_percent"],
-                percent=data["percent"],
-            )
-            for key, data in raw_data.items()
-        }
-
-        return map_data
+        state = self._states.setdefault(map_type, MarketMapState())
+        state.start_day(_get_tehran_date())
+
+        raw_data, new_heven = yield from _core.get_market_map_data.steps(map_type=map_type.value, heven=state.heven)
+
+        self._changed_symbol_ids = state.apply(raw_data, new_heven)
+
+        return dict(state.rows)
+
+
+def _get_tehran_date() -> jdate:
+    return jdate.fromgregorian(date=datetime.now(TEHRAN_TIMEZONE).date())
+
+
+def _build_map_row(data: dict) -> MapDataRow:
+    return MapDataRow(
+        symbol_id=data["symbol_id"],
+        symbol_short_name=data["symbol_short_name"],
+        symbol_long_name=data["symbol_long_name"],
+        close=data["close"],
+        last=data["last"],
+        volume=data["volume"],
+        value=data["value"],
+        count=data["count"],
+        group_name=data["group_name"],
+        color=data["color"],
+        price_change_percent=data["price_change_percent"],
+        percent=data["percent"],
+    )
+
+
+class AsyncMarketMap(AsyncWrapper):
+    """
+    Async mirror of MarketMap, returning the same models.
+    """
+
+    def __init__(self, client: AsyncClient | None = None):
+        super().__init__(wrapped=MarketMap(), client=client)
+
+    @property
+    def changed_symbol_ids(self) -> set[str]:
+        return self._wrapped.changed_symbol_ids
+
+    get_market_map_data = async_method(MarketMap.get_market_map_data)
@@ -1 +1 @@
-from .watch import MarketWatch
+from .watch import AsyncMarketWatch, MarketWatch
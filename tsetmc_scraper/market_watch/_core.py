@@ -1,8 +1,9 @@
 from collections import defaultdict
+from typing import Iterator
 
-import requests
-
-from ..utils import get_request_headers
+from ..instrumentation import count_column_rows
+from ..transport import Request, endpoint, iter_response_text
+from ..utils import import_optional
 
 _STATS_TRADES_INDICES = {
     1: "average_value_3_month",  # میانگین ارزش معاملات در 3 ماه گذشته
@@ -112,27 +113,67 @@ _STATS_CLIENT_TYPE_INDICES = {
     81: "individual_sell_average_count_rank_12_month",  # رتبه تعداد فروشنده حقیقی در 12 ماه گذشته
     82: "legal_sell_average_count_3_month",  # میانگین تعداد فروشنده حقوقی در 3 ماه گذشته
     83: "legal_sell_average_count_12_month",  # میانگین تعداد فروشنده حقوقی در 12 ماه گذشته
-    84: "legal_sell_average_volume_rank_3_month",  # رتبه تعداد فروشنده حقوقی در 3 ماه گذشته
-    85: "legal_sell_average_volume_rank_12_month",  # رتبه تعداد فروشنده حقوقی در 12 ماه گذشته
+    84: "legal_sell_average_count_rank_3_month",  # رتبه تعداد فروشنده حقوقی در 3 ماه گذشته
+    85: "legal_sell_average_count_rank_12_month",  # رتبه تعداد فروشنده حقوقی در 12 ماه گذشته
     86: "total_sell_average_count_3_month",  # میانگین تعداد فروشندگان در 3 ماه گذشته
     87: "total_sell_average_count_12_month",  # میانگین تعداد فروشندگان در 12 ماه گذشته
     88: "total_sell_average_count_rank_3_month",  # رتبه تعداد فروشندگان در 3 ماه گذشته
     89: "total_sell_average_count_rank_12_month",  # رتبه تعداد فروشندگان در 12 ماه گذشته
 }
 
+_STATS_GROUPS = {
+    "trades": _STATS_TRADES_INDICES,
+    "negative_days": _STATS_NEGATIVE_DAYS_INDICES,
+    "no_trade_days": _STATS_NO_TRADE_DAYS_INDICES,
+    "positive_days": _STATS_POSITIVE_DAYS_INDICES,
+    "with_trade_days": _STATS_WITH_TRADE_DAYS_INDICES,
+    "company_value": _STATS_COMPANY_VALUE_INDICES,
+    "open_days": _STATS_OPEN_DAYS_INDICES,
+    "closed_days": _STATS_CLOSED_DAYS_INDICES,
+    "client_type": _STATS_CLIENT_TYPE_INDICES,
+}
+
+# stat index: (group, name), precomputed from the tables above
+_STATS_INDEX_NAMES = {index: (group, name) for group, indices in _STATS_GROUPS.items() for index, name in indices.items()}
+
+# stat index: column of the dense stats array, and the "group.name" of every column
+_STATS_COLUMN_INDICES = {index: column for column, index in enumerate(sorted(_STATS_INDEX_NAMES))}
+_STATS_COLUMN_NAMES = ["{}.{}".format(*_STATS_INDEX_NAMES[index]) for index in sorted(_STATS_INDEX_NAMES)]
+
+_WATCH_PRICE_INT_COLUMNS = {
+    "heven": 4,
+    "open": 5,
+    "close": 6,
+    "last": 7,
+    "count": 8,
+    "volume": 9,
+    "value": 10,
+    "low": 11,
+    "high": 12,
+    "yesterday": 13,
+    "base_volume": 15,
+    "visit_count": 16,
+    "flow": 17,
+    "group": 18,
+    "z": 21,
+    "yval": 22,
+}
+
+_WATCH_ORDERBOOK_FIELDS = ["count", "price", "volume"]
 
+# fields of a ClosingPriceAll.aspx row after the symbol id, in the order they are sent
+_WATCH_DAILY_HISTORY_FIELDS = ["day", "close", "last", "count", "volume", "value", "low", "high", "yesterday", "open"]
+
+
+@endpoint
 def get_watch_price_data(refid: int = 0, heven: int = 0) -> tuple[dict, int, int]:
-    response = requests.get(
+    response = yield Request(
         url="http://www.tsetmc.com/tsev2/data/MarketWatchPlus.aspx",
         params={
             "h": heven,
             "r": refid,
         },
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.text
 
     sections = response.split("@")
@@ -219,15 +260,76 @@ def get_watch_price_data(refid: int = 0, heven: int = 0) -> tuple[dict, int, int
     return watch_data, refid, max_heven
 
 
+@endpoint(rows=count_column_rows)
+def get_watch_price_columns(refid: int = 0, heven: int = 0) -> tuple[dict, dict, int, int]:
+    np = import_optional("numpy", "numpy")
+
+    response = yield Request(
+        url="http://www.tsetmc.com/tsev2/data/MarketWatchPlus.aspx",
+        params={
+            "h": heven,
+            "r": refid,
+        },
+    )
+    response = response.text
+
+    sections = response.split("@")
+
+    # prices, one string column per field, converted column by column
+    rows = [cols[:23] for cols in (row.split(",") for row in sections[2].split(";") if row) if len(cols) > 10]
+    table = np.array(rows, dtype=str).reshape(len(rows), 23)
+
+    price_data = {
+        "symbol_id": table[:, 0],
+        "isin": table[:, 1],
+        "short_name": table[:, 2],
+        "full_name": table[:, 3],
+    }
+    for name, index in _WATCH_PRICE_INT_COLUMNS.items():
+        price_data[name] = table[:, index].astype(np.int64)
+
+    eps = table[:, 14]
+    price_data["eps"] = np.where(eps == "", "nan", eps).astype(np.float64)
+    price_data["range_max"] = table[:, 19].astype(np.float64).astype(np.int64)
+    price_data["range_min"] = table[:, 20].astype(np.float64).astype(np.int64)
+
+    # orderbook, a dense (symbol, level, side) array where side 0 is buy and 1 is sell
+    rows = [row.split(",") for row in sections[3].split(";") if row]
+    table = np.array(rows, dtype=str).reshape(len(rows), 8)
+
+    symbol_ids, symbol_index = np.unique(table[:, 0], return_inverse=True)
+    rank, s_count, b_count, b_price, s_price, b_volume, s_volume = table[:, 1:].astype(np.int64).T
+    level_index = rank - 1
+
+    orderbook = np.zeros(
+        (len(symbol_ids), int(rank.max()) if len(rank) else 0, 2),
+        dtype=[(field, np.int64) for field in _WATCH_ORDERBOOK_FIELDS],
+    )
+    orderbook["count"][symbol_index, level_index, 0] = b_count
+    orderbook["price"][symbol_index, level_index, 0] = b_price
+    orderbook["volume"][symbol_index, level_index, 0] = b_volume
+    orderbook["count"][symbol_index, level_index, 1] = s_count
+    orderbook["price"][symbol_index, level_index, 1] = s_price
+    orderbook["volume"][symbol_index, level_index, 1] = s_volume
+
+    orderbook_data = {
+        "symbol_id": symbol_ids,
+        "orderbook": orderbook,
+    }
+
+    # refid
+    refid = int(sections[4])
+    max_heven = int(price_data["heven"].max(initial=0))
+
+    return price_data, orderbook_data, refid, max_heven
+
+
+@endpoint
 def get_watch_traders_type_data() -> dict:
-    response = requests.get(
+    response = yield Request(
         url="http://www.tsetmc.com/tsev2/data/ClientTypeAll.aspx",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.text
 
     watch_data = {}
@@ -252,22 +354,22 @@ def get_watch_traders_type_data() -> dict:
         watch_data[symbol_id] = {
             "legal": {
                 "buy": {
-                    "volume": l_buy_v,
-                    "count": l_buy_c,
+                    "volume": int(l_buy_v),
+                    "count": int(l_buy_c),
                 },
                 "sell": {
-                    "volume": l_sell_v,
-                    "count": l_sell_c,
+                    "volume": int(l_sell_v),
+                    "count": int(l_sell_c),
                 },
             },
             "real": {
                 "buy": {
-                    "volume": r_buy_v,
-                    "count": r_buy_c,
+                    "volume": int(r_buy_v),
+                    "count": int(r_buy_c),
                 },
                 "sell": {
-                    "volume": r_sell_v,
-                    "count": r_sell_c,
+                    "volume": int(r_sell_v),
+                    "count": int(r_sell_c),
                 },
             },
         }
@@ -275,59 +377,98 @@ def get_watch_traders_type_data() -> dict:
     return watch_data
 
 
+@endpoint(rows=lambda watch_data: sum(map(len, watch_data.values())))
 def get_watch_daily_history_data() -> dict:
-    response = requests.get(
+    response = yield Request(
         url="http://members.tsetmc.com/tsev2/data/ClosingPriceAll.aspx",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
-    response = response.text
 
-    watch_data = defaultdict(list)
+    watch_data = {}
+    for symbol_id, rows in _iter_daily_history_blocks(iter_response_text(response)):
+        watch_data.setdefault(symbol_id, []).extend(rows)
+
+    return watch_data
+
 
+@endpoint
+def get_watch_daily_history_stream(as_arrays: bool = False, chunk_size: int = 64 * 1024, capacity: int = 64) -> Iterator[tuple]:
+    np = import_optional("numpy", "numpy") if as_arrays else None
+
+    response = yield Request(
+        url="http://members.tsetmc.com/tsev2/data/ClosingPriceAll.aspx",
+        params={},
+        stream=True,
+    )
+
+    return _iter_daily_history_blocks(iter_response_text(response, chunk_size), np=np, capacity=capacity)
+
+
+def _iter_daily_history_blocks(chunks: Iterator[str], np=None, capacity: int = 64) -> Iterator[tuple]:
+    # the symbol id is only given on the first row of each symbol, so a block ends where the next one starts
     symbol_id = None
-    rows = response.split(";")
-    for row in rows:
-        if not row:
-            continue
+    rows = None
+    size = 0
 
+    for row in _iter_records(chunks):
         row = row.split(",")
 
-        if len(row) == 11:
-            symbol_id = row[0]
-            row = row[1:]
+        if len(row) == 11 or rows is None:
+            if rows is not None:
+                yield symbol_id, rows[:size] if np is not None else rows
+
+            if len(row) == 11:
+                symbol_id = row[0]
+                row = row[1:]
+
+            rows = np.empty((capacity, len(_WATCH_DAILY_HISTORY_FIELDS)), dtype=np.int64) if np is not None else []
+            size = 0
+
+        if np is not None:
+            if size == len(rows):
+                rows = np.concatenate([rows, np.empty_like(rows)])
+
+            rows[size] = row
+            size += 1
+        else:
+            day, close, last, count, volume, value, low, high, yesterday, opn = row
+            rows.append(
+                {
+                    "day": int(day),
+                    "close": int(close),
+                    "last": int(last),
+                    "count": int(count),
+                    "volume": int(volume),
+                    "value": int(value),
+                    "low": int(low),
+                    "high": int(high),
+                    "yesterday": int(yesterday),
+                    "open": int(opn),
+                }
+            )
 
-        day, close, last, count, volume, value, low, high, yesterday, opn = row
-        watch_data[symbol_id].append(
-            {
-                "day": int(day),
-                "close": int(close),
-                "last": int(last),
-                "count": int(count),
-                "volume": int(volume),
-                "value": int(value),
-                "low": int(low),
-                "high": int(high),
-                "yesterday": int(yesterday),
-                "open": int(opn),
-            }
-        )
+    if rows is not None:
+        yield symbol_id, rows[:size] if np is not None else rows
 
-    return watch_data
 
+def _iter_records(chunks: Iterator[str]) -> Iterator[str]:
+    # yields the non empty ";" separated records of a body read in chunks, carrying a record cut by a chunk boundary over
+    rest = ""
+    for chunk in chunks:
+        records = (rest + chunk).split(";")
+        rest = records.pop()
+        yield from filter(None, records)
+
+    if rest:
+        yield rest
 
+
+@endpoint
 def get_watch_raw_stats_data() -> dict:
-    response = requests.get(
+    response = yield Request(
         url="http://www.tsetmc.com/tsev2/data/InstValue.aspx?t=a",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.text
 
     symbol_id = None
@@ -348,53 +489,58 @@ def get_watch_raw_stats_data() -> dict:
     return raw_stats_data
 
 
+@endpoint(rows=count_column_rows)
+def get_watch_stats_columns() -> dict:
+    np = import_optional("numpy", "numpy")
+
+    response = yield Request(
+        url="http://www.tsetmc.com/tsev2/data/InstValue.aspx?t=a",
+        params={},
+    )
+    response = response.text
+
+    # the symbol id is only given on the first index of each symbol
+    symbol_rows = {}
+    symbol_row = None
+    rows = []
+    columns = []
+    values = []
+    for section in response.split(";"):
+        if not section:
+            continue
+
+        row = section.split(",")
+        if len(row) == 3:
+            symbol_row = symbol_rows.setdefault(row[0], len(symbol_rows))
+            row = row[1:]
+
+        column = _STATS_COLUMN_INDICES.get(int(row[0]))
+        if column is None or symbol_row is None:
+            continue
+
+        rows.append(symbol_row)
+        columns.append(column)
+        values.append(row[1])
+
+    data = np.full((len(symbol_rows), len(_STATS_COLUMN_NAMES)), np.nan)
+    data[rows, columns] = np.array(values, dtype=np.float64)
+
+    return {
+        "symbol_id": np.array(list(symbol_rows), dtype=str),
+        "values": data,
+    }
+
+
+@endpoint
 def get_watch_stats_data() -> dict:
-    raw_stats = get_watch_raw_stats_data()
+    raw_stats = yield from get_watch_raw_stats_data.steps()
 
     stats_data = {}
     for symbol_id, stats in raw_stats.items():
-        stats_data[symbol_id] = {
-            "trades": {},
-            "negative_days": {},
-            "no_trade_days": {},
-            "positive_days": {},
-            "with_trade_days": {},
-            "company_value": {},
-            "open_days": {},
-            "closed_days": {},
-            "client_type": {},
-        }
+        symbol_stats = stats_data[symbol_id] = {group: {} for group in _STATS_GROUPS}
         for index, val in stats.items():
-            if 1 <= index < 18:
-                sub_name = "trades"
-                indices_obj = _STATS_TRADES_INDICES
-            elif 18 <= index < 24:
-                sub_name = "negative_days"
-                indices_obj = _STATS_NEGATIVE_DAYS_INDICES
-            elif 24 <= index < 26:
-                sub_name = "no_trade_days"
-                indices_obj = _STATS_NO_TRADE_DAYS_INDICES
-            elif 26 <= index < 32:
-                sub_name = "positive_days"
-                indices_obj = _STATS_POSITIVE_DAYS_INDICES
-            elif 32 <= index < 36:
-                sub_name = "with_trade_days"
-                indices_obj = _STATS_WITH_TRADE_DAYS_INDICES
-            elif 36 <= index < 38:
-                sub_name = "company_value"
-                indices_obj = _STATS_COMPANY_VALUE_INDICES
-            elif 38 <= index < 44:
-                sub_name = "open_days"
-                indices_obj = _STATS_OPEN_DAYS_INDICES
-            elif 44 <= index < 50:
-                sub_name = "closed_days"
-                indices_obj = _STATS_CLOSED_DAYS_INDICES
-            elif 50 <= index < 90:
-                sub_name = "client_type"
-                indices_obj = _STATS_CLIENT_TYPE_INDICES
-            else:
-                continue
-
-            stats_data[symbol_id][sub_name][indices_obj[index]] = val
+            names = _STATS_INDEX_NAMES.get(index)
+            if names is not None:
+                symbol_stats[names[0]][names[1]] = val
 
     return stats_data
@@ -1,7 +1,7 @@
-from pydantic import BaseModel
+from ..models import Model
 
 
-class WatchDailyHistoryDataRow(BaseModel):
+class WatchDailyHistoryDataRow(Model):
     day: int
     open: int
     close: int
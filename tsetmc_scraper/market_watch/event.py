@@ -0,0 +1,35 @@
+from ..models import Model
+from .orderbook import WatchOrderBookRow
+
+
+class WatchEvent(Model):
+    symbol_id: str
+
+
+class WatchPriceUpdateEvent(WatchEvent):
+    heven: int
+    last_before: int | None
+    last: int
+    close_before: int | None
+    close: int
+
+
+class WatchTradeEvent(WatchEvent):
+    heven: int
+    count_before: int | None
+    count: int
+    volume_before: int | None
+    volume: int
+    value_before: int | None
+    value: int
+
+    @property
+    def new_trades_count(self) -> int:
+        return self.count - (self.count_before or 0)
+
+
+class WatchOrderBookLevelEvent(WatchEvent):
+    side: str
+    level: int
+    before: WatchOrderBookRow | None
+    after: WatchOrderBookRow
@@ -1,12 +1,12 @@
-from pydantic import BaseModel
+from ..models import Model
 
 
-class WatchOrderBookRow(BaseModel):
+class WatchOrderBookRow(Model):
     count: int
     price: int
     volume: int
 
 
-class WatchOrderBook(BaseModel):
+class WatchOrderBook(Model):
     buy_rows: list[WatchOrderBookRow]
     sell_rows: list[WatchOrderBookRow]
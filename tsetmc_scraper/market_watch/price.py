@@ -1,9 +1,10 @@
-from pydantic import BaseModel
+from typing import Any
 
+from ..models import Model
 from .orderbook import WatchOrderBook
 
 
-class WatchPriceDataRow(BaseModel):
+class WatchPriceDataRow(Model):
     symbol_id: str
     isin: str
     short_name: str
@@ -28,3 +29,14 @@ class WatchPriceDataRow(BaseModel):
     z: int
     yval: int
     orderbook: WatchOrderBook
+
+
+class WatchPriceColumns(Model):
+    """
+    Columnar form of the market watch prices. `columns` holds one NumPy array per field of WatchPriceDataRow, aligned with `symbol_ids` (eps is float with NaN for missing values). `orderbook` is a (symbol, level, side) structured array with count, price and volume fields, aligned with `orderbook_symbol_ids`; side 0 is buy and side 1 is sell.
+    """
+
+    symbol_ids: Any
+    columns: dict[str, Any]
+    orderbook_symbol_ids: Any
+    orderbook: Any
@@ -0,0 +1,144 @@
+from .event import WatchEvent, WatchOrderBookLevelEvent, WatchPriceUpdateEvent, WatchTradeEvent
+from .orderbook import WatchOrderBook, WatchOrderBookRow
+from .price import WatchPriceDataRow
+
+
+class WatchPriceState:
+    """
+    Market watch snapshot kept up to date from the heven/refid deltas. Deltas are merged into the raw state in place and models are rebuilt only for the symbols they touch.
+    """
+
+    def __init__(self):
+        self.raw_data = {}
+        self.rows = {}
+        self.changed_symbol_ids = set()
+
+    def diff(self, raw_data: dict) -> list[WatchEvent]:
+        """
+        Returns the change events a delta would cause, comparing it with the current state of the symbols it touches only. Must be called before apply.
+        """
+
+        events = []
+        for symbol_id, data in raw_data.items():
+            current = self.raw_data.get(symbol_id, {})
+
+            if "symbol_id" in data:
+                if data["last"] != current.get("last") or data["close"] != current.get("close"):
+                    events.append(
+                        WatchPriceUpdateEvent(
+                            symbol_id=symbol_id,
+                            heven=data["heven"],
+                            last_before=current.get("last"),
+                            last=data["last"],
+                            close_before=current.get("close"),
+                            close=data["close"],
+                        )
+                    )
+
+                if data["count"] != current.get("count"):
+                    events.append(
+                        WatchTradeEvent(
+                            symbol_id=symbol_id,
+                            heven=data["heven"],
+                            count_before=current.get("count"),
+                            count=data["count"],
+                            volume_before=current.get("volume"),
+                            volume=data["volume"],
+                            value_before=current.get("value"),
+                            value=data["value"],
+                        )
+                    )
+
+            current_orderbook = current.get("orderbook", {"buy_rows": {}, "sell_rows": {}})
+            for side in ["buy", "sell"]:
+                for level, row in data["orderbook"][f"{side}_rows"].items():
+                    before = current_orderbook[f"{side}_rows"].get(level)
+                    if row == before:
+                        continue
+
+                    events.append(
+                        WatchOrderBookLevelEvent(
+                            symbol_id=symbol_id,
+                            side=side,
+                            level=level,
+                            before=WatchOrderBookRow(**before) if before is not None else None,
+                            after=WatchOrderBookRow(**row),
+                        )
+                    )
+
+        return events
+
+    def apply(self, raw_data: dict) -> set[str]:
+        """
+        Merges a delta returned by get_watch_price_data and returns the ids of the symbols it changed.
+        """
+
+        for symbol_id, data in raw_data.items():
+            current = self.raw_data.get(symbol_id)
+            if current is None:
+                self.raw_data[symbol_id] = data
+                continue
+
+            orderbook = data.pop("orderbook")
+            current.update(data)
+            current["orderbook"]["buy_rows"].update(orderbook["buy_rows"])
+            current["orderbook"]["sell_rows"].update(orderbook["sell_rows"])
+
+        for symbol_id in raw_data.keys():
+            data = self.raw_data[symbol_id]
+
+            # orderbook only entries of symbols that have not been seen in the prices section yet
+            if "symbol_id" not in data:
+                continue
+
+            self.rows[symbol_id] = _build_price_row(data)
+
+        self.changed_symbol_ids = set(raw_data.keys())
+
+        return self.changed_symbol_ids
+
+
+def _build_price_row(data: dict) -> WatchPriceDataRow:
+    return WatchPriceDataRow(
+        symbol_id=data["symbol_id"],
+        isin=data["isin"],
+        short_name=data["short_name"],
+        full_name=data["full_name"],
+        heven=data["heven"],
+        open=data["open"],
+        close=data["close"],
+        last=data["last"],
+        count=data["count"],
+        volume=data["volume"],
+        value=data["value"],
+        low=data["low"],
+        high=data["high"],
+        yesterday=data["yesterday"],
+        eps=data["eps"],
+        base_volume=data["base_volume"],
+        visit_count=data["visit_count"],
+        flow=data["flow"],
+        group=data["group"],
+        range_max=data["range_max"],
+        range_min=data["range_min"],
+        z=data["z"],
+        yval=data["yval"],
+        orderbook=WatchOrderBook(
+            buy_rows=[
+                WatchOrderBookRow(
+                    count=row["count"],
+                    price=row["price"],
+                    volume=row["volume"],
+                )
+                for row in data["orderbook"]["buy_rows"].values()
+            ],
+            sell_rows=[
+                WatchOrderBookRow(
+                    count=row["count"],
+                    price=row["price"],
+                    volume=row["volume"],
+                )
+                for row in data["orderbook"]["sell_rows"].values()
+            ],
+        ),
+    )
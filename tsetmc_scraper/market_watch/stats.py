@@ -0,0 +1,36 @@
+from typing import Any
+
+from ..models import Model
+from ..utils import import_optional
+
+
+class WatchStatsColumns(Model):
+    """
+    Dense form of the market watch stats. `values` is a float64 (symbol, stat) array aligned with `symbol_ids`, NaN where a symbol has no value; values beyond 2**53 (such as large company values) lose their last digits. `columns` maps "group.name" (such as "trades.average_value_3_month", with the groups and names of get_stats_data) to its column, and `indices` maps the stat index tsetmc uses to its column.
+    """
+
+    symbol_ids: Any
+    values: Any
+    columns: dict[str, int]
+    indices: dict[int, int]
+
+    def column(self, name: str):
+        """
+        Returns the values of one stat, aligned with symbol_ids.
+        """
+
+        return self.values[:, self.columns[name]]
+
+    def rank(self, descending: bool = True):
+        """
+        Returns the (symbol, stat) int array of the rank of every symbol on every stat, computed in one vectorized pass; 0 is the highest value when descending. Missing values rank last.
+        """
+
+        np = import_optional("numpy", "numpy")
+
+        # NaN sorts last either way, as -NaN is NaN
+        order = np.argsort(-self.values if descending else self.values, axis=0, kind="stable")
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(len(order))[:, None], axis=0)
+
+        return ranks
@@ -1,16 +1,16 @@
-from pydantic import BaseModel
+from ..models import Model
 
 
-class WatchTradersTypeSubInfo(BaseModel):
+class WatchTradersTypeSubInfo(Model):
     count: int
     volume: int
 
 
-class WatchTradersTypeInfo(BaseModel):
+class WatchTradersTypeInfo(Model):
     buy: WatchTradersTypeSubInfo
     sell: WatchTradersTypeSubInfo
 
 
-class WatchTradersTypeDataRow(BaseModel):
+class WatchTradersTypeDataRow(Model):
     legal: WatchTradersTypeInfo
     real: WatchTradersTypeInfo
@@ -1,8 +1,15 @@
-from ..utils import deep_update
+import asyncio
+import time
+from typing import AsyncIterator, Iterator
+
+from ..aio import AsyncClient, AsyncWrapper, async_method
+from ..transport import endpoint
 from . import _core
 from .daily_history import WatchDailyHistoryDataRow
-from .orderbook import WatchOrderBook, WatchOrderBookRow
-from .price import WatchPriceDataRow
+from .event import WatchEvent
+from .price import WatchPriceColumns, WatchPriceDataRow
+from .state import WatchPriceState
+from .stats import WatchStatsColumns
 from .traders_type import WatchTradersTypeDataRow, WatchTradersTypeInfo, WatchTradersTypeSubInfo
 
 
@@ -10,83 +17,89 @@ class MarketWatch:
     def __init__(self):
         self._heven = 0
         self._refid = 0
-        self._last_price_data = {}
+        self._price_state = WatchPriceState()
+
+    @property
+    def changed_symbol_ids(self) -> set[str]:
+        """
+        Ids of the symbols changed by the last get_price_data call.
+        """
 
+        return self._price_state.changed_symbol_ids
+
+    @endpoint
     def get_price_data(self) -> dict[str, WatchPriceDataRow]:
         """
-        Returns basic price information from the "didbane bazar" page.
+        Returns basic price information from the "didbane bazar" page. After the first call only changes are fetched and only the changed symbols are rebuilt, see changed_symbol_ids.
         """
 
         (
             raw_data,
             new_refid,
             new_heven,
-        ) = _core.get_watch_price_data(refid=self._refid, heven=self._heven)
+        ) = yield from _core.get_watch_price_data.steps(refid=self._refid, heven=self._heven)
 
-        self._last_price_data = deep_update(self._last_price_data, raw_data)
+        self._price_state.apply(raw_data)
 
-        watch_data = {}
-        for symbol_id in self._last_price_data.keys():
-            data = self._last_price_data[symbol_id]
-
-            if "symbol_id" not in data:
-                continue
-
-            watch_data[symbol_id] = WatchPriceDataRow(
-                symbol_id=data["symbol_id"],
-                isin=data["isin"],
-                short_name=data["short_name"],
-                full_name=data["full_name"],
-                heven=data["heven"],
-                open=data["open"],
-                close=data["close"],
-                last=data["last"],
-                count=data["count"],
-                volume=data["volume"],
-                value=data["value"],
-                low=data["low"],
-                high=data["high"],
-                yesterday=data["yesterday"],
-                eps=data["eps"],
-                base_volume=data["base_volume"],
-                visit_count=data["visit_count"],
-                flow=data["flow"],
-                group=data["group"],
-                range_max=data["range_max"],
-                range_min=data["range_min"],
-                z=data["z"],
-                yval=data["yval"],
-                orderbook=WatchOrderBook(
-                    buy_rows=[
-                        WatchOrderBookRow(
-                            count=row["count"],
-                            price=row["price"],
-                            volume=row["volume"],
-                        )
-                        for row in data["orderbook"]["buy_rows"].values()
-                    ],
-                    sell_rows=[
-                        WatchOrderBookRow(
-                            count=row["count"],
-                            price=row["price"],
-                            volume=row["volume"],
-                        )
-                        for row in data["orderbook"]["sell_rows"].values()
-                    ],
-                ),
-            )
+        self._heven = new_heven
+        self._refid = new_refid
+
+        return dict(self._price_state.rows)
+
+    @endpoint
+    def get_events(self, include_initial: bool = False) -> list[WatchEvent]:
+        """
+        Polls the next delta and returns the price update, trade and orderbook level events it caused, without building models for the whole market. The first call only builds the initial state and returns no events unless include_initial is set.
+        """
+
+        (
+            raw_data,
+            new_refid,
+            new_heven,
+        ) = yield from _core.get_watch_price_data.steps(refid=self._refid, heven=self._heven)
+
+        is_initial = not self._price_state.raw_data
+        events = self._price_state.diff(raw_data)
+        self._price_state.apply(raw_data)
 
         self._heven = new_heven
         self._refid = new_refid
 
-        return watch_data
+        return events if include_initial or not is_initial else []
+
+    def stream(self, interval: float = 1.0, include_initial: bool = False) -> Iterator[WatchEvent]:
+        """
+        Polls the market watch every `interval` seconds and yields change events as they arrive, see get_events.
+        """
+
+        while True:
+            started_at = time.monotonic()
+            yield from self.get_events(include_initial=include_initial)
+            include_initial = False
+            time.sleep(max(0.0, interval - (time.monotonic() - started_at)))
 
+    @endpoint
+    def get_price_columns(self) -> WatchPriceColumns:
+        """
+        Returns the full market watch prices as NumPy columns instead of models, for vectorized screening of the whole market. Requires numpy. This always fetches a full snapshot and does not change the state used by get_price_data.
+        """
+
+        price_data, orderbook_data, _, _ = yield from _core.get_watch_price_columns.steps()
+
+        return WatchPriceColumns(
+            symbol_ids=price_data.pop("symbol_id"),
+            columns=price_data,
+            orderbook_symbol_ids=orderbook_data["symbol_id"],
+            orderbook=orderbook_data["orderbook"],
+        )
+
+    @endpoint
     def get_traders_type_data(self) -> dict[str, WatchTradersTypeDataRow]:
         """
         Returns trader type data from the "didebane bazar" page.
         """
 
-        raw_data = _core.get_watch_traders_type_data()
+        raw_data = yield from _core.get_watch_traders_type_data.steps()
 
         watch_data = {}
         for key, data in raw_data.items():
@@ -115,43 +128,111 @@ class MarketWatch:
 
         return watch_data
 
+    @endpoint
     def get_daily_history_data(self) -> dict[str, list[WatchDailyHistoryDataRow]]:
         """
         Returns the 60-day history of symbols from the "didbane bazar" page.
         """
 
-        raw_data = _core.get_watch_daily_history_data()
+        raw_data = yield from _core.get_watch_daily_history_data.steps()
 
         watch_data = {}
         for symbol_id in raw_data.keys():
-            watch_data[symbol_id] = [
-                WatchDailyHistoryDataRow(
-                    day=row["day"],
-                    open=row["open"],
-                    close=row["close"],
-                    last=row["last"],
-                    count=row["count"],
-                    volume=row["volume"],
-                    value=row["value"],
-                    low=row["low"],
-                    high=row["high"],
-                    yesterday=row["yesterday"],
-                )
-                for row in raw_data[symbol_id]
-            ]
+            watch_data[symbol_id] = [_build_daily_history_row(row) for row in raw_data[symbol_id]]
 
         return watch_data
 
+    @endpoint
+    def iter_daily_history_data(self, as_arrays: bool = False, chunk_size: int = 64 * 1024) -> Iterator[tuple]:
+        """
+        Streaming form of get_daily_history_data: the response is read and parsed in chunks of `chunk_size` characters, yielding (symbol_id, rows) as each symbol's block ends, so the whole market's history is never held at once. With `as_arrays` (requires numpy) rows is an int64 array of shape (days, 10) whose columns are day, close, last, count, volume, value, low, high, yesterday and open.
+
+        The async client reads the whole response before parsing starts, only the parsed rows are streamed there.
+        """
+
+        blocks = yield from _core.get_watch_daily_history_stream.steps(as_arrays=as_arrays, chunk_size=chunk_size)
+        if as_arrays:
+            return blocks
+
+        return ((symbol_id, [_build_daily_history_row(row) for row in rows]) for symbol_id, rows in blocks)
+
+    @endpoint
     def get_raw_stats_data(self) -> dict[list]:
         """
         Returns a list of statistics for each symbol. Please refer to tsetmc.com for information on what each item in the list represents.
         """
 
-        return _core.get_watch_raw_stats_data()
+        return (yield from _core.get_watch_raw_stats_data.steps())
 
+    @endpoint
     def get_stats_data(self) -> dict[str, dict]:
         """
         !!! EXPERIMENTAL: This function returns dictionary-formatted statistics, which may be incorrect and should be used with caution !!!
         """
 
-        return _core.get_watch_stats_data()
+        return (yield from _core.get_watch_stats_data.steps())
+
+    @endpoint
+    def get_stats_columns(self) -> WatchStatsColumns:
+        """
+        Returns the statistics of all symbols as one dense (symbol, stat) NumPy array with a map of column names, for ranking and screening the whole market in single vectorized operations. Requires numpy.
+        """
+
+        stats_data = yield from _core.get_watch_stats_columns.steps()
+
+        return WatchStatsColumns(
+            symbol_ids=stats_data["symbol_id"],
+            values=stats_data["values"],
+            columns={name: column for column, name in enumerate(_core._STATS_COLUMN_NAMES)},
+            indices=dict(_core._STATS_COLUMN_INDICES),
+        )
+
+
+def _build_daily_history_row(row: dict) -> WatchDailyHistoryDataRow:
+    return WatchDailyHistoryDataRow(
+        day=row["day"],
+        open=row["open"],
+        close=row["close"],
+        last=row["last"],
+        count=row["count"],
+        volume=row["volume"],
+        value=row["value"],
+        low=row["low"],
+        high=row["high"],
+        yesterday=row["yesterday"],
+    )
+
+
+class AsyncMarketWatch(AsyncWrapper):
+    """
+    Async mirror of MarketWatch, returning the same models.
+    """
+
+    def __init__(self, client: AsyncClient | None = None):
+        super().__init__(wrapped=MarketWatch(), client=client)
+
+    @property
+    def changed_symbol_ids(self) -> set[str]:
+        return self._wrapped.changed_symbol_ids
+
+    async def stream(self, interval: float = 1.0, include_initial: bool = False) -> AsyncIterator[WatchEvent]:
+        """
+        Async iterator counterpart of MarketWatch.stream.
+        """
+
+        while True:
+            started_at = time.monotonic()
+            for event in await self.get_events(include_initial=include_initial):
+                yield event
+            include_initial = False
+            await asyncio.sleep(max(0.0, interval - (time.monotonic() - started_at)))
+
+    get_price_data = async_method(MarketWatch.get_price_data)
+    get_events = async_method(MarketWatch.get_events)
+    get_price_columns = async_method(MarketWatch.get_price_columns)
+    get_traders_type_data = async_method(MarketWatch.get_traders_type_data)
+    get_daily_history_data = async_method(MarketWatch.get_daily_history_data)
+    iter_daily_history_data = async_method(MarketWatch.iter_daily_history_data)
+    get_raw_stats_data = async_method(MarketWatch.get_raw_stats_data)
+    get_stats_data = async_method(MarketWatch.get_stats_data)
+    get_stats_columns = async_method(MarketWatch.get_stats_columns)
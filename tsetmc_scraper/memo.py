@@ -0,0 +1,141 @@
+import contextlib
+import contextvars
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from . import instrumentation
+
+# seconds each endpoint's responses are kept in memory for, endpoints that are not listed are only coalesced
+DEFAULT_MEMO_TTLS = {
+    "get_group_static_data": 60 * 60,
+    "get_symbol_id_details": 60 * 60,
+    "get_symbol_option_data": 60 * 60,
+    "get_symbol_shareholders": 5 * 60,
+    "get_symbol_shareholder_details": 5 * 60,
+}
+
+_refreshing = contextvars.ContextVar("refreshing", default=False)
+
+
+@contextlib.contextmanager
+def refresh():
+    """
+    Within this context memoized and cached responses are ignored, every response is fetched again and stored.
+    """
+
+    token = _refreshing.set(True)
+    try:
+        yield
+    finally:
+        _refreshing.reset(token)
+
+
+def is_refreshing() -> bool:
+    return _refreshing.get()
+
+
+class ResponseMemo:
+    """
+    In-process TTL/LRU memo of responses, shared by everything that uses the same transport. Endpoints are kept for their TTL in `ttls` (None keeps them until evicted), responses of historical requests are kept until evicted, and at most `max_entries` responses are held.
+
+    Concurrent identical requests are coalesced: while one is in flight, other callers wait for it and get the same response.
+    """
+
+    def __init__(self, ttls: dict[str, float | None] | None = None, max_entries: int = 1024):
+        self.ttls = DEFAULT_MEMO_TTLS if ttls is None else ttls
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get_ttl(self, request) -> float | None | bool:
+        """
+        Returns how long a response may be kept: seconds, None until evicted, or False if it must not be kept.
+        """
+
+        if request.historical:
+            return None
+
+        return self.ttls.get(request.endpoint, False)
+
+    def get(self, request):
+        if is_refreshing() or self.get_ttl(request) is False:
+            return None
+
+        key = request.key
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            response, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+
+        return response
+
+    def put(self, request, response):
+        ttl = self.get_ttl(request)
+        if ttl is False:
+            return
+
+        with self._lock:
+            self._entries[request.key] = (response, time.monotonic() + ttl if ttl is not None else None)
+            self._entries.move_to_end(request.key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def fetch(self, request, send):
+        """
+        Returns the memoized response of a request, or waits for the identical request in flight, or calls `send` and memoizes the result.
+        """
+
+        response = self.get(request)
+        if response is not None:
+            instrumentation.record(instrumentation.CACHE_HITS, 1, request.endpoint, source="memo")
+            return response
+
+        key = request.key
+        with self._lock:
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._inflight[key] = Future()
+
+        if not is_owner:
+            instrumentation.record(instrumentation.CACHE_HITS, 1, request.endpoint, source="coalesced")
+            return future.result()
+
+        try:
+            response = send(request)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self.put(request, response)
+            future.set_result(response)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+        return response
+
+    def invalidate(self, endpoint: str | None = None):
+        """
+        Removes memoized responses of an endpoint, or everything when called without arguments.
+        """
+
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+                return
+
+            for key in [key for key in self._entries if key[0] == endpoint]:
+                del self._entries[key]
@@ -0,0 +1,3 @@
+from .fixtures import FixtureStore, RecordingTransport
+from .server import MockServer
+from .synthetic import SYNTHETIC_COMPANY_ISIN, SYNTHETIC_DATE, SYNTHETIC_SYMBOL_ID, generate_fixtures
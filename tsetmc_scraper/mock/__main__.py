@@ -0,0 +1,51 @@
+import argparse
+
+from .fixtures import FixtureStore
+from .server import MockServer
+from .synthetic import generate_fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m tsetmc_scraper.mock",
+        description="Local stand-in tsetmc server replaying recorded fixtures.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="serve the fixtures of a directory")
+    serve_parser.add_argument("path")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    serve_parser.add_argument("--latency-jitter", type=float, default=0.0, help="up to this many random seconds added on top")
+    serve_parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests that fail")
+    serve_parser.add_argument("--error-status", type=int, default=503)
+    serve_parser.add_argument("--retry-after", type=float, default=None)
+
+    generate_parser = subparsers.add_parser("generate", help="write synthetic fixtures to a directory")
+    generate_parser.add_argument("path")
+    generate_parser.add_argument("--symbols", type=int, default=700)
+    generate_parser.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        generate_fixtures(args.path, symbol_count=args.symbols, seed=args.seed)
+        return
+
+    server = MockServer(
+        FixtureStore(args.path),
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+    )
+    print(f"serving {args.path} at {server.url}, use Transport(base_url={server.url!r})")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
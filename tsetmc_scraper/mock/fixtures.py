@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from ..transport import Transport
+
+
+def get_fixture_key(url: str, params: dict | None = None) -> tuple[str, str, str]:
+    """
+    Returns the (host, path, query) a request is stored under, with the query parameters of the url and `params` merged and sorted.
+    """
+
+    parts = urlsplit(url.strip())
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update({key: str(value) for key, value in (params or {}).items()})
+
+    return parts.hostname, parts.path, urlencode(sorted(query.items()))
+
+
+class FixtureStore:
+    """
+    Directory of recorded responses, one JSON file per request under a directory per host. A request is answered by the response recorded for the same host, path and query, or else by the latest one recorded for the same host and path, so polling endpoints whose parameters change (such as MarketWatchPlus.aspx) are still answered.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._exact = {}
+        self._latest = {}
+
+        os.makedirs(path, exist_ok=True)
+        for host in sorted(os.listdir(path)):
+            host_path = os.path.join(path, host)
+            if not os.path.isdir(host_path):
+                continue
+
+            for name in sorted(os.listdir(host_path), key=lambda name: os.path.getmtime(os.path.join(host_path, name))):
+                if name.endswith(".json"):
+                    self._index(os.path.join(host_path, name))
+
+    def get(self, url: str, params: dict | None = None) -> dict | None:
+        """
+        Returns the recorded fixture of a request as a dict with url, status, headers and text, or None.
+        """
+
+        host, path, query = get_fixture_key(url, params)
+        with self._lock:
+            file_path = self._exact.get((host, path, query)) or self._latest.get((host, path))
+
+        if file_path is None:
+            return None
+
+        with open(file_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def put(self, url: str, params: dict | None, text: str, status: int = 200, headers: dict[str, str] | None = None):
+        host, path, query = get_fixture_key(url, params)
+        name = hashlib.sha1(f"{path}?{query}".encode("utf-8")).hexdigest()
+        file_path = os.path.join(self.path, host, f"{name}.json")
+
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump({"url": f"http://{host}{path}?{query}", "status": status, "headers": headers or {}, "text": text}, f, ensure_ascii=False)
+
+        self._index(file_path)
+
+    def _index(self, file_path: str):
+        with open(file_path, encoding="utf-8") as f:
+            host, path, query = get_fixture_key(json.load(f)["url"])
+
+        with self._lock:
+            self._exact[(host, path, query)] = file_path
+            self._latest[(host, path)] = file_path
+
+
+class RecordingTransport(Transport):
+    """
+    Transport that records every successful response into a FixtureStore, to be replayed later by the mock server.
+    """
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def get(self, url: str, params: dict | None = None, stream: bool = False):
+        # recording reads the body, streamed responses are then iterated from memory
+        response = super().get(url=url, params=params, stream=stream)
+        self.store.put(url, params, response.text, status=response.status_code, headers={"Content-Type": response.headers.get("Content-Type", "")})
+
+        return response
@@ -0,0 +1,115 @@
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .fixtures import FixtureStore
+
+
+class MockServer:
+    """
+    Local stand-in for tsetmc that replays the fixtures of a FixtureStore. Requests are expected at `{url}/{original host}/{path}`, which is what Transport and AsyncClient send when given `base_url=server.url`.
+
+    Every response is delayed by `latency` seconds plus up to `latency_jitter` more, and a share `error_rate` of the requests fails with `error_status` (sending `retry_after` as a Retry-After header if set), to benchmark throughput and retries offline. Requests without a fixture get a 404. Counts of the served statuses are kept in `stats`.
+    """
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        retry_after: float | None = None,
+        seed: int | None = None,
+    ):
+        self.store = store
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.stats = Counter()
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._get_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _get_response(self, path: str) -> tuple[int, dict[str, str], str]:
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.latency_jitter)
+            fail = self._random.random() < self.error_rate
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if fail:
+            headers = {"Retry-After": str(self.retry_after)} if self.retry_after is not None else {}
+            return self.error_status, headers, ""
+
+        host, _, rest = path.lstrip("/").partition("/")
+        fixture = self.store.get(f"http://{host}/{rest}")
+        if fixture is None:
+            return 404, {}, f"no fixture for http://{host}/{rest}"
+
+        return fixture["status"], fixture["headers"], fixture["text"]
+
+    def _get_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, headers, text = server._get_response(self.path)
+                body = text.encode("utf-8")
+
+                with server._lock:
+                    server.stats[status] += 1
+
+                # the body is always sent as utf-8, whatever charset the recorded response had
+                media_type = (headers.get("Content-Type") or "text/plain").split(";")[0]
+
+                self.send_response(status)
+                for key, value in headers.items():
+                    if value and key != "Content-Type":
+                        self.send_header(key, value)
+                self.send_header("Content-Type", f"{media_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
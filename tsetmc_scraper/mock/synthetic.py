@@ -0,0 +1,226 @@
+import json
+import random
+
+from jdatetime import date as jdate
+
+from .fixtures import FixtureStore
+
+SYNTHETIC_SYMBOL_ID = "10000000000000001"
+SYNTHETIC_COMPANY_ISIN = "IRO1SYMC0001"
+SYNTHETIC_DATE = jdate(1402, 2, 31)
+
+
+def generate_fixtures(
+    path: str,
+    symbol_count: int = 700,
+    history_days: int = 250,
+    orderbook_updates: int = 10000,
+    trades_count: int = 5000,
+    seed: int = 0,
+) -> FixtureStore:
+    """
+    Writes synthetic fixtures of the market wide endpoints (MarketWatchPlus.aspx, ClientTypeAll.aspx, ClosingPriceAll.aspx, InstValue.aspx and the market map) for `symbol_count` symbols, of the trades and Loader.aspx id details and shareholders pages of SYNTHETIC_SYMBOL_ID, and of the DayDetails cdn APIs for it on SYNTHETIC_DATE, in the formats tsetmc sends them. The values are random but consistent, for offline load tests and benchmarks when no recorded fixtures are at hand.
+    """
+
+    rng = random.Random(seed)
+    store = FixtureStore(path)
+    symbol_ids = [str(10000000000000001 + i) for i in range(symbol_count)]
+
+    def heven(second: int) -> int:
+        second = 9 * 3600 + second
+        return second // 3600 * 10000 + second % 3600 // 60 * 100 + second % 60
+
+    # market watch prices and orderbooks
+    price_rows = []
+    orderbook_rows = []
+    for i, symbol_id in enumerate(symbol_ids):
+        yesterday = rng.randint(1000, 50000)
+        low, high = int(yesterday * 0.95), int(yesterday * 1.05)
+        last = rng.randint(low, high)
+        count = rng.randint(0, 5000)
+        volume = count * rng.randint(100, 10000)
+        eps = str(rng.randint(-500, 3000)) if i % 5 else ""
+        price_rows.append(
+            f"{symbol_id},IRO1SYM{i:05d},SYM{i},Synthetic Symbol {i},{heven(rng.randint(0, 12600))},{yesterday},{last},{last},{count},{volume},"
+            f"{volume * last},{low},{high},{yesterday},{eps},{rng.randint(1, 10) * 100000},{rng.randint(0, 10)},"
+            f"{rng.randint(1, 7)},{rng.randint(1, 70)},"
+            f"{high}.00,{low}.00,{rng.randint(10**6, 10**9)},{rng.randint(100, 400)}"
+        )
+        for rank in range(1, 6):
+            orderbook_rows.append(
+                f"{symbol_id},{rank},{rng.randint(1, 50)},{rng.randint(1, 50)},{last - rank},{last + rank},"
+                f"{rng.randint(1, 10**6)},{rng.randint(1, 10**6)}"
+            )
+    store.put(
+        "http://www.tsetmc.com/tsev2/data/MarketWatchPlus.aspx",
+        {"h": 0, "r": 0},
+        f"@@{';'.join(price_rows)}@{';'.join(orderbook_rows)}@{rng.randint(10**9, 10**10)}",
+    )
+
+    # traders type
+    rows = [",".join([symbol_id] + [str(rng.randint(0, 10**7)) for _ in range(8)]) for symbol_id in symbol_ids]
+    store.put("http://www.tsetmc.com/tsev2/data/ClientTypeAll.aspx", {}, ";".join(rows))
+
+    # daily history, the symbol id is only given on the first row of each symbol
+    rows = []
+    for symbol_id in symbol_ids:
+        close = rng.randint(1000, 50000)
+        for day in range(history_days):
+            close = max(1, close + rng.randint(-close // 20, close // 20))
+            values = [
+                day,
+                close,
+                close,
+                rng.randint(0, 5000),
+                rng.randint(0, 10**7),
+                rng.randint(0, 10**11),
+                close - 10,
+                close + 10,
+                close,
+                close,
+            ]
+            rows.append(",".join(([symbol_id] if day == 0 else []) + [str(value) for value in values]))
+    store.put("http://members.tsetmc.com/tsev2/data/ClosingPriceAll.aspx", {}, ";".join(rows))
+
+    # stats, the symbol id is only given on the first index of each symbol
+    sections = []
+    for symbol_id in symbol_ids:
+        for index in range(1, 90):
+            value = f"{rng.uniform(0, 100):.2f}" if index % 7 == 0 else str(rng.randint(0, 10**9))
+            sections.append(f"{symbol_id},{index},{value}" if index == 1 else f"{index},{value}")
+    store.put("http://www.tsetmc.com/tsev2/data/InstValue.aspx?t=a", {}, ";".join(sections))
+
+    # market map
+    rows = [
+        {
+            "insCode": symbol_id,
+            "color": "#00a000",
+            "lVal18AFC": f"SYM{i}",
+            "lVal30": f"Synthetic Symbol {i}",
+            "lSecVal": f"Group {i % 40}",
+            "pClosing": rng.randint(1000, 50000),
+            "pDrCotVal": rng.randint(1000, 50000),
+            "percent": rng.uniform(0, 1),
+            "priceChangePercent": rng.uniform(-5, 5),
+            "qTotTran5J": rng.randint(0, 10**7),
+            "qTotCap": rng.randint(0, 10**11),
+            "zTotTran": rng.randint(0, 5000),
+            "hEven": heven(rng.randint(0, 12600)),
+        }
+        for i, symbol_id in enumerate(symbol_ids)
+    ]
+    for map_type in (1, 2):
+        store.put(
+            "http://cdn.tsetmc.com/api/ClosingPrice/GetMarketMap",
+            {"market": 0, "size": 1920, "sector": 0, "typeSelected": map_type, "hEven": 0},
+            json.dumps(rows),
+        )
+
+    # symbol pages of one symbol
+    symbol_id = SYNTHETIC_SYMBOL_ID
+
+    trades = [
+        {
+            "nTran": i + 1,
+            "hEven": heven(i * 12600 // trades_count),
+            "pTran": float(10000 + rng.randint(-100, 100)),
+            "qTitTran": rng.randint(1, 10000),
+            "canceled": 0,
+        }
+        for i in range(trades_count)
+    ]
+    store.put(f"http://cdn.tsetmc.com/api/Trade/GetTrade/{symbol_id}", {}, json.dumps({"trade": trades}))
+
+    id_details = {
+        "کد 12 رقمی نماد": "IRO1SYM00000",
+        "کد 5 رقمی نماد": "SYM00",
+        "نام لاتین شرکت": "Synthetic Company",
+        "کد 4 رقمی شرکت": "SYMC",
+        "نام شرکت": "شرکت نمونه",
+        "نماد فارسی": "نمونه",
+        "نماد 30 رقمی فارسی": "شرکت نمونه",
+        "کد 12 رقمی شرکت": SYNTHETIC_COMPANY_ISIN,
+        "بازار": "بازار اول (تابلوی اصلی) بورس",
+        "کد تابلو": "1",
+        "کد گروه صنعت": "27",
+        "گروه صنعت": "فلزات اساسی",
+        "کد زیر گروه صنعت": "2710",
+        "زیر گروه صنعت": "تولید آهن و فولاد پایه",
+    }
+    rows = "".join(f"<tr><td>{key}</td><td>{value}</td></tr>" for key, value in id_details.items())
+    store.put("http://tsetmc.ir/Loader.aspx", {"i": symbol_id, "Partree": "15131M"}, f"<html><body><table>{rows}</table></body></html>")
+
+    rows = "".join(
+        f"<tr class='sh' onclick=\"ii.ShowShareHolder('{1000 + i},{SYNTHETIC_COMPANY_ISIN}')\">"
+        f"<td>Shareholder {i}</td><td><div title='{count:,}'>{count / 10**6:.2f} M</div></td>"
+        f"<td>{rng.uniform(1, 10):.2f}</td><td>{rng.randint(-10**6, 10**6)}</td></tr>"
+        for i, count in enumerate(rng.randint(10**6, 10**9) for _ in range(20))
+    )
+    store.put(
+        "http://tsetmc.ir/Loader.aspx",
+        {"c": SYNTHETIC_COMPANY_ISIN, "Partree": "15131T"},
+        f"<html><body><table><thead><tr><th>name</th></tr></thead><tbody>{rows}</tbody></table></body></html>",
+    )
+
+    # day details of the same symbol
+    t = SYNTHETIC_DATE.togregorian().strftime("%Y%m%d")
+    base_url = "http://cdn.tsetmc.com/api"
+
+    price = 10000
+    trades = []
+    for i in range(trades_count):
+        price = max(1, price + rng.randint(-10, 10))
+        trades.append(
+            {"nTran": i + 1, "hEven": heven(i * 12600 // trades_count), "pTran": float(price), "qTitTran": rng.randint(1, 10000), "canceled": 0}
+        )
+    for summarize in ("false", "true"):
+        store.put(f"{base_url}/Trade/GetTradeHistory/{symbol_id}/{t}/{summarize}", {}, json.dumps({"tradeHistory": trades}))
+
+    updates = [
+        {
+            "hEven": heven(i * 12600 // orderbook_updates),
+            # the book opens with all of its levels, later updates change one level each
+            "number": i + 1 if i < 5 else rng.randint(1, 5),
+            "zOrdMeDem": rng.randint(1, 50),
+            "pMeDem": price - rng.randint(1, 50),
+            "qTitMeDem": rng.randint(1, 10**6),
+            "zOrdMeOf": rng.randint(1, 50),
+            "pMeOf": price + rng.randint(1, 50),
+            "qTitMeOf": rng.randint(1, 10**6),
+        }
+        for i in range(orderbook_updates)
+    ]
+    store.put(f"{base_url}/BestLimits/{symbol_id}/{t}", {}, json.dumps({"bestLimitsHistory": updates}))
+
+    history = [
+        {"hEven": heven(i * 60), "pClosing": price, "pDrCotVal": price, "qTotCap": i * 10**7, "qTotTran5J": i * 1000, "zTotTran": i * 10}
+        for i in range(210)
+    ]
+    store.put(f"{base_url}/ClosingPrice/GetClosingPriceHistory/{symbol_id}/{t}", {}, json.dumps({"closingPriceHistory": history}))
+
+    overview = {
+        "priceChange": 100,
+        "priceMin": price - 200,
+        "priceMax": price + 200,
+        "priceYesterday": price - 100,
+        "priceFirst": price - 50,
+        "pClosing": price,
+        "pDrCotVal": price,
+        "zTotTran": trades_count,
+        "qTotTran5J": 10**7,
+        "qTotCap": 10**11,
+    }
+    store.put(f"{base_url}/ClosingPrice/GetClosingPriceDaily/{symbol_id}/{t}", {}, json.dumps({"closingPriceDaily": overview}))
+
+    client_type = {
+        f"{side}_{trader_type}_{field}": rng.randint(0, 10**9)
+        for side in ("buy", "sell")
+        for trader_type in ("N", "I")
+        for field in ("Volume", "Value", "Count")
+    }
+    store.put(f"{base_url}/ClientType/GetClientTypeHistory/{symbol_id}/{t}", {}, json.dumps({"clientType": client_type}))
+
+    thresholds = [{"psGelStaMax": 0, "psGelStaMin": 0}, {"psGelStaMax": price * 1.05, "psGelStaMin": price * 0.95}]
+    store.put(f"{base_url}/MarketData/GetStaticThreshold/{symbol_id}/{t}", {}, json.dumps({"staticThreshold": thresholds}))
+
+    return store
@@ -0,0 +1,100 @@
+import contextlib
+import contextvars
+
+from pydantic import BaseModel
+
+_validation_default = True
+_validation = contextvars.ContextVar("validation", default=None)
+_raw_dates_default = False
+_raw_dates = contextvars.ContextVar("raw_dates", default=None)
+
+
+def set_validation(enabled: bool):
+    """
+    Turns validation of the returned models on or off for the whole process, including worker threads.
+    """
+
+    global _validation_default
+
+    _validation_default = enabled
+
+
+@contextlib.contextmanager
+def validation(enabled: bool):
+    """
+    Within this context models are built with or without validation, overriding `set_validation`. The worker threads of BulkSymbol, DayDetailsBackfill, MarketSnapshot and PollingDaemon run in a copy of the caller's context and follow it too; other threads only follow `set_validation`.
+    """
+
+    token = _validation.set(enabled)
+    try:
+        yield
+    finally:
+        _validation.reset(token)
+
+
+def is_validating() -> bool:
+    if is_raw_dates():
+        return False
+
+    enabled = _validation.get()
+
+    return _validation_default if enabled is None else enabled
+
+
+def set_raw_dates(enabled: bool):
+    """
+    Turns raw dates mode on or off for the whole process, including worker threads.
+    """
+
+    global _raw_dates_default
+
+    _raw_dates_default = enabled
+
+
+@contextlib.contextmanager
+def raw_dates(enabled: bool):
+    """
+    Within this context hEven times and dEven dates are returned as raw ints (utils.HEven and utils.DEven) with lazy jalali accessors, instead of jdatetime objects. As these are not jdatetime objects, raw dates turn validation off as well. Like `validation`, it reaches the library's worker threads but not other threads, which only follow `set_raw_dates`.
+    """
+
+    token = _raw_dates.set(enabled)
+    try:
+        yield
+    finally:
+        _raw_dates.reset(token)
+
+
+def is_raw_dates() -> bool:
+    enabled = _raw_dates.get()
+
+    return _raw_dates_default if enabled is None else enabled
+
+
+class Model(BaseModel):
+    """
+    Base of every model the library returns. With validation turned off, models are built like `construct()`: the parsed values are stored as they are, skipping pydantic's type checks and coercion, which is considerably faster for large row lists. Attribute access, `dict()` and `json()` work the same either way.
+    """
+
+    def __init__(__pydantic_self__, **data):
+        if is_validating():
+            super().__init__(**data)
+            return
+
+        fields = __pydantic_self__.__fields__
+        if data.keys() == fields.keys():
+            # the common case, every field is given by its name
+            object.__setattr__(__pydantic_self__, "__dict__", data)
+            object.__setattr__(__pydantic_self__, "__fields_set__", set(data))
+            return
+
+        values = {}
+        for name, field in fields.items():
+            if field.alias in data:
+                values[name] = data[field.alias]
+            elif name in data:
+                values[name] = data[name]
+            elif not field.required:
+                values[name] = field.get_default()
+
+        object.__setattr__(__pydantic_self__, "__dict__", values)
+        object.__setattr__(__pydantic_self__, "__fields_set__", set(data))
@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+
+# (requests per second, burst) of each host, hosts that are not listed are not limited
+DEFAULT_RATE_LIMITS = {
+    "cdn.tsetmc.com": (10, 20),
+    "www.tsetmc.com": (5, 10),
+    "tsetmc.ir": (5, 10),
+    "members.tsetmc.com": (2, 5),
+}
+
+
+def _reserve(state: list[float] | None, now: float, rate: float, burst: int) -> tuple[list[float], float]:
+    """
+    Takes a token from a bucket state of [tokens, updated_at] and returns the new state and the seconds to wait for the token. The tokens go negative while requests are queued, so each caller waits for its own turn.
+    """
+
+    tokens, updated_at = state if state is not None else (burst, now)
+    tokens = min(burst, tokens + max(0.0, now - updated_at) * rate) - 1
+
+    return [tokens, now], max(0.0, -tokens / rate)
+
+
+class LocalBucketStore:
+    """
+    Keeps the token buckets in memory, shared by the threads of this process.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, host: str, rate: float, burst: int) -> float:
+        with self._lock:
+            self._buckets[host], wait = _reserve(self._buckets.get(host), time.time(), rate, burst)
+
+        return wait
+
+
+class FileBucketStore:
+    """
+    Keeps the token buckets in a small JSON file guarded by an exclusive file lock, so worker processes using the same path share one budget per host.
+    """
+
+    def __init__(self, path: str = os.path.join(os.path.expanduser("~"), ".cache", "tsetmc_scraper", "ratelimit.json")):
+        self.path = path
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.Lock()
+
+    def reserve(self, host: str, rate: float, burst: int) -> float:
+        with self._lock, open(self.path, "a+") as file:
+            _lock_file(file)
+            try:
+                file.seek(0)
+                try:
+                    buckets = json.loads(file.read() or "{}")
+                except ValueError:
+                    buckets = {}
+
+                buckets[host], wait = _reserve(buckets.get(host), time.time(), rate, burst)
+
+                file.seek(0)
+                file.truncate()
+                file.write(json.dumps(buckets))
+                file.flush()
+            finally:
+                _unlock_file(file)
+
+        return wait
+
+
+class RateLimiter:
+    """
+    Per host token bucket rate limiter. Each host in `limits` gets `rate` requests per second with bursts of up to `burst` requests; callers over the budget are delayed rather than rejected.
+
+    Buckets live in memory by default; pass `store=FileBucketStore(path)` to share them between processes.
+    """
+
+    def __init__(self, limits: dict[str, tuple[float, int]] | None = None, store: LocalBucketStore | FileBucketStore | None = None):
+        self.limits = DEFAULT_RATE_LIMITS if limits is None else limits
+        self.store = LocalBucketStore() if store is None else store
+
+    def reserve(self, host: str | None) -> float:
+        """
+        Takes a token of a host and returns the seconds to wait before sending the request.
+        """
+
+        limit = self.limits.get(host)
+        if limit is None:
+            return 0.0
+
+        rate, burst = limit
+
+        return self.store.reserve(host, rate, burst)
+
+    def wait(self, host: str | None):
+        """
+        Blocks until a request to the host may be sent.
+        """
+
+        delay = self.reserve(host)
+        if delay > 0:
+            time.sleep(delay)
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(file):
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(file):
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _lock_file(file):
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(file):
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
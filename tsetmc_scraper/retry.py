@@ -0,0 +1,206 @@
+import email.utils
+import random
+import threading
+import time
+from collections import defaultdict
+
+from . import instrumentation
+
+DEFAULT_RETRY_STATUSES = frozenset({403, 429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request while the circuit breaker of its host is open.
+    """
+
+
+class RetryPolicy:
+    """
+    Retries throttled (403, 429) and failing (5xx) responses, connection errors and timeouts with jittered exponential backoff. A Retry-After header is respected, as long as it is not longer than `max_backoff`.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30,
+        retry_statuses: set[int] = DEFAULT_RETRY_STATUSES,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+
+    def is_retryable(self, status: int | None) -> bool:
+        """
+        Whether a failure is retryable, status being None for connection errors and timeouts.
+        """
+
+        return status is None or status in self.retry_statuses
+
+    def get_delay(self, attempt: int, status: int | None, headers: dict[str, str] | None = None) -> float | None:
+        """
+        Returns the seconds to wait before retrying a failed attempt (starting at 0), or None if it should not be retried.
+        """
+
+        if attempt >= self.max_retries or not self.is_retryable(status):
+            return None
+
+        # full jitter, see https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+        delay = random.uniform(0, min(self.max_backoff, self.backoff_factor * 2**attempt))
+
+        retry_after = _parse_retry_after((headers or {}).get("Retry-After"))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Per host circuit breaker. After `failure_threshold` consecutive retryable failures of a host, requests to it fail fast with CircuitOpenError for `reset_timeout` seconds; after that a single trial request is let through, closing the circuit again if it succeeds.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._failures = defaultdict(int)
+        self._opened_at = {}
+        self._trial_running = set()
+        self._lock = threading.Lock()
+
+    def before_request(self, host: str) -> bool:
+        """
+        Raises CircuitOpenError if the circuit of the host is open. Returns whether the request is the trial of a half open circuit, in which case release_trial must be called once it is done.
+        """
+
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return False
+
+            if time.monotonic() - opened_at < self.reset_timeout or host in self._trial_running:
+                raise CircuitOpenError(f"circuit of {host} is open after {self._failures[host]} consecutive failures")
+
+            self._trial_running.add(host)
+            return True
+
+    def release_trial(self, host: str):
+        """
+        Lets another trial through if the running one ended without a success or a failure being recorded, such as when it was cancelled.
+        """
+
+        with self._lock:
+            self._trial_running.discard(host)
+
+    def record_success(self, host: str):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._trial_running.discard(host)
+
+    def record_failure(self, host: str) -> bool:
+        """
+        Records a retryable failure and returns whether it opened the circuit.
+        """
+
+        with self._lock:
+            self._failures[host] += 1
+            was_trial = host in self._trial_running
+            self._trial_running.discard(host)
+
+            if was_trial or self._failures[host] >= self.failure_threshold:
+                is_new = host not in self._opened_at or was_trial
+                self._opened_at[host] = time.monotonic()
+                return is_new
+
+            return False
+
+
+class RetryStats:
+    """
+    Thread safe per host counters of retries, seconds spent backing off and circuit openings.
+    """
+
+    def __init__(self):
+        self._stats = defaultdict(lambda: {"retries": 0, "backoff_seconds": 0.0, "circuit_opened": 0})
+        self._lock = threading.Lock()
+
+    def record_retry(self, host: str, delay: float):
+        with self._lock:
+            self._stats[host]["retries"] += 1
+            self._stats[host]["backoff_seconds"] += delay
+
+    def record_circuit_opened(self, host: str):
+        with self._lock:
+            self._stats[host]["circuit_opened"] += 1
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {host: dict(stats) for host, stats in self._stats.items()}
+
+
+class RetryHandler:
+    """
+    Applies a RetryPolicy and a CircuitBreaker (either may be None) around the attempts of a client, counting them in `stats`.
+    """
+
+    def __init__(self, retry: RetryPolicy | None, circuit_breaker: CircuitBreaker | None):
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.stats = RetryStats()
+
+    def before_request(self, host: str) -> bool:
+        """
+        Returns whether the request is a circuit breaker trial, to be released with release_trial once it is done.
+        """
+
+        if self.circuit_breaker is not None:
+            return self.circuit_breaker.before_request(host)
+
+        return False
+
+    def release_trial(self, host: str):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.release_trial(host)
+
+    def on_success(self, host: str):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_success(host)
+
+    def on_failure(self, host: str, attempt: int, status: int | None, headers: dict[str, str] | None) -> float | None:
+        """
+        Records a failed attempt and returns the seconds to wait before retrying it, or None if it should be raised.
+        """
+
+        if self.circuit_breaker is not None:
+            retry_statuses = self.retry.retry_statuses if self.retry is not None else DEFAULT_RETRY_STATUSES
+            if status is not None and status not in retry_statuses:
+                # the host answered, it is only this request that is wrong
+                self.circuit_breaker.record_success(host)
+            elif self.circuit_breaker.record_failure(host):
+                self.stats.record_circuit_opened(host)
+
+        delay = self.retry.get_delay(attempt, status, headers) if self.retry is not None else None
+        if delay is not None:
+            self.stats.record_retry(host, delay)
+            instrumentation.record(instrumentation.RETRIES, 1, host=host, status=status)
+
+        return delay
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,191 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Generator
+
+from .aio import AsyncClient, get_async_client
+from .market_map import MapType
+from .market_map import _core as market_map_core
+from .market_watch import _core as market_watch_core
+from .models import Model
+from .transport import Transport, drive, get_transport
+from .utils import columns_to_arrow, import_optional
+
+# name: endpoint steps of the source for a map type
+_SOURCES: dict[str, Callable[[MapType], Generator]] = {
+    "price": lambda map_type: market_watch_core.get_watch_price_columns.steps(),
+    "traders_type": lambda map_type: market_watch_core.get_watch_traders_type_data.steps(),
+    "stats": lambda map_type: market_watch_core.get_watch_stats_columns.steps(),
+    "map": lambda map_type: market_map_core.get_market_map_data.steps(map_type=map_type.value),
+}
+
+_TRADERS_TYPE_FIELDS = [(kind, side, field) for kind in ("real", "legal") for side in ("buy", "sell") for field in ("count", "volume")]
+
+
+class SnapshotSource(Model):
+    """
+    How fresh one source of a snapshot is: when its response arrived, how long it took, how many symbols it had, the time of its latest update as heven where the source has one, and the error if it failed.
+    """
+
+    name: str
+    fetched_at: datetime | None
+    seconds: float
+    symbol_count: int
+    latest_heven: int | None
+    error: str | None
+
+
+class MarketSnapshotTable(Model):
+    """
+    One columnar view of the whole market. `columns` holds NumPy arrays aligned with `symbol_ids` (the market watch symbols), named by source: "price.*" as in MarketWatch.get_price_columns, "traders_type.{real|legal}.{buy|sell}.{count|volume}", "stats.{group}.{name}" as in MarketWatch.get_stats_columns and "map.*" from the market map. Values a source has no row for, or that come from a failed source, are NaN ("" for text).
+    """
+
+    symbol_ids: Any
+    columns: dict[str, Any]
+    sources: dict[str, SnapshotSource]
+
+    def to_arrow(self):
+        """
+        Returns the table as a PyArrow table with a symbol_id column. Requires pyarrow.
+        """
+
+        return columns_to_arrow({"symbol_id": self.symbol_ids, **self.columns})
+
+
+class MarketSnapshot:
+    """
+    Fetches the market watch prices, traders type, stats and the market map concurrently over a shared transport and joins them by symbol id into a MarketSnapshotTable. Requires numpy.
+
+    The prices are required; if another source fails its columns are left empty and the error is reported in its SnapshotSource.
+    """
+
+    def __init__(self, map_type: MapType = MapType.MARKET_VALUE, transport: Transport | None = None):
+        self.map_type = map_type
+        self.transport = transport
+
+    def get_snapshot(self) -> MarketSnapshotTable:
+        transport = self.transport if self.transport is not None else get_transport()
+
+        def fetch(steps: Generator):
+            started_at = time.perf_counter()
+            try:
+                value = drive(steps, transport.send)
+            except Exception as e:
+                return None, None, time.perf_counter() - started_at, e
+
+            return value, datetime.now(), time.perf_counter() - started_at, None
+
+        with ThreadPoolExecutor(max_workers=len(_SOURCES)) as executor:
+            # in copies of the caller's context, so validation() and raw_dates() apply in the workers too
+            futures = {name: executor.submit(contextvars.copy_context().run, fetch, steps(self.map_type)) for name, steps in _SOURCES.items()}
+            results = {name: future.result() for name, future in futures.items()}
+
+        return _join(results)
+
+
+class AsyncMarketSnapshot:
+    """
+    Async counterpart of MarketSnapshot, fetching the sources concurrently on an AsyncClient.
+    """
+
+    def __init__(self, map_type: MapType = MapType.MARKET_VALUE, client: AsyncClient | None = None):
+        self.map_type = map_type
+        self._client = client
+
+    @property
+    def client(self) -> AsyncClient:
+        return self._client if self._client is not None else get_async_client()
+
+    async def get_snapshot(self) -> MarketSnapshotTable:
+        client = self.client
+
+        async def fetch(steps: Generator):
+            started_at = time.perf_counter()
+            try:
+                value = await client.run(steps)
+            except Exception as e:
+                return None, None, time.perf_counter() - started_at, e
+
+            return value, datetime.now(), time.perf_counter() - started_at, None
+
+        names = list(_SOURCES)
+        results = await asyncio.gather(*(fetch(_SOURCES[name](self.map_type)) for name in names))
+
+        return _join(dict(zip(names, results)))
+
+
+def _join(results: dict[str, tuple]) -> MarketSnapshotTable:
+    # results are (value, fetched_at, seconds, error) per source, joined onto the market watch symbols
+    np = import_optional("numpy", "numpy")
+
+    price, _, _, error = results["price"]
+    if error is not None:
+        raise error
+
+    price_data, _, _, max_heven = price
+    price_data = dict(price_data)
+    symbol_ids = price_data.pop("symbol_id")
+    positions = {symbol_id: position for position, symbol_id in enumerate(symbol_ids.tolist())}
+    size = len(symbol_ids)
+
+    def match(symbol_ids: list[str]) -> tuple[list[int], list[int]]:
+        # (source rows, table rows) of the symbols both have
+        pairs = [(row, positions[symbol_id]) for row, symbol_id in enumerate(symbol_ids) if symbol_id in positions]
+        return [pair[0] for pair in pairs], [pair[1] for pair in pairs]
+
+    columns = {f"price.{name}": column for name, column in price_data.items()}
+    counts = {"price": size}
+    latest_hevens = {"price": max_heven}
+
+    # traders type, the values are sent as text
+    traders_type = results["traders_type"][0] or {}
+    source_rows, targets = match(list(traders_type))
+    rows = list(traders_type.values())
+    rows = [rows[row] for row in source_rows]
+    for kind, side, field in _TRADERS_TYPE_FIELDS:
+        column = np.full(size, np.nan)
+        column[targets] = np.array([data[kind][side][field] for data in rows], dtype=np.float64)
+        columns[f"traders_type.{kind}.{side}.{field}"] = column
+    counts["traders_type"] = len(traders_type)
+
+    # stats, already dense
+    stats = results["stats"][0]
+    values = np.full((size, len(market_watch_core._STATS_COLUMN_NAMES)), np.nan)
+    if stats is not None:
+        source_rows, targets = match(stats["symbol_id"].tolist())
+        values[targets] = stats["values"][source_rows]
+    for position, name in enumerate(market_watch_core._STATS_COLUMN_NAMES):
+        columns[f"stats.{name}"] = values[:, position]
+    counts["stats"] = len(stats["symbol_id"]) if stats is not None else 0
+
+    # market map, the fields the market watch does not have
+    map_data, map_heven = results["map"][0] if results["map"][0] is not None else ({}, None)
+    source_rows, targets = match(list(map_data))
+    rows = list(map_data.values())
+    rows = [rows[row] for row in source_rows]
+    for name in ("color", "group_name"):
+        column = np.full(size, "", dtype=object)
+        column[targets] = [data[name] for data in rows]
+        columns[f"map.{name}"] = column.astype(str)
+    for name in ("percent", "price_change_percent"):
+        column = np.full(size, np.nan)
+        column[targets] = np.array([data[name] for data in rows], dtype=np.float64)
+        columns[f"map.{name}"] = column
+    counts["map"] = len(map_data)
+    latest_hevens["map"] = map_heven
+
+    sources = {
+        name: SnapshotSource(
+            name=name,
+            fetched_at=fetched_at,
+            seconds=seconds,
+            symbol_count=counts[name],
+            latest_heven=latest_hevens.get(name),
+            error=repr(error) if error is not None else None,
+        )
+        for name, (_, fetched_at, seconds, error) in results.items()
+    }
+
+    return MarketSnapshotTable(symbol_ids=symbol_ids, columns=columns, sources=sources)
@@ -1 +1,2 @@
-from .symbol import Symbol
+from .bulk import BulkSymbol, BulkSymbolResult
+from .symbol import AsyncSymbol, Symbol
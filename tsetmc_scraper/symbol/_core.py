@@ -2,24 +2,20 @@ import ast
 import locale
 from collections import defaultdict
 
-import requests
 from bs4 import BeautifulSoup
-from jdatetime import date as jdate
 from jdatetime import datetime as jdatetime
 from jdatetime import time as jtime
 
-from ..utils import convert_deven_to_jdate, convert_heven_to_jtime, get_request_headers
+from ..transport import Request, endpoint
+from ..utils import convert_deven_to_jdate, convert_heven_to_jtime
 
 
+@endpoint
 def get_symbol_group_data(symbol_group_code: int) -> list[dict]:
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/ClosingPrice/GetRelatedCompany/{symbol_group_code}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.json()["relatedCompany"]
 
     return [
@@ -42,15 +38,12 @@ def get_symbol_group_data(symbol_group_code: int) -> list[dict]:
     ]
 
 
+@endpoint(rows=1)
 def get_symbol_option_data(symbol_isin: str) -> dict:
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/Instrument/GetInstrumentOptionByInstrumentID/{symbol_isin}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.json()["instrumentOption"]
 
     return {
@@ -69,15 +62,12 @@ def get_symbol_option_data(symbol_isin: str) -> dict:
     }
 
 
+@endpoint
 def get_symbol_intraday_price_chart(symbol_id: str) -> list[dict]:
-    response = requests.get(
+    response = yield Request(
         url="http://www.tsetmc.com/tsev2/chart/data/IntraDayPrice.aspx",
         params={"i": symbol_id},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.text
 
     ticks = response.split(";")
@@ -101,18 +91,15 @@ def get_symbol_intraday_price_chart(symbol_id: str) -> list[dict]:
     return result
 
 
+@endpoint(rows=1)
 def get_symbol_price_overview(symbol_id: str) -> dict:
-    response = requests.get(
+    response = yield Request(
         url="http://www.tsetmc.com/tsev2/data/instinfodata.aspx",
         params={
             "i": symbol_id,
             "c": 27,
         },
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.text
 
     all_sections = response.split(";")
@@ -218,15 +205,12 @@ def get_symbol_price_overview(symbol_id: str) -> dict:
     }
 
 
+@endpoint(rows=1)
 def get_symbol_info(symbol_id: str) -> dict:
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/Instrument/GetInstrumentInfo/{symbol_id}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.json()["instrumentInfo"]
 
     date = convert_deven_to_jdate(response["dEven"]) if response["dEven"] != 0 else None
@@ -241,8 +225,8 @@ def get_symbol_info(symbol_id: str) -> dict:
         "group_pe": response["eps"]["sectorPE"],
         "group_code": response["sector"]["cSecVal"],
         "group_name": response["sector"]["lSecVal"],
-        "range_min": response["staticThreshold"]["psGelStaMin"],
-        "range_max": response["staticThreshold"]["psGelStaMax"],
+        "range_min": int(response["staticThreshold"]["psGelStaMin"]),
+        "range_max": int(response["staticThreshold"]["psGelStaMax"]),
         "min_week": response["minWeek"],
         "max_week": response["maxWeek"],
         "min_year": response["minYear"],
@@ -257,15 +241,12 @@ def get_symbol_info(symbol_id: str) -> dict:
     }
 
 
+@endpoint(rows=1)
 def get_symbol_traders_type(symbol_id: str) -> dict:
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/ClientType/GetClientType/{symbol_id}/1/0",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.json()["clientType"]
 
     return {
@@ -292,15 +273,12 @@ def get_symbol_traders_type(symbol_id: str) -> dict:
     }
 
 
+@endpoint(rows=1)
 def get_symbol_orderbook(symbol_id: str) -> list[dict]:
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/BestLimits/{symbol_id}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.json()["bestLimits"]
     response = sorted(response, key=lambda x: x["number"])
 
@@ -331,15 +309,12 @@ def get_symbol_orderbook(symbol_id: str) -> list[dict]:
     return order_map
 
 
+@endpoint(rows=1)
 def get_symbol_closing_price_info(symbol_id: str) -> dict:
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/ClosingPrice/GetClosingPriceInfo/{symbol_id}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.json()["closingPriceInfo"]
 
     return {
@@ -360,15 +335,12 @@ def get_symbol_closing_price_info(symbol_id: str) -> dict:
     }
 
 
+@endpoint
 def get_symbol_trades_data(symbol_id: str) -> list[dict]:
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/Trade/GetTrade/{symbol_id}",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.json()["trade"]
 
     trade_list = []
@@ -382,25 +354,22 @@ def get_symbol_trades_data(symbol_id: str) -> list[dict]:
         trade_list[index] = {
             "time": convert_heven_to_jtime(row["hEven"]),
             "volume": row["qTitTran"],
-            "price": row["pTran"],
+            "price": int(row["pTran"]),
             "canceled": row["canceled"],
         }
 
     return trade_list
 
 
+@endpoint
 def get_symbol_supervisor_messages(symbol_id: str) -> list[dict]:
-    response = requests.get(
+    response = yield Request(
         url=" http://tsetmc.ir/Loader.aspx",
         params={
             "i": symbol_id,
             "Partree": "15131W",
         },
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.text
 
     soup = BeautifulSoup(response, "lxml")
@@ -425,15 +394,12 @@ def get_symbol_supervisor_messages(symbol_id: str) -> list[dict]:
     return messages
 
 
+@endpoint
 def get_symbol_daily_ticks_history(symbol_id: str) -> list[dict]:
-    response = requests.get(
+    response = yield Request(
         url=f"http://cdn.tsetmc.com/api/ClosingPrice/GetClosingPriceDailyList/{symbol_id}/0",
         params={},
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.json()["closingPriceDaily"]
 
     return [
@@ -455,17 +421,14 @@ def get_symbol_daily_ticks_history(symbol_id: str) -> list[dict]:
     ]
 
 
+@endpoint
 def get_symbol_notifications(symbol_id: str) -> list[dict]:
-    response = requests.get(
+    response = yield Request(
         url="http://tsetmc.ir/tsev2/data/CodalTopNew.aspx",
         params={
             "i": symbol_id,
         },
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.text
 
     data = ast.literal_eval(response)
@@ -475,18 +438,15 @@ def get_symbol_notifications(symbol_id: str) -> list[dict]:
     return notifications
 
 
+@endpoint
 def get_symbol_state_changes(symbol_id: str) -> list[dict]:
-    response = requests.get(
+    response = yield Request(
         url=" http://tsetmc.ir/Loader.aspx",
         params={
             "i": symbol_id,
             "Partree": "15131L",
         },
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.text
 
     data = BeautifulSoup(response, "lxml")
@@ -500,18 +460,15 @@ def get_symbol_state_changes(symbol_id: str) -> list[dict]:
     return state_changes
 
 
+@endpoint(rows=1)
 def get_symbol_id_details(symbol_id: str) -> dict:
-    response = requests.get(
+    response = yield Request(
         url="http://tsetmc.ir/Loader.aspx",
         params={
             "i": symbol_id,
             "Partree": "15131M",
         },
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.text
 
     data = BeautifulSoup(response, "lxml")
@@ -542,17 +499,14 @@ def get_symbol_id_details(symbol_id: str) -> dict:
     return result
 
 
+@endpoint
 def get_symbol_traders_type_history(symbol_id: str) -> list[dict]:
-    response = requests.get(
+    response = yield Request(
         url="http://tsetmc.ir/tsev2/data/clienttype.aspx",
         params={
             "i": symbol_id,
         },
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.text
 
     traders_type_history = []
@@ -561,33 +515,29 @@ def get_symbol_traders_type_history(symbol_id: str) -> list[dict]:
         (dt, r_buy_c, l_buy_c, r_sell_c, l_sell_c, r_buy_v, l_buy_v, r_sell_v, l_sell_v, r_buy_vl, l_buy_vl, r_sell_vl, l_sell_vl) = row.split(",")
         traders_type_history.append(
             {
-                "date": jdate.fromgregorian(
-                    year=int(dt[:4]),
-                    month=int(dt[4:6]),
-                    day=int(dt[6:]),
-                ),
+                "date": convert_deven_to_jdate(deven=int(dt)),
                 "legal": {
                     "buy": {
-                        "value": l_buy_vl,
-                        "volume": l_buy_v,
-                        "count": l_buy_c,
+                        "value": int(l_buy_vl),
+                        "volume": int(l_buy_v),
+                        "count": int(l_buy_c),
                     },
                     "sell": {
-                        "value": l_sell_vl,
-                        "volume": l_sell_v,
-                        "count": l_sell_c,
+                        "value": int(l_sell_vl),
+                        "volume": int(l_sell_v),
+                        "count": int(l_sell_c),
                     },
                 },
                 "real": {
                     "buy": {
-                        "value": r_buy_vl,
-                        "volume": r_buy_v,
-                        "count": r_buy_c,
+                        "value": int(r_buy_vl),
+                        "volume": int(r_buy_v),
+                        "count": int(r_buy_c),
                     },
                     "sell": {
-                        "value": r_sell_vl,
-                        "volume": r_sell_v,
-                        "count": r_sell_c,
+                        "value": int(r_sell_vl),
+                        "volume": int(r_sell_v),
+                        "count": int(r_sell_c),
                     },
                 },
             }
@@ -596,18 +546,15 @@ def get_symbol_traders_type_history(symbol_id: str) -> list[dict]:
     return traders_type_history
 
 
+@endpoint
 def get_symbol_shareholders(company_isin: str) -> list[dict]:
-    response = requests.get(
+    response = yield Request(
         url="http://tsetmc.ir/Loader.aspx",
         params={
             "c": company_isin,
             "Partree": "15131T",
         },
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.text
 
     soup = BeautifulSoup(response, "lxml")
@@ -637,17 +584,14 @@ def get_symbol_shareholders(company_isin: str) -> list[dict]:
     return shareholders
 
 
+@endpoint(rows=1)
 def get_symbol_shareholder_details(shareholder_id: str, company_isin: str):
-    response = requests.get(
+    response = yield Request(
         url=f"http://www.tsetmc.com/tsev2/data/ShareHolder.aspx?i={shareholder_id}%2C{company_isin}",
         params={
             "i": f"{shareholder_id}%C{company_isin}",
         },
-        headers=get_request_headers(),
-        verify=False,
-        timeout=20,
     )
-    response.raise_for_status()
     response = response.text
 
     response = response.split(";")
@@ -0,0 +1,76 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from pydantic import BaseModel
+
+from ..transport import Endpoint, HostLimiter, Request, Transport, drive, get_transport
+from .symbol import Symbol
+
+
+class BulkSymbolResult(BaseModel):
+    symbol_id: str
+    data: dict[str, Any]
+    errors: dict[str, Exception]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    class Config:
+        arbitrary_types_allowed = True
+
+
+class BulkSymbol:
+    """
+    Fetches Symbol endpoints for many symbols at once over a bounded thread pool. Endpoints are Symbol method names, e.g. "get_info", "get_closing_price_info", "get_orderbook" or "get_daily_history".
+
+    Keep max_per_host at or below the transport pool_maxsize, otherwise extra connections are not reused.
+    """
+
+    def __init__(self, symbol_ids: list[str], max_workers: int = 16, max_per_host: int = 8, transport: Transport | None = None):
+        self.symbol_ids = list(dict.fromkeys(symbol_ids))
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.transport = transport
+
+    def get_data(self, endpoints: list[str]) -> dict[str, BulkSymbolResult]:
+        """
+        Calls every endpoint for every symbol and returns the results keyed by symbol id. Failed calls are reported in the errors of each result instead of being raised.
+        """
+
+        methods = {}
+        for name in endpoints:
+            method = getattr(Symbol, name, None)
+            if not isinstance(method, Endpoint):
+                raise ValueError(f"{name} is not a Symbol endpoint")
+
+            methods[name] = method
+
+        transport = self.transport if self.transport is not None else get_transport()
+        limiter = HostLimiter(max_per_host=self.max_per_host)
+
+        def send(request: Request):
+            with limiter(request.url):
+                return transport.send(request)
+
+        def fetch(symbol_id: str, method: Endpoint):
+            return drive(method.steps(Symbol(symbol_id=symbol_id)), send)
+
+        results = {symbol_id: BulkSymbolResult(symbol_id=symbol_id, data={}, errors={}) for symbol_id in self.symbol_ids}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # each fetch runs in a copy of the caller's context, so validation() and raw_dates() apply in the workers too
+            futures = {
+                (symbol_id, name): executor.submit(contextvars.copy_context().run, fetch, symbol_id, method)
+                for symbol_id in self.symbol_ids
+                for name, method in methods.items()
+            }
+
+            for (symbol_id, name), future in futures.items():
+                try:
+                    results[symbol_id].data[name] = future.result()
+                except Exception as e:
+                    results[symbol_id].errors[name] = e
+
+        return results
@@ -1,7 +1,7 @@
-from pydantic import BaseModel
+from ..models import Model
 
 
-class SymbolGroupDataRow(BaseModel):
+class SymbolGroupDataRow(Model):
     symbol_id: str
     last: int
     close: int
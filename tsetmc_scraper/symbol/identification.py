@@ -1,7 +1,7 @@
-from pydantic import BaseModel
+from ..models import Model
 
 
-class SymbolIdDetails(BaseModel):
+class SymbolIdDetails(Model):
     isin: str
     short_isin: str
     short_name: str
@@ -1,8 +1,9 @@
 from jdatetime import date as jdate, time as jtime
-from pydantic import BaseModel
 
+from ..models import Model
 
-class SymbolInfo(BaseModel):
+
+class SymbolInfo(Model):
     date: jdate | None
     symbol_id: str
     isin: str
@@ -30,7 +31,7 @@ class SymbolInfo(BaseModel):
         arbitrary_types_allowed = True
 
 
-class SymbolClosingPriceInfo(BaseModel):
+class SymbolClosingPriceInfo(Model):
     date: jdate
     time: jtime
     state_value: str
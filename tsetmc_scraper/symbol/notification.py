@@ -1,8 +1,9 @@
 from jdatetime import datetime as jdatetime
-from pydantic import BaseModel
 
+from ..models import Model
 
-class SymbolNotificationsDataRow(BaseModel):
+
+class SymbolNotificationsDataRow(Model):
     datetime: jdatetime
     title: str
 
@@ -1,8 +1,9 @@
 from jdatetime import date as jdate
-from pydantic import BaseModel
 
+from ..models import Model
 
-class SymbolOptionData(BaseModel):
+
+class SymbolOptionData(Model):
     symbol_id: str
     isin: str
     base_symbol_id: str
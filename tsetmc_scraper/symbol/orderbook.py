@@ -1,12 +1,12 @@
-from pydantic import BaseModel
+from ..models import Model
 
 
-class SymbolOrderBookDataRow(BaseModel):
+class SymbolOrderBookDataRow(Model):
     count: int
     price: int
     volume: int
 
 
-class SymbolOrderBookData(BaseModel):
+class SymbolOrderBookData(Model):
     buy_rows: list[SymbolOrderBookDataRow]
     sell_rows: list[SymbolOrderBookDataRow]
@@ -1,13 +1,13 @@
 from jdatetime import date as jdate
 from jdatetime import time as jtime
-from pydantic import BaseModel
 
+from ..models import Model
 from .group import SymbolGroupDataRow
 from .orderbook import SymbolOrderBookData
 from .traders_type import SymbolTradersTypeDataRow
 
 
-class SymbolPriceData(BaseModel):
+class SymbolPriceData(Model):
     last: int
     close: int
     open: int
@@ -28,14 +28,14 @@ class SymbolDailyPriceDataRow(SymbolPriceData):
         arbitrary_types_allowed = True
 
 
-class SymbolPriceOverview(BaseModel):
+class SymbolPriceOverview(Model):
     price_data: SymbolPriceData
     orderbook: SymbolOrderBookData
     traders_type: SymbolTradersTypeDataRow
     group_data: list[SymbolGroupDataRow]
 
 
-class SymbolIntraDayPriceChartDataRow(BaseModel):
+class SymbolIntraDayPriceChartDataRow(Model):
     time: jtime
     high: int
     low: int
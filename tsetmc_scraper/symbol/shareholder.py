@@ -1,18 +1,20 @@
 from jdatetime import date as jdate
-from pydantic import BaseModel
+from pydantic import Field
 
+from ..models import Model
 from . import _core
 
 
-class SymbolShareHolderPortfolioRow(BaseModel):
+class SymbolShareHolderPortfolioRow(Model):
     symbol_id: str
     long_name: str
     count: int
     percentage: float
 
 
-class SymbolShareHolder(BaseModel):
-    _company_isin: str
+class SymbolShareHolder(Model):
+    # pydantic ignores fields starting with an underscore, so the attribute is stored under company_isin
+    company_isin: str = Field(alias="_company_isin")
     id: str
     name: str
 
@@ -23,7 +25,7 @@ class SymbolShareHolder(BaseModel):
 
         raw_data = _core.get_symbol_shareholder_details(
             shareholder_id=self.id,
-            company_isin=self._company_isin,
+            company_isin=self.company_isin,
         )["portfolio"]
 
         return [
@@ -37,7 +39,7 @@ class SymbolShareHolder(BaseModel):
         ]
 
 
-class SymbolShareHolderChartRow(BaseModel):
+class SymbolShareHolderChartRow(Model):
     date: jdate
     count: int
 
@@ -45,7 +47,7 @@ class SymbolShareHolderChartRow(BaseModel):
         arbitrary_types_allowed = True
 
 
-class SymbolShareHolderDataRow(BaseModel):
+class SymbolShareHolderDataRow(Model):
     shareholder: SymbolShareHolder
     count: int
     percentage: float
@@ -58,8 +60,8 @@ class SymbolShareHolderDataRow(BaseModel):
 
         raw_data = _core.get_symbol_shareholder_details(
             shareholder_id=self.shareholder.id,
-            company_isin=self.shareholder._company_isin,
-        )
+            company_isin=self.shareholder.company_isin,
+        )["chart"]
 
         return [
             SymbolShareHolderChartRow(
@@ -1,8 +1,9 @@
 from jdatetime import datetime as jdatetime
-from pydantic import BaseModel
 
+from ..models import Model
 
-class SymbolStateChangeDataRow(BaseModel):
+
+class SymbolStateChangeDataRow(Model):
     datetime: jdatetime
     new_state: str
 
@@ -1,8 +1,9 @@
 from jdatetime import datetime as jdatetime
-from pydantic import BaseModel
 
+from ..models import Model
 
-class SymbolSupervisorMessageDataRow(BaseModel):
+
+class SymbolSupervisorMessageDataRow(Model):
     datetime: jdatetime
     title: str
     content: str
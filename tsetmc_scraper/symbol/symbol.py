@@ -1,3 +1,5 @@
+from ..aio import AsyncClient, AsyncWrapper, async_method
+from ..transport import endpoint
 from . import _core
 from .group import SymbolGroupAPIDataRow, SymbolGroupDataRow
 from .identification import SymbolIdDetails
@@ -17,12 +19,13 @@ class Symbol:
     def __init__(self, symbol_id: str):
         self.symbol_id = symbol_id
 
+    @endpoint
     def get_price_overview(self) -> SymbolPriceOverview:
         """
         Returns an overview of the last price information for a given symbol, including most of the information available in the "dar yek negah" tab.
         """
 
-        raw_data = _core.get_symbol_price_overview(symbol_id=self.symbol_id)
+        raw_data = yield from _core.get_symbol_price_overview.steps(symbol_id=self.symbol_id)
 
         tick = SymbolPriceData(
             last=raw_data["price_data"]["last"],
@@ -103,12 +106,13 @@ class Symbol:
             group_data=group_data,
         )
 
+    @endpoint
     def get_info(self) -> SymbolInfo:
         """
         Returns symbol information such as EPS, Groupe PE, Flow, Flow Title, Base Volume, and other relevant data.
         """
 
-        raw_data = _core.get_symbol_info(symbol_id=self.symbol_id)
+        raw_data = yield from _core.get_symbol_info.steps(symbol_id=self.symbol_id)
 
         return SymbolInfo(
             date=raw_data["date"],
@@ -135,12 +139,13 @@ class Symbol:
             base_volume=raw_data["base_volume"],
         )
 
+    @endpoint
     def get_traders_type(self) -> SymbolTradersTypeDataRow:
         """
         Returns the trader type information for a given symbol.
         """
 
-        raw_data = _core.get_symbol_traders_type(symbol_id=self.symbol_id)
+        raw_data = yield from _core.get_symbol_traders_type.steps(symbol_id=self.symbol_id)
 
         return SymbolTradersTypeDataRow(
             legal=SymbolTradersTypeInfo(
@@ -165,12 +170,13 @@ class Symbol:
             ),
         )
 
+    @endpoint
     def get_orderbook(self) -> SymbolOrderBookData:
         """
         Returns the orderbook for a given symbol.
         """
 
-        raw_data = _core.get_symbol_orderbook(symbol_id=self.symbol_id)
+        raw_data = yield from _core.get_symbol_orderbook.steps(symbol_id=self.symbol_id)
 
         sell_rows = [
             SymbolOrderBookDataRow(
@@ -193,12 +199,13 @@ class Symbol:
             buy_rows=buy_rows,
         )
 
+    @endpoint
     def get_closing_price_info(self) -> SymbolClosingPriceInfo:
         """
         Returns the current closing price information for a given symbol.
         """
 
-        raw_data = _core.get_symbol_closing_price_info(symbol_id=self.symbol_id)
+        raw_data = yield from _core.get_symbol_closing_price_info.steps(symbol_id=self.symbol_id)
 
         return SymbolClosingPriceInfo(
             date=raw_data["date"],
@@ -217,15 +224,16 @@ class Symbol:
             value=raw_data["value"],
         )
 
+    @endpoint
     def get_group_data(self, group_code: int | None = None) -> list[SymbolGroupAPIDataRow]:
         """
         Returns a list of related companies (companies in the same group) for a given symbol. If group_code is not provided, this function will call get_info to retrieve the group code for the current symbol.
         """
 
         if group_code is None:
-            group_code = self.get_info().group_code
+            group_code = (yield from self.get_info.steps()).group_code
 
-        raw_data = _core.get_symbol_group_data(symbol_group_code=group_code)
+        raw_data = yield from _core.get_symbol_group_data.steps(symbol_group_code=group_code)
 
         return [
             SymbolGroupAPIDataRow(
@@ -246,15 +254,16 @@ class Symbol:
             for row in raw_data
         ]
 
+    @endpoint
     def get_option_data(self, isin: str | None = None) -> SymbolOptionData:
         """
         Returns data for option symbols. If isin is not provided, this function will call get_info to retrieve the ISIN for the current symbol.
         """
 
         if isin is None:
-            isin = self.get_info().isin
+            isin = (yield from self.get_info.steps()).isin
 
-        raw_data = _core.get_symbol_option_data(symbol_isin=isin)
+        raw_data = yield from _core.get_symbol_option_data.steps(symbol_isin=isin)
 
         return SymbolOptionData(
             symbol_id=raw_data["symbol_id"],
@@ -271,12 +280,13 @@ class Symbol:
             c_factor=raw_data["c_factor"],
         )
 
+    @endpoint
     def get_trades_data(self) -> list[SymbolTradeRow]:
         """
         Returns the trade list from the last day.
         """
 
-        raw_data = _core.get_symbol_trades_data(symbol_id=self.symbol_id)
+        raw_data = yield from _core.get_symbol_trades_data.steps(symbol_id=self.symbol_id)
 
         return [
             SymbolTradeRow(
@@ -288,12 +298,13 @@ class Symbol:
             for row in raw_data
         ]
 
+    @endpoint
     def get_intraday_price_chart_data(self) -> list[SymbolIntraDayPriceChartDataRow]:
         """
         Returns the intraday price chart from the last day, as displayed in the "dar yek negah" tab.
         """
 
-        raw_data = _core.get_symbol_intraday_price_chart(symbol_id=self.symbol_id)
+        raw_data = yield from _core.get_symbol_intraday_price_chart.steps(symbol_id=self.symbol_id)
 
         ticks = [
             SymbolIntraDayPriceChartDataRow(
@@ -309,12 +320,13 @@ class Symbol:
 
         return ticks
 
+    @endpoint
     def get_supervisor_messages_data(self) -> list[SymbolSupervisorMessageDataRow]:
         """
         Returns a list of supervisor messages, as displayed in the "payame nazer" tab.
         """
 
-        raw_data = _core.get_symbol_supervisor_messages(symbol_id=self.symbol_id)
+        raw_data = yield from _core.get_symbol_supervisor_messages.steps(symbol_id=self.symbol_id)
 
         messages = [
             SymbolSupervisorMessageDataRow(
@@ -327,12 +339,13 @@ class Symbol:
 
         return messages
 
+    @endpoint
     def get_notifications_data(self) -> list[SymbolNotificationsDataRow]:
         """
         Returns a list of notifications, as displayed in the "etelaiye ha" tab.
         """
 
-        raw_data = _core.get_symbol_notifications(symbol_id=self.symbol_id)
+        raw_data = yield from _core.get_symbol_notifications.steps(symbol_id=self.symbol_id)
 
         notifications = [
             SymbolNotificationsDataRow(
@@ -344,12 +357,13 @@ class Symbol:
 
         return notifications
 
+    @endpoint
     def get_state_changes_data(self) -> list[SymbolStateChangeDataRow]:
         """
         Returns a list of state changes, as displayed in the "taghire vaziat" tab.
         """
 
-        raw_data = _core.get_symbol_state_changes(symbol_id=self.symbol_id)
+        raw_data = yield from _core.get_symbol_state_changes.steps(symbol_id=self.symbol_id)
 
         state_changes = [
             SymbolStateChangeDataRow(
@@ -361,12 +375,13 @@ class Symbol:
 
         return state_changes
 
+    @endpoint
     def get_daily_history(self) -> list[SymbolDailyPriceDataRow]:
         """
         Returns a list of daily ticks history, as displayed in the "sabeghe" tab.
         """
 
-        raw_data = _core.get_symbol_daily_ticks_history(symbol_id=self.symbol_id)
+        raw_data = yield from _core.get_symbol_daily_ticks_history.steps(symbol_id=self.symbol_id)
 
         return [
             SymbolDailyPriceDataRow(
@@ -386,12 +401,13 @@ class Symbol:
             for row in raw_data
         ]
 
+    @endpoint
     def get_id_details(self) -> SymbolIdDetails:
         """
         Returns all available information related to the symbol identity, as displayed in the "shenase" tab.
         """
 
-        raw_data = _core.get_symbol_id_details(symbol_id=self.symbol_id)
+        raw_data = yield from _core.get_symbol_id_details.steps(symbol_id=self.symbol_id)
 
         details = SymbolIdDetails(
             isin=raw_data["isin"],
@@ -412,12 +428,13 @@ class Symbol:
 
         return details
 
+    @endpoint
     def get_traders_type_history(self) -> list[SymbolTradersTypeDataRow]:
         """
         Returns the daily trader type history, as displayed in the "haghihi-hoghooghi" tab.
         """
 
-        raw_data = _core.get_symbol_traders_type_history(symbol_id=self.symbol_id)
+        raw_data = yield from _core.get_symbol_traders_type_history.steps(symbol_id=self.symbol_id)
 
         traders_type_history = [
             SymbolTradersTypeDataRow(
@@ -451,13 +468,14 @@ class Symbol:
 
         return traders_type_history
 
+    @endpoint
     def get_shareholders_data(self) -> list[SymbolShareHolderDataRow]:
         """
         Returns a list of major shareholders, as displayed in the "saham daran" tab.
         """
 
-        company_isin = self.get_id_details().company_isin
-        raw_data = _core.get_symbol_shareholders(company_isin=company_isin)
+        company_isin = (yield from self.get_id_details.steps()).company_isin
+        raw_data = yield from _core.get_symbol_shareholders.steps(company_isin=company_isin)
 
         shareholders = [
             SymbolShareHolderDataRow(
@@ -474,3 +492,30 @@ class Symbol:
         ]
 
         return shareholders
+
+
+class AsyncSymbol(AsyncWrapper):
+    """
+    Async mirror of Symbol, returning the same models.
+    """
+
+    def __init__(self, symbol_id: str, client: AsyncClient | None = None):
+        super().__init__(wrapped=Symbol(symbol_id=symbol_id), client=client)
+        self.symbol_id = symbol_id
+
+    get_price_overview = async_method(Symbol.get_price_overview)
+    get_info = async_method(Symbol.get_info)
+    get_traders_type = async_method(Symbol.get_traders_type)
+    get_orderbook = async_method(Symbol.get_orderbook)
+    get_closing_price_info = async_method(Symbol.get_closing_price_info)
+    get_group_data = async_method(Symbol.get_group_data)
+    get_option_data = async_method(Symbol.get_option_data)
+    get_trades_data = async_method(Symbol.get_trades_data)
+    get_intraday_price_chart_data = async_method(Symbol.get_intraday_price_chart_data)
+    get_supervisor_messages_data = async_method(Symbol.get_supervisor_messages_data)
+    get_notifications_data = async_method(Symbol.get_notifications_data)
+    get_state_changes_data = async_method(Symbol.get_state_changes_data)
+    get_daily_history = async_method(Symbol.get_daily_history)
+    get_id_details = async_method(Symbol.get_id_details)
+    get_traders_type_history = async_method(Symbol.get_traders_type_history)
+    get_shareholders_data = async_method(Symbol.get_shareholders_data)
@@ -1,8 +1,9 @@
 from jdatetime import time as jtime
-from pydantic import BaseModel
 
+from ..models import Model
 
-class SymbolTradeRow(BaseModel):
+
+class SymbolTradeRow(Model):
     time: jtime
     volume: int
     price: int
@@ -1,22 +1,22 @@
-from pydantic import BaseModel
+from ..models import Model
 
 
-class SymbolTradersTypeSubInfo(BaseModel):
+class SymbolTradersTypeSubInfo(Model):
     count: int
     volume: int
     value: int
 
 
-class SymbolTradersTypeAPISubInfo(BaseModel):
+class SymbolTradersTypeAPISubInfo(Model):
     count: int
     volume: int
 
 
-class SymbolTradersTypeInfo(BaseModel):
+class SymbolTradersTypeInfo(Model):
     buy: SymbolTradersTypeSubInfo | SymbolTradersTypeAPISubInfo
     sell: SymbolTradersTypeSubInfo | SymbolTradersTypeAPISubInfo
 
 
-class SymbolTradersTypeDataRow(BaseModel):
+class SymbolTradersTypeDataRow(Model):
     legal: SymbolTradersTypeInfo
     real: SymbolTradersTypeInfo
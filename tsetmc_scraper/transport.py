@@ -0,0 +1,406 @@
+import functools
+import json
+import threading
+import time
+from typing import Callable, Generator, Iterator, NamedTuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import instrumentation
+from .memo import ResponseMemo
+from .ratelimit import RateLimiter
+from .retry import CircuitBreaker, RetryHandler, RetryPolicy
+from .utils import get_request_headers
+
+
+class Request(NamedTuple):
+    url: str
+    params: dict
+    # name of the innermost endpoint that made the request, filled in by Endpoint.steps
+    endpoint: str | None = None
+    # whether the response describes a past day and can never change
+    historical: bool = False
+    # whether the body may be read incrementally with iter_response_text, such requests bypass the memo and the cache
+    stream: bool = False
+
+    @property
+    def key(self) -> tuple:
+        return self.endpoint, self.url.strip(), tuple(sorted((str(key), str(value)) for key, value in self.params.items()))
+
+
+class TextResponse:
+    """
+    Fully read response, exposing the parts of requests.Response that the fetchers use. Returned by the async client and by the response caches.
+    """
+
+    def __init__(self, url: str, status_code: int, headers: dict[str, str], text: str):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    def iter_text(self, chunk_size: int) -> Iterator[str]:
+        for start in range(0, len(self.text), chunk_size):
+            yield self.text[start : start + chunk_size]
+
+    def json(self):
+        if not instrumentation.is_enabled():
+            return json.loads(self.text)
+
+        started_at = time.perf_counter()
+        data = json.loads(self.text)
+        instrumentation.record(instrumentation.DECODE_SECONDS, time.perf_counter() - started_at)
+
+        return data
+
+
+class Endpoint:
+    """
+    Wraps a generator based fetcher. The generator yields a Request for every call it needs and receives the response back, so the same parsing code runs on the blocking Transport and on the AsyncClient.
+
+    While an instrumentation hook is registered, the time the generator spends parsing and the rows it returns are measured; `rows` is the row count of a result (an int, or a function of the result), instrumentation.count_rows by default.
+    """
+
+    def __init__(self, func, instance=None, rows: int | Callable | None = None):
+        functools.update_wrapper(self, func)
+        self._func = func
+        self._instance = instance
+        self._rows = rows
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        return Endpoint(self._func, instance, self._rows)
+
+    def __call__(self, *args, **kwargs):
+        return get_transport().run(self.steps(*args, **kwargs))
+
+    def steps(self, *args, **kwargs) -> Generator:
+        """
+        Returns the underlying generator, to be driven by a transport or delegated to with `yield from`.
+        """
+
+        if self._instance is not None:
+            args = (self._instance, *args)
+
+        if instrumentation.is_enabled():
+            return _measure_requests(self._func(*args, **kwargs), self.__name__, self._rows)
+
+        return _name_requests(self._func(*args, **kwargs), self.__name__)
+
+
+def _name_requests(steps: Generator, name: str) -> Generator:
+    try:
+        request = next(steps)
+        while True:
+            if request.endpoint is None:
+                request = request._replace(endpoint=name)
+
+            request = steps.send((yield request))
+    except StopIteration as stop:
+        return stop.value
+
+
+def _measure_requests(steps: Generator, name: str, rows: int | Callable | None) -> Generator:
+    # the time spent in the generator between responses is its parse time, the time of endpoints it delegates to included
+    parse_seconds = 0.0
+    response = None
+    is_started = False
+    while True:
+        started_at = time.perf_counter()
+        try:
+            with instrumentation.endpoint_scope(name):
+                request = steps.send(response) if is_started else next(steps)
+        except StopIteration as stop:
+            parse_seconds += time.perf_counter() - started_at
+            instrumentation.record(instrumentation.PARSE_SECONDS, parse_seconds, name)
+            row_count = rows if isinstance(rows, int) else (rows or instrumentation.count_rows)(stop.value)
+            instrumentation.record(instrumentation.ROWS, row_count, name)
+            return stop.value
+
+        parse_seconds += time.perf_counter() - started_at
+        is_started = True
+
+        if request.endpoint is None:
+            request = request._replace(endpoint=name)
+
+        response = yield request
+
+
+def endpoint(func=None, *, rows: int | Callable | None = None):
+    """
+    Turns a generator based fetcher into an Endpoint, used as `@endpoint` or as `@endpoint(rows=...)` to say how the rows of its result are counted.
+    """
+
+    if func is None:
+        return lambda func: Endpoint(func, rows=rows)
+
+    return Endpoint(func, rows=rows)
+
+
+def drive(steps: Generator, send):
+    """
+    Runs an endpoint generator to completion, passing every yielded Request to `send` and the result back to the generator.
+    """
+
+    try:
+        request = next(steps)
+        while True:
+            request = steps.send(send(request))
+    except StopIteration as stop:
+        return stop.value
+
+
+def iter_response_text(response, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """
+    Yields the body of a response as text in chunks of about `chunk_size` characters. A streamed requests.Response is read from the connection as it goes and closed at the end, a fully read response is only sliced.
+    """
+
+    if isinstance(response, TextResponse):
+        yield from response.iter_text(chunk_size)
+        return
+
+    if response.encoding is None:
+        response.encoding = "utf-8"
+
+    try:
+        yield from response.iter_content(chunk_size=chunk_size, decode_unicode=True)
+    finally:
+        response.close()
+
+
+def rewrite_url(url: str, base_url: str) -> str:
+    """
+    Points a tsetmc url at another server, keeping the original host as the first path segment, e.g. http://cdn.tsetmc.com/api/x becomes {base_url}/cdn.tsetmc.com/api/x.
+    """
+
+    parts = urlsplit(url.strip())
+    query = f"?{parts.query}" if parts.query else ""
+
+    return f"{base_url.rstrip('/')}/{parts.hostname}{parts.path}{query}"
+
+
+class HostLimiter:
+    """
+    Caps the number of concurrent requests per host across threads.
+    """
+
+    def __init__(self, max_per_host: int):
+        self.max_per_host = max_per_host
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url.strip()).hostname
+
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.max_per_host)
+
+            return self._semaphores[host]
+
+
+class Transport:
+    """
+    Pooled HTTP transport used by every fetcher in the library. Connections are kept alive and reused per host, so repeated calls to cdn.tsetmc.com or www.tsetmc.com skip the connection setup. Throttled and failing requests are retried according to `retry`, and `circuit_breaker` stops hammering a host that keeps failing; retries, backoff time and circuit openings per host are counted in `retry_handler.stats`. Requests can be spread out per host by `rate_limiter` (off by default) to stay under the server's throttle. Set `base_url` to send every request to another server instead, such as the mock server in tsetmc_scraper.mock.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+        timeout: float = 20,
+        headers: dict[str, str] | None = None,
+        verify: bool = False,
+        cache=None,
+        memo: ResponseMemo | bool | None = None,
+        retry: RetryPolicy | bool | None = None,
+        circuit_breaker: CircuitBreaker | bool | None = None,
+        rate_limiter: RateLimiter | bool | None = None,
+        base_url: str | None = None,
+    ):
+        self.timeout = timeout
+        self.verify = verify
+        self.cache = cache
+        # None uses the defaults, False disables the feature
+        self.memo = ResponseMemo() if memo is None else memo or None
+        self.retry_handler = RetryHandler(
+            retry=RetryPolicy() if retry is None else retry or None,
+            circuit_breaker=CircuitBreaker() if circuit_breaker is None else circuit_breaker or None,
+        )
+        # the rate limiter is opt in: True uses DEFAULT_RATE_LIMITS
+        self.rate_limiter = RateLimiter() if rate_limiter is True else rate_limiter or None
+        self.base_url = base_url
+
+        self.session = requests.Session()
+        self.session.headers.update(get_request_headers() if headers is None else headers)
+
+        # pool_connections is the number of hosts to keep pools for, pool_maxsize is the number of connections per host
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=False)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url: str, params: dict | None = None, stream: bool = False) -> requests.Response:
+        host = urlsplit(url.strip()).hostname
+        if self.base_url is not None:
+            url = rewrite_url(url, self.base_url)
+
+        attempt = 0
+        while True:
+            is_trial = self.retry_handler.before_request(host)
+            try:
+                # every attempt, retries included, spends a token of the host
+                if self.rate_limiter is not None:
+                    self.rate_limiter.wait(host)
+
+                try:
+                    response = self.session.get(
+                        url=url,
+                        params=params,
+                        verify=self.verify,
+                        timeout=self.timeout,
+                        stream=stream,
+                    )
+                    response.raise_for_status()
+                except (requests.HTTPError, requests.ConnectionError, requests.Timeout) as e:
+                    status = e.response.status_code if e.response is not None else None
+                    headers = e.response.headers if e.response is not None else None
+                    delay = self.retry_handler.on_failure(host, attempt, status, headers)
+                    if delay is None:
+                        raise
+                else:
+                    self.retry_handler.on_success(host)
+
+                    return response
+            finally:
+                # a trial interrupted by any other exception must not leave the circuit half open forever
+                if is_trial:
+                    self.retry_handler.release_trial(host)
+
+            time.sleep(delay)
+            attempt += 1
+
+    def run(self, steps: Generator):
+        """
+        Drives an endpoint generator to completion, sending every yielded Request over this transport.
+        """
+
+        return drive(steps, self.send)
+
+    def send(self, request: Request):
+        """
+        Sends a Request yielded by an endpoint. It is answered from the in-process memo or the response cache when they have a fresh entry, and coalesced with an identical request already in flight. Streamed requests are always sent, and their body is left unread.
+        """
+
+        if request.stream:
+            return self._stream(request)
+
+        if self.memo is not None:
+            return self.memo.fetch(request, self._send)
+
+        return self._send(request)
+
+    def _send(self, request: Request):
+        if self.cache is not None:
+            response = self.cache.get(request)
+            if response is not None:
+                instrumentation.record(instrumentation.CACHE_HITS, 1, request.endpoint, source="cache")
+                return response
+
+        if instrumentation.is_enabled():
+            response = self._measure_get(request)
+        else:
+            response = self.get(url=request.url, params=request.params)
+
+        if self.cache is not None:
+            self.cache.put(request, response)
+
+        return response
+
+    def _stream(self, request: Request) -> requests.Response:
+        if not instrumentation.is_enabled():
+            return self.get(url=request.url, params=request.params, stream=True)
+
+        host = urlsplit(request.url.strip()).hostname
+        started_at = time.perf_counter()
+        try:
+            with instrumentation.endpoint_scope(request.endpoint):
+                response = self.get(url=request.url, params=request.params, stream=True)
+        except Exception:
+            instrumentation.record(instrumentation.ERRORS, 1, request.endpoint, host=host)
+            raise
+
+        # only the time until the headers arrive, the body is read while it is parsed
+        instrumentation.record(instrumentation.REQUEST_SECONDS, time.perf_counter() - started_at, request.endpoint, host=host)
+
+        return response
+
+    def _measure_get(self, request: Request) -> TextResponse:
+        host = urlsplit(request.url.strip()).hostname
+        started_at = time.perf_counter()
+        try:
+            with instrumentation.endpoint_scope(request.endpoint):
+                response = self.get(url=request.url, params=request.params)
+        except Exception:
+            instrumentation.record(instrumentation.ERRORS, 1, request.endpoint, host=host)
+            raise
+
+        instrumentation.record(instrumentation.REQUEST_SECONDS, time.perf_counter() - started_at, request.endpoint, host=host)
+        instrumentation.record(instrumentation.RESPONSE_BYTES, len(response.content), request.endpoint, host=host)
+
+        # the body is decoded here to measure it, and passed on already read
+        started_at = time.perf_counter()
+        text = response.text
+        instrumentation.record(instrumentation.DECODE_SECONDS, time.perf_counter() - started_at, request.endpoint)
+
+        return TextResponse(url=response.url, status_code=response.status_code, headers=dict(response.headers), text=text)
+
+    def close(self):
+        self.session.close()
+
+
+_transport: Transport | None = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    """
+    Returns the transport shared by all fetchers, creating one with the default settings on first use.
+    """
+
+    global _transport
+
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = Transport()
+
+    return _transport
+
+
+def set_transport(transport: Transport):
+    """
+    Replaces the shared transport. The previous transport is closed.
+    """
+
+    global _transport
+
+    with _transport_lock:
+        old_transport, _transport = _transport, transport
+
+    if old_transport is not None and old_transport is not transport:
+        old_transport.close()
+
+
+def configure_transport(**kwargs) -> Transport:
+    """
+    Creates a new shared transport with the given settings (pool_connections, pool_maxsize, timeout, headers, verify, cache, memo, retry, circuit_breaker, rate_limiter, base_url) and returns it.
+    """
+
+    transport = Transport(**kwargs)
+    set_transport(transport)
+
+    return transport
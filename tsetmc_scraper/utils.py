@@ -1,8 +1,29 @@
+import functools
+import importlib
 from copy import deepcopy
+from datetime import date, timedelta, timezone
 
 from jdatetime import date as jdate
 from jdatetime import time as jtime
 
+from .models import is_raw_dates
+
+
+def _get_tehran_timezone():
+    try:
+        from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    except ImportError:
+        return timezone(timedelta(hours=3, minutes=30), "Asia/Tehran")
+
+    try:
+        return ZoneInfo("Asia/Tehran")
+    except ZoneInfoNotFoundError:
+        # without a tz database, Iran has kept standard time all year since 2022
+        return timezone(timedelta(hours=3, minutes=30), "Asia/Tehran")
+
+
+TEHRAN_TIMEZONE = _get_tehran_timezone()
+
 
 def deep_update(d1: dict, d2: dict) -> dict:
     ret = deepcopy(d1)
@@ -18,24 +39,125 @@ def deep_update(d1: dict, d2: dict) -> dict:
     return ret
 
 
-def convert_heven_to_jtime(heven: int) -> jtime:
-    heven = str(heven)
-    if len(heven) == 6:
-        return jtime(hour=int(heven[:2]), minute=int(heven[2:4]), second=int(heven[4:]))
-    else:
-        return jtime(hour=int(heven[:1]), minute=int(heven[1:3]), second=int(heven[3:]))
+class HEven(int):
+    """
+    Raw hEven time (e.g. 93015 for 09:30:15), returned in raw dates mode. The clock fields are decoded lazily.
+    """
+
+    __slots__ = ()
+
+    @property
+    def hour(self) -> int:
+        return self // 10000
+
+    @property
+    def minute(self) -> int:
+        return self // 100 % 100
+
+    @property
+    def second(self) -> int:
+        return self % 100
+
+    def to_jtime(self) -> jtime:
+        return _heven_to_jtime(int(self))
+
+
+class DEven(int):
+    """
+    Raw dEven gregorian date (e.g. 20230521), returned in raw dates mode. The jalali date is converted lazily, and memoized.
+    """
+
+    __slots__ = ()
+
+    @property
+    def year(self) -> int:
+        return self.to_jdate().year
+
+    @property
+    def month(self) -> int:
+        return self.to_jdate().month
+
+    @property
+    def day(self) -> int:
+        return self.to_jdate().day
+
+    def to_jdate(self) -> jdate:
+        return _deven_to_jdate(int(self))
+
+    def togregorian(self) -> date:
+        return date(self // 10000, self // 100 % 100, self % 100)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _heven_to_jtime(heven: int) -> jtime:
+    return jtime(hour=heven // 10000, minute=heven // 100 % 100, second=heven % 100)
+
 
+# there are only a few thousand distinct trading days, so every date is converted once
+@functools.lru_cache(maxsize=1 << 14)
+def _deven_to_jdate(deven: int) -> jdate:
+    return jdate.fromgregorian(year=deven // 10000, month=deven // 100 % 100, day=deven % 100)
 
-def convert_deven_to_jdate(deven: int) -> jdate:
-    deven = str(deven)
-    return jdate.fromgregorian(
-        year=int(deven[:4]),
-        month=int(deven[4:6]),
-        day=int(deven[6:]),
-    )
+
+def convert_heven_to_jtime(heven: int) -> jtime | HEven:
+    if is_raw_dates():
+        return HEven(heven)
+
+    return _heven_to_jtime(int(heven))
+
+
+def convert_deven_to_jdate(deven: int) -> jdate | DEven:
+    if is_raw_dates():
+        return DEven(deven)
+
+    return _deven_to_jdate(int(deven))
+
+
+def convert_jtime_to_heven(time: jtime | int) -> int:
+    """
+    Returns the hEven of a jtime, or the value itself if it already is one (as in raw dates mode).
+    """
+
+    if isinstance(time, int):
+        return time
+
+    return time.hour * 10000 + time.minute * 100 + time.second
+
+
+def convert_heven_to_seconds(heven):
+    """
+    Returns the seconds since midnight of an hEven, or of an array of them.
+    """
+
+    return heven // 10000 * 3600 + heven // 100 % 100 * 60 + heven % 100
+
+
+def columns_to_arrow(columns: dict):
+    """
+    Returns a PyArrow table of a dict of NumPy columns, sharing their memory where possible. Requires pyarrow.
+    """
+
+    pa = import_optional("pyarrow", "arrow")
+
+    return pa.table(columns)
+
+
+def to_jdate(value: jdate | DEven) -> jdate:
+    """
+    Returns the jalali date of a value parsed in either mode.
+    """
+
+    return value.to_jdate() if isinstance(value, DEven) else value
 
 
 def get_request_headers() -> dict[str, str]:
     return {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Safari/537.36",
     }
+
+
+def import_optional(name: str, extra: str):
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        raise ImportError(f"{name} is required for this feature, install it with `pip install tsetmc-scraper[{extra}]`") from e